@@ -1,6 +1,6 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Path, Query
+from fastapi import APIRouter, Depends, Path, Query, Response, status
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
@@ -10,14 +10,23 @@ from app.schemas.admin import (
     APIUsageLogRead,
     FeatureFlagRead,
     FeatureFlagToggleRequest,
+    MarketRefreshStatusRead,
+    MarketRefreshStatusResponse,
+    MarketScheduleDecisionRead,
+    MarketScheduleStatusResponse,
     PaginatedAPIUsageLogsResponse,
     PaginatedFeatureFlagsResponse,
     PaginatedSubscriptionsResponse,
     PaginatedUsersResponse,
+    SectorOverrideRead,
+    SectorOverrideRequest,
+    SectorOverridesResponse,
     SubscriptionAdminRead,
 )
 from app.schemas.user import UserRead, UserRoleUpdate
 from app.services.admin_service import AdminService
+from app.services.market_refresh_service import MarketRefreshService
+from app.utils.market_calendar import market_session, next_session_start, schedule_decisions
 
 router = APIRouter(prefix='/admin', tags=['admin'])
 
@@ -128,3 +137,59 @@ def toggle_feature_flag(
     _ = current_user
     flag = AdminService(db).toggle_feature_flag(name=name, enabled=payload.enabled)
     return FeatureFlagRead.model_validate(flag)
+
+
+@router.get('/sector-overrides', response_model=SectorOverridesResponse)
+def list_sector_overrides(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(UserRole.ADMIN)),
+) -> SectorOverridesResponse:
+    _ = current_user
+    overrides, unknown_industries = AdminService(db).list_sector_overrides()
+    return SectorOverridesResponse(
+        items=[SectorOverrideRead.model_validate(override) for override in overrides],
+        unknown_industries=unknown_industries,
+    )
+
+
+@router.put('/sector-overrides', response_model=SectorOverrideRead)
+def set_sector_override(
+    payload: SectorOverrideRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(UserRole.ADMIN)),
+) -> SectorOverrideRead:
+    _ = current_user
+    override = AdminService(db).set_sector_override(industry=payload.industry, sector=payload.sector)
+    return SectorOverrideRead.model_validate(override)
+
+
+@router.delete('/sector-overrides', status_code=status.HTTP_204_NO_CONTENT)
+def delete_sector_override(
+    industry: str = Query(min_length=1, max_length=200),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(UserRole.ADMIN)),
+) -> Response:
+    _ = current_user
+    AdminService(db).delete_sector_override(industry=industry)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get('/market-refresh-status', response_model=MarketRefreshStatusResponse)
+def market_refresh_status(
+    current_user: User = Depends(require_role(UserRole.ADMIN)),
+) -> MarketRefreshStatusResponse:
+    _ = current_user
+    items = MarketRefreshService().get_status()
+    return MarketRefreshStatusResponse(items=[MarketRefreshStatusRead.model_validate(item) for item in items])
+
+
+@router.get('/market-schedule', response_model=MarketScheduleStatusResponse)
+def market_schedule(
+    current_user: User = Depends(require_role(UserRole.ADMIN)),
+) -> MarketScheduleStatusResponse:
+    _ = current_user
+    return MarketScheduleStatusResponse(
+        session=market_session().value,
+        next_session_start=next_session_start(),
+        items=[MarketScheduleDecisionRead.model_validate(item) for item in schedule_decisions()],
+    )
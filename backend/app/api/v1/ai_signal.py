@@ -1,17 +1,22 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
 
 from app.core.dependencies import require_role
 from app.models.user import User, UserRole
 from app.schemas.market import AISignalEngineResponse
 from app.services.ai_signal_service import AISignalEngineService
+from app.utils.market_cache import DATA_AGE_HEADER
 
 router = APIRouter(prefix='/ai-signal', tags=['ai_signal'])
 
 
 @router.get('/latest', response_model=AISignalEngineResponse)
 def latest_signal(
+    response: Response,
+    symbol: str = Query(default='NIFTY', min_length=1, max_length=30),
     current_user: User = Depends(require_role(UserRole.PRO, UserRole.ADMIN)),
 ) -> AISignalEngineResponse:
     _ = current_user
-    signal = AISignalEngineService().get_latest_signal(symbol='NIFTY')
-    return AISignalEngineResponse(score=signal['score'], classification=signal['classification'])
+    service = AISignalEngineService()
+    signal = service.get_latest_signal(symbol=symbol)
+    response.headers[DATA_AGE_HEADER] = str(int(service.data_age_seconds))
+    return AISignalEngineResponse(symbol=signal['symbol'], score=signal['score'], classification=signal['classification'])
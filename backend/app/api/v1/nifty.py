@@ -1,16 +1,23 @@
-from fastapi import APIRouter, Depends
+from datetime import date
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
 from app.models.user import User
 from app.schemas.market import (
+    NiftyImpactDeltaResponse,
+    NiftyImpactHistoryResponse,
     NiftyImpactResponse,
     NiftySnapshotRead,
     SectorImpactHeatmapResponse,
 )
+from app.services.index_history_service import IndexHistoryService
 from app.services.market_service import MarketService
-from app.services.nifty_analytics_service import NiftyAnalyticsService
+from app.services.nifty_analytics_service import NIFTY_50_INDEX, NiftyAnalyticsService
+from app.utils.market_cache import DATA_AGE_HEADER
 
 router = APIRouter(prefix='/nifty', tags=['nifty'])
 
@@ -25,19 +32,51 @@ def latest_nifty(
     return NiftySnapshotRead.model_validate(snapshot)
 
 
-@router.get('/impact', response_model=NiftyImpactResponse)
+# Both views are stored pre-serialized; returning the bytes skips response_model validation entirely.
+@router.get('/impact', response_model=NiftyImpactResponse | NiftyImpactDeltaResponse)
 def nifty_impact(
+    index: str = Query(default=NIFTY_50_INDEX, min_length=1, max_length=60),
+    since: int | None = Query(default=None, ge=0),
     current_user: User = Depends(get_current_user),
-) -> NiftyImpactResponse:
+) -> Response:
     _ = current_user
-    payload = NiftyAnalyticsService().get_impact_snapshot()
-    return NiftyImpactResponse.model_validate(payload)
+    service = NiftyAnalyticsService()
+    if since is None:
+        content = service.get_impact_snapshot(index)
+    else:
+        content = service.get_impact_delta(index, since)
+    return _cached_json(content, service.data_age_seconds)
+
+
+@router.get('/impact/history', response_model=NiftyImpactHistoryResponse)
+def nifty_impact_history(
+    response: Response,
+    index: str = Query(default=NIFTY_50_INDEX, min_length=1, max_length=60),
+    interval: Literal['1m', '5m'] = Query(default='1m'),
+    trade_date: date | None = Query(default=None),
+    current_user: User = Depends(get_current_user),
+) -> NiftyImpactHistoryResponse:
+    _ = current_user
+    service = IndexHistoryService()
+    payload = service.get_history(index, interval, trade_date)
+    response.headers[DATA_AGE_HEADER] = str(int(service.data_age_seconds))
+    return NiftyImpactHistoryResponse.model_validate(payload)
 
 
 @router.get('/impact/sector-heatmap', response_model=SectorImpactHeatmapResponse)
 def sector_impact_heatmap(
+    index: str = Query(default=NIFTY_50_INDEX, min_length=1, max_length=60),
     current_user: User = Depends(get_current_user),
-) -> SectorImpactHeatmapResponse:
+) -> Response:
     _ = current_user
-    payload = NiftyAnalyticsService().get_sector_impact_heatmap()
-    return SectorImpactHeatmapResponse.model_validate(payload)
+    service = NiftyAnalyticsService()
+    content = service.get_sector_impact_heatmap(index)
+    return _cached_json(content, service.data_age_seconds)
+
+
+def _cached_json(content: bytes, data_age_seconds: float) -> Response:
+    return Response(
+        content=content,
+        media_type='application/json',
+        headers={DATA_AGE_HEADER: str(int(data_age_seconds))},
+    )
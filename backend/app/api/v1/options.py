@@ -1,12 +1,32 @@
-from fastapi import APIRouter, Depends, Query
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_user, require_role
 from app.models.user import User, UserRole
-from app.schemas.market import OptionContractRead, OptionsAnalyticsResponse
+from app.schemas.market import (
+    OptionContractRead,
+    OptionsAnalyticsBatchResponse,
+    OptionsAnalyticsResponse,
+    OptionsExpiryAnalyticsResponse,
+    OptionsGreeksResponse,
+    OptionsHistoryResponse,
+    OptionsOIDeltaResponse,
+    OptionsScannerResponse,
+    OptionsStrikeWindowResponse,
+    OptionStrategyRequest,
+    OptionStrategyResponse,
+)
+from app.services.market_scanner_service import MarketScannerService
 from app.services.market_service import MarketService
+from app.services.oi_delta_service import OIDeltaService
+from app.services.option_history_service import OptionHistoryService
+from app.services.option_strategy_service import OptionStrategyService
 from app.services.options_analytics_service import OptionsAnalyticsService
+from app.utils.market_cache import DATA_AGE_HEADER
 
 router = APIRouter(prefix='/options', tags=['options'])
 
@@ -24,10 +44,165 @@ def latest_options(
 
 @router.get('/analytics', response_model=OptionsAnalyticsResponse)
 def option_chain_analytics(
+    response: Response,
     symbol: str = Query(default='NIFTY', min_length=1, max_length=30),
     expiry_date: str | None = Query(default=None),
     current_user: User = Depends(get_current_user),
 ) -> OptionsAnalyticsResponse:
     _ = current_user
-    payload = OptionsAnalyticsService().get_analytics(symbol=symbol, expiry_date=expiry_date)
+    service = OptionsAnalyticsService()
+    payload = service.get_analytics(symbol=symbol, expiry_date=expiry_date)
+    response.headers[DATA_AGE_HEADER] = str(int(service.data_age_seconds))
     return OptionsAnalyticsResponse.model_validate(payload)
+
+
+@router.get('/analytics/batch', response_model=OptionsAnalyticsBatchResponse)
+def option_chain_analytics_batch(
+    response: Response,
+    symbols: str = Query(min_length=1, max_length=1000, description='Comma-separated symbols'),
+    current_user: User = Depends(get_current_user),
+) -> OptionsAnalyticsBatchResponse:
+    _ = current_user
+    service = OptionsAnalyticsService()
+    items = service.get_analytics_batch(symbols.split(','))
+    response.headers[DATA_AGE_HEADER] = str(int(service.data_age_seconds))
+    return OptionsAnalyticsBatchResponse.model_validate({'items': items})
+
+
+@router.get('/analytics/expiries', response_model=OptionsExpiryAnalyticsResponse)
+def option_chain_expiry_analytics(
+    response: Response,
+    symbol: str = Query(default='NIFTY', min_length=1, max_length=30),
+    current_user: User = Depends(get_current_user),
+) -> OptionsExpiryAnalyticsResponse:
+    _ = current_user
+    service = OptionsAnalyticsService()
+    payload = service.get_expiry_analytics(symbol=symbol)
+    response.headers[DATA_AGE_HEADER] = str(int(service.data_age_seconds))
+    return OptionsExpiryAnalyticsResponse.model_validate(payload)
+
+
+@router.get('/strikes', response_model=OptionsStrikeWindowResponse)
+def option_chain_strike_window(
+    response: Response,
+    symbol: str = Query(default='NIFTY', min_length=1, max_length=30),
+    expiry_date: str | None = Query(default=None),
+    window: int = Query(default=10, ge=1, le=50),
+    current_user: User = Depends(get_current_user),
+) -> OptionsStrikeWindowResponse:
+    _ = current_user
+    service = OptionsAnalyticsService()
+    payload = service.get_strike_window(symbol=symbol, expiry_date=expiry_date, window=window)
+    response.headers[DATA_AGE_HEADER] = str(int(service.data_age_seconds))
+    return OptionsStrikeWindowResponse.model_validate(payload)
+
+
+@router.get('/greeks', response_model=OptionsGreeksResponse)
+def option_chain_greeks(
+    response: Response,
+    symbol: str = Query(default='NIFTY', min_length=1, max_length=30),
+    expiry_date: str | None = Query(default=None),
+    current_user: User = Depends(get_current_user),
+) -> OptionsGreeksResponse:
+    _ = current_user
+    service = OptionsAnalyticsService()
+    payload = service.get_greeks(symbol=symbol, expiry_date=expiry_date)
+    response.headers[DATA_AGE_HEADER] = str(int(service.data_age_seconds))
+    return OptionsGreeksResponse.model_validate(payload)
+
+
+@router.get('/oi-delta', response_model=OptionsOIDeltaResponse)
+def option_chain_oi_delta(
+    response: Response,
+    symbol: str = Query(default='NIFTY', min_length=1, max_length=30),
+    expiry_date: str | None = Query(default=None),
+    window: Literal['1m', '5m', '15m'] = Query(default='5m'),
+    current_user: User = Depends(get_current_user),
+) -> OptionsOIDeltaResponse:
+    _ = current_user
+    service = OIDeltaService()
+    payload = service.get_delta(symbol=symbol, expiry_date=expiry_date, window=window)
+    response.headers[DATA_AGE_HEADER] = str(int(service.data_age_seconds))
+    return OptionsOIDeltaResponse.model_validate(payload)
+
+
+@router.post('/strategy', response_model=OptionStrategyResponse)
+def option_strategy_payoff(
+    payload: OptionStrategyRequest,
+    response: Response,
+    current_user: User = Depends(require_role(UserRole.PRO, UserRole.ADMIN)),
+) -> OptionStrategyResponse:
+    _ = current_user
+    service = OptionStrategyService()
+    result = service.evaluate(payload)
+    response.headers[DATA_AGE_HEADER] = str(int(service.data_age_seconds))
+    return OptionStrategyResponse.model_validate(result)
+
+
+@router.get('/scanner', response_model=OptionsScannerResponse)
+def fno_market_scanner(
+    response: Response,
+    rank_by: Literal[
+        'pcr',
+        'buildup_score',
+        'max_pain_distance_pct',
+        'support_break_pct',
+        'resistance_break_pct',
+    ] = Query(default='pcr'),
+    order: Literal['asc', 'desc'] = Query(default='desc'),
+    limit: int = Query(default=50, ge=1, le=500),
+    current_user: User = Depends(require_role(UserRole.PRO, UserRole.ADMIN)),
+) -> OptionsScannerResponse:
+    _ = current_user
+    service = MarketScannerService()
+    payload = service.get_rankings(rank_by=rank_by, order=order, limit=limit)
+    response.headers[DATA_AGE_HEADER] = str(int(service.data_age_seconds))
+    return OptionsScannerResponse.model_validate(payload)
+
+
+@router.get('/history', response_model=OptionsHistoryResponse)
+def option_chain_history(
+    symbol: str = Query(default='NIFTY', min_length=1, max_length=30),
+    expiry_date: str = Query(min_length=1),
+    start: datetime | None = Query(default=None),
+    end: datetime | None = Query(default=None),
+    points: int = Query(default=500, ge=10, le=2000),
+    method: Literal['lttb', 'minmax'] = Query(default='lttb'),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> OptionsHistoryResponse:
+    _ = current_user
+    payload = OptionHistoryService(db).get_history(
+        symbol=symbol,
+        expiry_date=expiry_date,
+        start=start,
+        end=end,
+        points=points,
+        method=method,
+    )
+    return OptionsHistoryResponse.model_validate(payload)
+
+
+@router.get('/history/strikes', response_model=OptionsHistoryResponse)
+def option_strike_history(
+    symbol: str = Query(default='NIFTY', min_length=1, max_length=30),
+    expiry_date: str = Query(min_length=1),
+    strikes: list[float] = Query(min_length=1, max_length=10),
+    start: datetime | None = Query(default=None),
+    end: datetime | None = Query(default=None),
+    points: int = Query(default=500, ge=10, le=2000),
+    method: Literal['lttb', 'minmax'] = Query(default='lttb'),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> OptionsHistoryResponse:
+    _ = current_user
+    payload = OptionHistoryService(db).get_strike_history(
+        symbol=symbol,
+        expiry_date=expiry_date,
+        strikes=strikes,
+        start=start,
+        end=end,
+        points=points,
+        method=method,
+    )
+    return OptionsHistoryResponse.model_validate(payload)
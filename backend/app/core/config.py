@@ -1,3 +1,4 @@
+from datetime import date
 from functools import lru_cache
 from typing import Literal
 
@@ -37,6 +38,52 @@ class Settings(BaseSettings):
     TELEGRAM_BOT_TOKEN: str | None = None
     TELEGRAM_CHAT_ID: str | None = None
 
+    MARKET_PREFETCH_ENABLED: bool = True
+    MARKET_REFRESH_INTERVAL_SECONDS: int = 15
+    MARKET_EXTENDED_REFRESH_INTERVAL_SECONDS: int = 120
+    MARKET_HOLIDAYS: list[date] = Field(default_factory=list)
+    FNO_SYMBOLS: list[str] = Field(default_factory=list)
+    MARKET_SCANNER_SHARDS: int = 8
+    AI_SIGNAL_ALERT_SYMBOLS: list[str] = Field(default_factory=lambda: ['NIFTY'])
+
+    OPTIONS_RISK_FREE_RATE: float = 0.065
+
+    TRACKED_INDICES: list[str] = Field(
+        default_factory=lambda: [
+            'NIFTY 50',
+            'NIFTY NEXT 50',
+            'NIFTY BANK',
+            'NIFTY FINANCIAL SERVICES',
+            'NIFTY IT',
+            'NIFTY AUTO',
+            'NIFTY PHARMA',
+            'NIFTY FMCG',
+            'NIFTY METAL',
+            'NIFTY ENERGY',
+        ]
+    )
+    INDEX_WEIGHT_DRIFT_ADJUSTMENT: bool = True
+    INDEX_IMPACT_DIFF_HISTORY: int = 120
+    INDEX_IMPACT_STREAM_MAXLEN: int = 10000
+    INDEX_IMPACT_ROLLUP_INTERVAL_SECONDS: int = 60
+    INDEX_IMPACT_HISTORY_RETENTION_DAYS: int = 5
+
+    UNUSUAL_OI_Z_SCORE_THRESHOLD: float = 4.0
+    UNUSUAL_OI_MIN_SAMPLES: int = 30
+    UNUSUAL_OI_WINDOW_SAMPLES: int = 240
+
+    OPTION_SNAPSHOT_HISTORY_ENABLED: bool = True
+    OPTION_SNAPSHOT_INTERVAL_SECONDS: int = 60
+    OPTION_SNAPSHOT_RETENTION_DAYS: int = 30
+
+    MARKET_CACHE_LOCK_SECONDS: int = 30
+    MARKET_CACHE_STALE_IF_ERROR_SECONDS: int = 15 * 60
+
+    NSE_TIMEOUT_SECONDS: int = 10
+    NSE_MAX_CONNECTIONS: int = 20
+    NSE_MAX_CONCURRENCY: int = 8
+    NSE_COOKIE_TTL_SECONDS: int = 5 * 60
+
     @property
     def is_production(self) -> bool:
         return self.APP_ENV == 'production'
@@ -139,8 +139,11 @@ from app.core.api_usage_middleware import APIUsageLoggingMiddleware
 from app.core.logging import LoggingMiddleware, configure_logging
 from app.core.subscription_middleware import SubscriptionAccessMiddleware
 from app.core.token_middleware import TokenValidationMiddleware
-from app.models import api_usage_log, feature_flag, subscription, user  # noqa: F401
+from app.models import api_usage_log, feature_flag, market_data, subscription, user  # noqa: F401
+from app.services.index_weight_service import IndexWeightService
+from app.services.sector_service import SectorService
 from app.utils.error_middleware import ErrorHandlingMiddleware
+from app.utils.market_cache import DATA_AGE_HEADER
 
 settings = get_settings()
 configure_logging()
@@ -159,6 +162,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[DATA_AGE_HEADER],
 )
 
 # ✅ Tumhare saare original middlewares intact
@@ -191,3 +195,5 @@ def _ensure_telegram_id_column() -> None:
 def on_startup() -> None:
     Base.metadata.create_all(bind=engine)
     _ensure_telegram_id_column()
+    IndexWeightService().load()
+    SectorService().load()
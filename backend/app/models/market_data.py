@@ -1,6 +1,6 @@
-from datetime import datetime
+from datetime import date, datetime
 
-from sqlalchemy import DateTime, Float, String, func
+from sqlalchemy import BigInteger, Date, DateTime, Float, Index, String, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
@@ -34,3 +34,83 @@ class AISignal(Base):
     signal: Mapped[str] = mapped_column(String(20), nullable=False)
     confidence: Mapped[float] = mapped_column(Float, nullable=False)
     generated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class OptionChainSnapshot(Base):
+    __tablename__ = 'option_chain_snapshots'
+    # Partitions (one per trade date) are created on demand by OptionSnapshotRepository.
+    __table_args__ = (
+        Index(
+            'ix_option_chain_snapshots_strike_series',
+            'symbol',
+            'expiry_date',
+            'strike',
+            'captured_at',
+            postgresql_include=['ce_oi', 'pe_oi', 'ce_change_oi', 'pe_change_oi'],
+        ),
+        {'postgresql_partition_by': 'RANGE (trade_date)'},
+    )
+
+    symbol: Mapped[str] = mapped_column(String(20), primary_key=True)
+    expiry_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    captured_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    strike: Mapped[float] = mapped_column(Float, primary_key=True)
+    trade_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    ce_oi: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    pe_oi: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    ce_change_oi: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    pe_change_oi: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    ce_ltp: Mapped[float | None] = mapped_column(Float)
+    pe_ltp: Mapped[float | None] = mapped_column(Float)
+    ce_iv: Mapped[float | None] = mapped_column(Float)
+    pe_iv: Mapped[float | None] = mapped_column(Float)
+
+
+class OptionChainSummary(Base):
+    __tablename__ = 'option_chain_summaries'
+    __table_args__ = (
+        Index(
+            'ix_option_chain_summaries_series',
+            'symbol',
+            'expiry_date',
+            'captured_at',
+            postgresql_include=['underlying_value', 'total_call_oi', 'total_put_oi', 'pcr', 'change_oi_pcr', 'max_pain'],
+        ),
+        {'postgresql_partition_by': 'RANGE (trade_date)'},
+    )
+
+    symbol: Mapped[str] = mapped_column(String(20), primary_key=True)
+    expiry_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    captured_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    trade_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    underlying_value: Mapped[float | None] = mapped_column(Float)
+    total_call_oi: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    total_put_oi: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    pcr: Mapped[float | None] = mapped_column(Float)
+    change_oi_pcr: Mapped[float | None] = mapped_column(Float)
+    max_pain: Mapped[float | None] = mapped_column(Float)
+
+
+class IndexWeight(Base):
+    __tablename__ = 'index_weights'
+
+    index_name: Mapped[str] = mapped_column(String(40), primary_key=True)
+    effective_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    symbol: Mapped[str] = mapped_column(String(20), primary_key=True)
+    company_name: Mapped[str] = mapped_column(String(200), nullable=False)
+    sector: Mapped[str] = mapped_column(String(60), nullable=False)
+    weight: Mapped[float] = mapped_column(Float, nullable=False)
+    # Constituent price when the weight was captured; the base for intraday drift adjustment.
+    reference_price: Mapped[float] = mapped_column(Float, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class SectorOverride(Base):
+    __tablename__ = 'sector_overrides'
+
+    # Normalized form (upper case, punctuation collapsed to single spaces) of the raw NSE industry string.
+    industry: Mapped[str] = mapped_column(String(200), primary_key=True)
+    sector: Mapped[str] = mapped_column(String(60), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
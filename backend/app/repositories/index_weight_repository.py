@@ -0,0 +1,39 @@
+from datetime import date
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.models.market_data import IndexWeight
+from app.repositories.base_repository import BaseRepository
+
+
+class IndexWeightRepository(BaseRepository[IndexWeight]):
+    def __init__(self, db: Session) -> None:
+        super().__init__(db)
+
+    def index_names(self) -> list[str]:
+        return list(self.db.scalars(select(IndexWeight.index_name).distinct()).all())
+
+    def latest(self, index_name: str) -> list[IndexWeight]:
+        effective_date = (
+            select(func.max(IndexWeight.effective_date))
+            .where(IndexWeight.index_name == index_name)
+            .scalar_subquery()
+        )
+        return list(
+            self.db.scalars(
+                select(IndexWeight)
+                .where(IndexWeight.index_name == index_name, IndexWeight.effective_date == effective_date)
+                .order_by(IndexWeight.symbol)
+            ).all()
+        )
+
+    def replace(self, index_name: str, effective_date: date, rows: list[dict]) -> None:
+        self.db.execute(
+            delete(IndexWeight).where(
+                IndexWeight.index_name == index_name,
+                IndexWeight.effective_date == effective_date,
+            )
+        )
+        self.db.add_all(IndexWeight(index_name=index_name, effective_date=effective_date, **row) for row in rows)
+        self.db.commit()
@@ -0,0 +1,182 @@
+import csv
+import io
+import re
+from collections.abc import Iterable, Sequence
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import Row, select, text
+from sqlalchemy.orm import Session
+
+from app.models.market_data import OptionChainSnapshot, OptionChainSummary
+
+SNAPSHOT_COLUMNS = (
+    'symbol',
+    'expiry_date',
+    'captured_at',
+    'strike',
+    'trade_date',
+    'ce_oi',
+    'pe_oi',
+    'ce_change_oi',
+    'pe_change_oi',
+    'ce_ltp',
+    'pe_ltp',
+    'ce_iv',
+    'pe_iv',
+)
+SUMMARY_COLUMNS = (
+    'symbol',
+    'expiry_date',
+    'captured_at',
+    'trade_date',
+    'underlying_value',
+    'total_call_oi',
+    'total_put_oi',
+    'pcr',
+    'change_oi_pcr',
+    'max_pain',
+)
+PARTITIONED_TABLES = {
+    OptionChainSnapshot.__tablename__: SNAPSHOT_COLUMNS,
+    OptionChainSummary.__tablename__: SUMMARY_COLUMNS,
+}
+
+_known_partitions: set[tuple[str, date]] = set()
+
+
+class OptionSnapshotRepository:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def ensure_partitions(self, trade_dates: Iterable[date]) -> None:
+        wanted = {(table, trade_date) for table in PARTITIONED_TABLES for trade_date in set(trade_dates)}
+        missing = sorted(wanted - _known_partitions)
+        for table, trade_date in missing:
+            self.db.execute(
+                text(
+                    f'CREATE TABLE IF NOT EXISTS {self._partition_name(table, trade_date)} '
+                    f'PARTITION OF {table} '
+                    f"FOR VALUES FROM ('{trade_date.isoformat()}') TO ('{(trade_date + timedelta(days=1)).isoformat()}')"
+                )
+            )
+        if missing:
+            self.db.commit()
+            _known_partitions.update(missing)
+
+    def copy_rows(self, *, snapshots: Iterable[Sequence], summaries: Iterable[Sequence]) -> int:
+        count = self._copy(OptionChainSnapshot.__tablename__, snapshots)
+        self._copy(OptionChainSummary.__tablename__, summaries)
+        self.db.commit()
+        return count
+
+    def summary_series(self, *, symbol: str, expiry_date: date, start: datetime, end: datetime) -> list[Row]:
+        return list(
+            self.db.execute(
+                select(
+                    OptionChainSummary.captured_at,
+                    OptionChainSummary.underlying_value,
+                    OptionChainSummary.total_call_oi,
+                    OptionChainSummary.total_put_oi,
+                    OptionChainSummary.pcr,
+                    OptionChainSummary.change_oi_pcr,
+                    OptionChainSummary.max_pain,
+                )
+                .where(
+                    OptionChainSummary.symbol == symbol,
+                    OptionChainSummary.expiry_date == expiry_date,
+                    OptionChainSummary.captured_at.between(start, end),
+                    OptionChainSummary.trade_date.between(*self._trade_date_bounds(start, end)),
+                )
+                .order_by(OptionChainSummary.captured_at)
+            ).all()
+        )
+
+    def strike_series(
+        self,
+        *,
+        symbol: str,
+        expiry_date: date,
+        strikes: list[float],
+        start: datetime,
+        end: datetime,
+    ) -> list[Row]:
+        return list(
+            self.db.execute(
+                select(
+                    OptionChainSnapshot.strike,
+                    OptionChainSnapshot.captured_at,
+                    OptionChainSnapshot.ce_oi,
+                    OptionChainSnapshot.pe_oi,
+                    OptionChainSnapshot.ce_change_oi,
+                    OptionChainSnapshot.pe_change_oi,
+                )
+                .where(
+                    OptionChainSnapshot.symbol == symbol,
+                    OptionChainSnapshot.expiry_date == expiry_date,
+                    OptionChainSnapshot.strike.in_(strikes),
+                    OptionChainSnapshot.captured_at.between(start, end),
+                    OptionChainSnapshot.trade_date.between(*self._trade_date_bounds(start, end)),
+                )
+                .order_by(OptionChainSnapshot.strike, OptionChainSnapshot.captured_at)
+            ).all()
+        )
+
+    def list_partitions(self, table: str) -> dict[date, str]:
+        names = self.db.scalars(
+            text(
+                'SELECT child.relname FROM pg_inherits '
+                'JOIN pg_class parent ON pg_inherits.inhparent = parent.oid '
+                'JOIN pg_class child ON pg_inherits.inhrelid = child.oid '
+                'WHERE parent.relname = :table'
+            ),
+            {'table': table},
+        ).all()
+        pattern = re.compile(rf'{table}_p(\d{{8}})')
+        partitions = {}
+        for name in names:
+            match = pattern.fullmatch(name)
+            if match:
+                partitions[datetime.strptime(match.group(1), '%Y%m%d').date()] = name
+        return partitions
+
+    def drop_partitions_before(self, cutoff: date) -> list[str]:
+        dropped = []
+        for table in PARTITIONED_TABLES:
+            for trade_date, name in sorted(self.list_partitions(table).items()):
+                if trade_date >= cutoff:
+                    break
+                self.db.execute(text(f'DROP TABLE IF EXISTS {name}'))
+                _known_partitions.discard((table, trade_date))
+                dropped.append(name)
+        self.db.commit()
+        return dropped
+
+    def _copy(self, table: str, rows: Iterable[Sequence]) -> int:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        count = 0
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+        if count == 0:
+            return 0
+
+        buffer.seek(0)
+        # COPY shares the session's transaction, so both tables commit or roll back together.
+        cursor = self.db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f'COPY {table} ({", ".join(PARTITIONED_TABLES[table])}) FROM STDIN WITH (FORMAT csv)',
+                buffer,
+            )
+        finally:
+            cursor.close()
+        return count
+
+    def _partition_name(self, table: str, trade_date: date) -> str:
+        return f'{table}_p{trade_date:%Y%m%d}'
+
+    def _trade_date_bounds(self, start: datetime, end: datetime) -> tuple[date, date]:
+        # Redundant with the captured_at range, but lets the planner prune partitions.
+        # Padded by a day because trade dates are IST while the range may be in any offset.
+        return start.date() - timedelta(days=1), end.date() + timedelta(days=1)
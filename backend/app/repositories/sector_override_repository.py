@@ -0,0 +1,33 @@
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.market_data import SectorOverride
+from app.repositories.base_repository import BaseRepository
+
+
+class SectorOverrideRepository(BaseRepository[SectorOverride]):
+    def __init__(self, db: Session) -> None:
+        super().__init__(db)
+
+    def list_all(self) -> list[SectorOverride]:
+        return list(self.db.scalars(select(SectorOverride).order_by(SectorOverride.industry.asc())).all())
+
+    def upsert(self, *, industry: str, sector: str) -> SectorOverride:
+        override = self.db.get(SectorOverride, industry)
+        if override is None:
+            override = SectorOverride(industry=industry, sector=sector)
+        else:
+            override.sector = sector
+
+        self.db.add(override)
+        self.db.commit()
+        self.db.refresh(override)
+        return override
+
+    def delete(self, industry: str) -> bool:
+        override = self.db.get(SectorOverride, industry)
+        if override is None:
+            return False
+        self.db.delete(override)
+        self.db.commit()
+        return True
@@ -76,5 +76,52 @@ class PaginatedFeatureFlagsResponse(BaseModel):
     size: int
 
 
+class SectorOverrideRead(BaseModel):
+    industry: str
+    sector: str
+    updated_at: datetime
+
+    model_config = {'from_attributes': True}
+
+
+class SectorOverrideRequest(BaseModel):
+    industry: str = Field(min_length=1, max_length=200)
+    sector: str = Field(min_length=1, max_length=60)
+
+
+class SectorOverridesResponse(BaseModel):
+    items: list[SectorOverrideRead]
+    unknown_industries: list[str]
+
+
 class UserRoleUpdateRequest(BaseModel):
     role: UserRole
+
+
+class MarketRefreshStatusRead(BaseModel):
+    source: str
+    last_attempt_at: datetime | None
+    last_success_at: datetime | None
+    data_age_seconds: float | None
+    refresh_lag_seconds: float | None
+    duration_ms: float | None
+    error: str | None
+
+
+class MarketRefreshStatusResponse(BaseModel):
+    items: list[MarketRefreshStatusRead]
+
+
+class MarketScheduleDecisionRead(BaseModel):
+    name: str
+    session: str
+    interval_seconds: float | None
+    is_due: bool
+    next_check_seconds: float
+    decided_at: datetime
+
+
+class MarketScheduleStatusResponse(BaseModel):
+    session: str
+    next_session_start: datetime
+    items: list[MarketScheduleDecisionRead]
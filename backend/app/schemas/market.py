@@ -1,6 +1,7 @@
-from datetime import datetime
+from datetime import date, datetime
+from typing import Literal
 
-from pydantic import BaseModel, RootModel
+from pydantic import BaseModel, Field, RootModel
 
 
 class NiftySnapshotRead(BaseModel):
@@ -40,19 +41,59 @@ class NiftyConstituentImpact(BaseModel):
     last_price: float
     percent_change: float
     impact: float
+    index_points: float | None
+    cumulative_impact: float
 
 
 class NiftyImpactResponse(BaseModel):
     index: str
+    version: int
+    timestamp: datetime
+    index_value: float | None
     total_impact: float
+    total_index_points: float | None
     top_draggers: list[NiftyConstituentImpact]
+    top_lifters: list[NiftyConstituentImpact]
     constituents: list[NiftyConstituentImpact]
 
 
+class NiftyImpactDeltaResponse(BaseModel):
+    index: str
+    version: int
+    since: int
+    timestamp: datetime
+    index_value: float | None
+    total_impact: float
+    total_index_points: float | None
+    top_draggers: list[NiftyConstituentImpact]
+    top_lifters: list[NiftyConstituentImpact]
+    changed: list[NiftyConstituentImpact]
+    removed: list[str]
+
+
+class NiftyImpactHistoryResponse(BaseModel):
+    index: str
+    interval: str
+    trade_date: date
+    timestamps: list[datetime]
+    total_impact: list[float | None]
+    impact_high: list[float | None]
+    impact_low: list[float | None]
+    total_index_points: list[float | None]
+    index_value: list[float | None]
+    samples: list[int]
+    sector_impact: dict[str, list[float | None]]
+
+
 class SectorImpactHeatmapResponse(RootModel[dict[str, float]]):
     pass
 
 
+class OptionsPainCurve(BaseModel):
+    strike: list[float]
+    pain: list[float]
+
+
 class OptionsAnalyticsResponse(BaseModel):
     symbol: str
     expiry_date: str
@@ -67,8 +108,206 @@ class OptionsAnalyticsResponse(BaseModel):
     strongest_support: float | None
     strongest_resistance: float | None
     max_pain: float | None
+    pain_curve: OptionsPainCurve
+
+
+class OptionsAnalyticsBatchItem(BaseModel):
+    symbol: str
+    status: Literal['ok', 'error']
+    error: str | None
+    data_age_seconds: float | None
+    analytics: OptionsAnalyticsResponse | None
+
+
+class OptionsAnalyticsBatchResponse(BaseModel):
+    items: list[OptionsAnalyticsBatchItem]
+
+
+class OptionsTermStructurePoint(BaseModel):
+    expiry_date: str
+    pcr: float | None
+    change_oi_pcr: float | None
+    max_pain: float | None
+
+
+class OptionsExpiryAnalyticsResponse(BaseModel):
+    symbol: str
+    underlying_value: float | None
+    timestamp: datetime
+    expiry_dates: list[str]
+    expiries: list[OptionsAnalyticsResponse]
+    term_structure: list[OptionsTermStructurePoint]
+
+
+class OptionStrikeRow(BaseModel):
+    strike: float
+    call_oi: int
+    put_oi: int
+    call_change_oi: int
+    put_change_oi: int
+    call_ltp: float | None
+    put_ltp: float | None
+    call_iv: float | None
+    put_iv: float | None
+
+
+class OptionsStrikeWindowResponse(BaseModel):
+    symbol: str
+    expiry_date: str
+    underlying_value: float
+    timestamp: datetime
+    atm_strike: float
+    strikes: list[OptionStrikeRow]
+
+
+class OptionStrikeGreeks(BaseModel):
+    strike: float
+    call_oi: int
+    put_oi: int
+    call_iv: float | None
+    call_delta: float | None
+    call_gamma: float | None
+    call_vega: float | None
+    call_theta: float | None
+    put_iv: float | None
+    put_delta: float | None
+    put_gamma: float | None
+    put_vega: float | None
+    put_theta: float | None
+    gamma_exposure: float | None
+
+
+class OptionsGreeksResponse(BaseModel):
+    symbol: str
+    expiry_date: str
+    underlying_value: float | None
+    timestamp: datetime
+    risk_free_rate: float
+    years_to_expiry: float | None
+    total_gamma_exposure: float
+    strikes: list[OptionStrikeGreeks]
+
+
+class OptionStrikeOIDelta(BaseModel):
+    strike: float
+    call_oi_change: float | None
+    put_oi_change: float | None
+    call_volume_change: float | None
+    put_volume_change: float | None
+    call_ltp_change: float | None
+    put_ltp_change: float | None
+
+
+class OptionsOIDeltaResponse(BaseModel):
+    symbol: str
+    expiry_date: str
+    window: str
+    window_seconds: float
+    timestamp: datetime
+    baseline_at: datetime
+    total_call_oi_change: int
+    total_put_oi_change: int
+    strikes: list[OptionStrikeOIDelta]
+
+
+class OptionsScannerRow(BaseModel):
+    rank: int
+    symbol: str
+    expiry_date: str
+    underlying_value: float | None
+    pcr: float | None
+    pcr_extreme: Literal['bullish', 'bearish'] | None
+    change_in_call_oi: int
+    change_in_put_oi: int
+    buildup: str
+    buildup_score: float
+    max_pain: float | None
+    max_pain_distance_pct: float | None
+    strongest_support: float | None
+    strongest_resistance: float | None
+    support_break_pct: float | None
+    resistance_break_pct: float | None
+    timestamp: datetime
+
+
+class OptionsScannerResponse(BaseModel):
+    scanned_at: datetime
+    rank_by: str
+    order: str
+    total_symbols: int
+    items: list[OptionsScannerRow]
+
+
+class OptionStrategyLeg(BaseModel):
+    option_type: Literal['CE', 'PE']
+    side: Literal['buy', 'sell']
+    strike: float = Field(gt=0)
+    quantity: int = Field(default=1, ge=1, le=100000, description='Units (lots x lot size)')
+    expiry_date: str | None = None
+    premium: float | None = Field(default=None, gt=0, description='Overrides the chain LTP')
+
+
+class OptionStrategyRequest(BaseModel):
+    symbol: str = Field(default='NIFTY', min_length=1, max_length=30)
+    legs: list[OptionStrategyLeg] = Field(min_length=1, max_length=8)
+    price_points: int = Field(default=500, ge=10, le=1000)
+    price_range_pct: float = Field(default=10.0, gt=0, le=50)
+    days_points: int = Field(default=30, ge=1, le=60)
+
+
+class OptionStrategyLegRead(OptionStrategyLeg):
+    expiry_date: str
+    premium: float
+    iv: float
+
+
+class OptionStrategyGreeks(BaseModel):
+    delta: float
+    gamma: float
+    vega: float
+    theta: float
+
+
+class OptionStrategyResponse(BaseModel):
+    symbol: str
+    underlying_value: float
+    timestamp: datetime
+    risk_free_rate: float
+    legs: list[OptionStrategyLegRead]
+    net_premium: float
+    prices: list[float]
+    days_to_expiry: list[float]
+    expiry_pnl: list[float]
+    pnl_grid: list[list[float]]
+    breakevens: list[float]
+    max_profit: float | None
+    max_loss: float | None
+    bounds_approximate: bool
+    net_greeks: OptionStrategyGreeks
+
+
+class OptionsHistoryPoint(BaseModel):
+    timestamp: datetime
+    value: float
+
+
+class OptionsHistorySeries(BaseModel):
+    metric: str
+    strike: float | None
+    points: list[OptionsHistoryPoint]
+
+
+class OptionsHistoryResponse(BaseModel):
+    symbol: str
+    expiry_date: str
+    start: datetime
+    end: datetime
+    method: str
+    raw_points: int
+    series: list[OptionsHistorySeries]
 
 
 class AISignalEngineResponse(BaseModel):
+    symbol: str
     score: int
     classification: str
@@ -2,14 +2,18 @@ from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.models.feature_flag import FeatureFlag
+from app.models.market_data import SectorOverride
 from app.models.subscription import Subscription
 from app.models.user import User, UserRole
 from app.repositories.admin_repository import AdminRepository
+from app.repositories.sector_override_repository import SectorOverrideRepository
+from app.services.sector_service import SectorService, normalize_industry, sector_slug
 
 
 class AdminService:
     def __init__(self, db: Session) -> None:
         self.repository = AdminRepository(db)
+        self.sector_override_repository = SectorOverrideRepository(db)
 
     def list_users(self, *, page: int, size: int) -> tuple[list[User], int]:
         offset = (page - 1) * size
@@ -38,3 +42,22 @@ class AdminService:
         if not normalized_name:
             raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail='Feature flag name is required')
         return self.repository.toggle_feature_flag(name=normalized_name, enabled=enabled)
+
+    def list_sector_overrides(self) -> tuple[list[SectorOverride], list[str]]:
+        return self.sector_override_repository.list_all(), SectorService().unknown_industries()
+
+    def set_sector_override(self, *, industry: str, sector: str) -> SectorOverride:
+        normalized_industry = normalize_industry(industry)
+        normalized_sector = sector_slug(sector)
+        if not normalized_industry or not normalized_sector:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail='Industry and sector are required')
+        override = self.sector_override_repository.upsert(industry=normalized_industry, sector=normalized_sector)
+        sector_service = SectorService()
+        sector_service.forget_unknown(normalized_industry)
+        sector_service.invalidate()
+        return override
+
+    def delete_sector_override(self, *, industry: str) -> None:
+        if not self.sector_override_repository.delete(normalize_industry(industry)):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Sector override not found')
+        SectorService().invalidate()
@@ -1,79 +1,202 @@
 import json
 from datetime import datetime
 
+import numpy as np
+
+from app.core.config import get_settings
 from app.core.database import SessionLocal
 from app.repositories.user_repository import UserRepository
-from app.services.options_analytics_service import OptionsAnalyticsService
-from app.utils.redis_client import redis_client
+from app.services.oi_delta_service import OIDeltaService
+from app.services.options_analytics_service import (
+    OPTIONS_ANALYTICS_CACHE_PREFIX,
+    OptionsAnalyticsService,
+    is_prefetched_symbol,
+    tracked_option_symbols,
+)
+from app.services.unusual_oi_service import UnusualOIService
+from app.utils import market_cache
+from app.utils.redis_client import redis_binary_client, redis_client
 from app.utils.telegram_client import send_bulk_telegram_messages
 
+settings = get_settings()
+
 AI_SIGNAL_CACHE_PREFIX = 'ai:signal'
 AI_SIGNAL_CLASSIFICATION_CACHE_PREFIX = 'ai:signal:classification'
 AI_ALERT_STATE_CACHE_PREFIX = 'ai:alert:state'
 AI_SIGNAL_CACHE_SECONDS = 60
+AI_SIGNAL_OI_DELTA_WINDOW = '5m'
+AI_SIGNAL_WEIGHTS = {
+    'pcr': 0.30,
+    'change_oi': 0.25,
+    'proximity': 0.25,
+    'buildup': 0.20,
+    'oi_delta': 0.20,
+}
+PCR_EXTREME_HIGH = 1.3
+PCR_EXTREME_LOW = 0.7
+OI_BUILDUP_SCORES = {
+    'put_writing_call_unwinding': 90.0,
+    'call_writing_put_unwinding': 15.0,
+    'both_unwinding': 45.0,
+    'neutral': 50.0,
+}
+# (minimum PCR, score), checked in order; lower PCRs score 20.
+PCR_SCORE_BANDS = ((1.3, 90.0), (1.1, 80.0), (0.95, 60.0), (0.8, 40.0))
+# (minimum score, classification), checked in order; lower scores are Strong Bearish.
+SIGNAL_CLASSIFICATIONS = ((75, 'Strong Bullish'), (60, 'Bullish'), (40, 'Neutral'), (25, 'Bearish'))
+AI_SIGNAL_FEATURES = (
+    'pcr',
+    'change_in_put_oi',
+    'change_in_call_oi',
+    'underlying_value',
+    'strongest_support',
+    'strongest_resistance',
+)
 
 
 class AISignalEngineService:
     def __init__(self) -> None:
         self.options_analytics_service = OptionsAnalyticsService()
+        self.oi_delta_service = OIDeltaService()
+        self.unusual_oi_service = UnusualOIService()
+        self.data_age_seconds = 0.0
 
     def get_latest_signal(self, symbol: str = 'NIFTY') -> dict:
         normalized_symbol = symbol.strip().upper()
-        cache_key = self._cache_key(normalized_symbol)
-        cached_signal = redis_client.get(cache_key)
-        if cached_signal:
-            return json.loads(cached_signal)
-        return self.generate_signal(normalized_symbol)
+        # Tracked symbols are scored in batch by the monitor task; only other symbols are built on request.
+        if is_prefetched_symbol(normalized_symbol):
+            cached = market_cache.read_snapshot(self._cache_key(normalized_symbol))
+        else:
+            cached = market_cache.cached_fetch(
+                self._cache_key(normalized_symbol),
+                lambda: self._build_signal(normalized_symbol),
+                fresh_seconds=AI_SIGNAL_CACHE_SECONDS,
+            )
+        self.data_age_seconds = cached.age_seconds
+        return cached.value
 
     def generate_signal(self, symbol: str = 'NIFTY') -> dict:
         normalized_symbol = symbol.strip().upper()
-        analytics = self.options_analytics_service.get_analytics(normalized_symbol)
-
-        pcr_score = self._score_pcr(analytics.get('pcr'))
-        change_oi_score = self._score_change_in_oi(
-            analytics.get('change_in_put_oi'),
-            analytics.get('change_in_call_oi'),
-        )
-        proximity_score = self._score_support_resistance_proximity(
-            analytics.get('underlying_value'),
-            analytics.get('strongest_support'),
-            analytics.get('strongest_resistance'),
-        )
-        buildup_score = self._score_oi_buildup(
-            analytics.get('change_in_put_oi'),
-            analytics.get('change_in_call_oi'),
-            analytics.get('pcr'),
+        analytics, signal = self._score_symbol(normalized_symbol)
+        market_cache.store(
+            self._cache_key(normalized_symbol),
+            signal,
+            fresh_seconds=AI_SIGNAL_CACHE_SECONDS,
+            age_seconds=self.options_analytics_service.data_age_seconds,
         )
+        classification_key = self._classification_key(normalized_symbol)
+        previous_classification = redis_client.get(classification_key)
+        redis_client.set(classification_key, signal['classification'])
+        self._alert_signals([(normalized_symbol, analytics)], [signal], [previous_classification])
+        return signal
 
-        score = round(
-            (pcr_score * 0.30)
-            + (change_oi_score * 0.25)
-            + (proximity_score * 0.25)
-            + (buildup_score * 0.20)
+    def generate_signals(self, symbols: list[str] | None = None) -> dict[str, dict]:
+        symbols = symbols or tracked_option_symbols()
+        entries = market_cache.read_many([f'{OPTIONS_ANALYTICS_CACHE_PREFIX}:{symbol}' for symbol in symbols])
+        # Nearest expiry, as get_analytics selects by default; symbols not refreshed yet are skipped.
+        rows = [
+            (symbol, entry.value['expiries'][0], entry.age_seconds)
+            for symbol, entry in zip(symbols, entries)
+            if entry is not None and entry.value.get('expiries')
+        ]
+        if not rows:
+            return {}
+
+        oi_deltas = self.oi_delta_service.get_delta_totals_many(
+            [(symbol, analytics['expiry_date']) for symbol, analytics, _ in rows],
+            AI_SIGNAL_OI_DELTA_WINDOW,
         )
-        classification = self._classify_signal(score)
-
-        signal_payload = {
-            'symbol': normalized_symbol,
-            'score': score,
-            'classification': classification,
-            'generated_at': datetime.utcnow().isoformat(),
-        }
-        redis_client.set(self._cache_key(normalized_symbol), json.dumps(signal_payload), ex=AI_SIGNAL_CACHE_SECONDS)
-        self._process_alerts(
-            symbol=normalized_symbol,
-            analytics=analytics,
-            classification=classification,
-            score=score,
+        signals = self._score([(symbol, analytics) for symbol, analytics, _ in rows], oi_deltas)
+        previous_classifications = redis_client.mget([self._classification_key(symbol) for symbol, _, _ in rows])
+
+        pipeline = redis_binary_client.pipeline()
+        for (symbol, _, age_seconds), signal in zip(rows, signals):
+            market_cache.store_many(
+                {self._cache_key(symbol): json.dumps(signal).encode()},
+                fresh_seconds=AI_SIGNAL_CACHE_SECONDS,
+                age_seconds=age_seconds,
+                pipeline=pipeline,
+            )
+            pipeline.set(self._classification_key(symbol), signal['classification'])
+        pipeline.execute()
+
+        self._alert_signals([(symbol, analytics) for symbol, analytics, _ in rows], signals, previous_classifications)
+        return {signal['symbol']: signal for signal in signals}
+
+    def _build_signal(self, symbol: str) -> market_cache.CachedValue[dict]:
+        # Request path: score only. Classification edges and alerts belong to the scheduled tasks.
+        _, signal = self._score_symbol(symbol)
+        return market_cache.CachedValue(
+            value=signal,
+            age_seconds=self.options_analytics_service.data_age_seconds,
         )
-        return signal_payload
 
-    def _process_alerts(self, *, symbol: str, analytics: dict, classification: str, score: int) -> None:
+    def _score_symbol(self, symbol: str) -> tuple[dict, dict]:
+        analytics = self.options_analytics_service.get_analytics(symbol)
+        oi_delta = self.oi_delta_service.get_delta_totals(symbol, analytics['expiry_date'], AI_SIGNAL_OI_DELTA_WINDOW)
+        return analytics, self._score([(symbol, analytics)], [oi_delta])[0]
+
+    def _alert_signals(
+        self,
+        rows: list[tuple[str, dict]],
+        signals: list[dict],
+        previous_classifications: list[str | None],
+    ) -> None:
+        alert_symbols = {symbol.strip().upper() for symbol in settings.AI_SIGNAL_ALERT_SYMBOLS}
+        alerts = [
+            (symbol, analytics, signal, previous)
+            for (symbol, analytics), signal, previous in zip(rows, signals, previous_classifications)
+            if symbol in alert_symbols
+        ]
+        if not alerts:
+            return
+
         chat_ids = self._linked_chat_ids()
+        for symbol, analytics, signal, previous in alerts:
+            self._process_alerts(
+                symbol=symbol,
+                analytics=analytics,
+                signal=signal,
+                previous_classification=previous,
+                chat_ids=chat_ids,
+            )
+
+    def _score(self, rows: list[tuple[str, dict]], oi_deltas: list[tuple[int, int] | None]) -> list[dict]:
+        features = np.array([signal_features(analytics, oi_delta) for (_, analytics), oi_delta in zip(rows, oi_deltas)])
+        scores = score_signals(features)
+        generated_at = datetime.utcnow().isoformat()
+        return [
+            {
+                'symbol': symbol,
+                'score': score,
+                'classification': classification,
+                'generated_at': generated_at,
+            }
+            for (symbol, _), score, classification in zip(rows, scores.tolist(), classify_signals(scores).tolist())
+        ]
+
+    def _process_alerts(
+        self,
+        *,
+        symbol: str,
+        analytics: dict,
+        signal: dict,
+        previous_classification: str | None,
+        chat_ids: list[str],
+    ) -> None:
         if not chat_ids:
             return
 
-        self._alert_on_classification_change(symbol, classification, score, chat_ids)
+        if previous_classification and previous_classification != signal['classification']:
+            send_bulk_telegram_messages(
+                chat_ids,
+                (
+                    f'📈 AI Trading Signal Changed for {symbol}\n'
+                    f'Previous: {previous_classification}\n'
+                    f"Current: {signal['classification']}\n"
+                    f"Score: {signal['score']}"
+                ),
+            )
         self._alert_on_pcr_extreme(symbol, analytics.get('pcr'), chat_ids)
         self._alert_on_support_break(
             symbol,
@@ -87,6 +210,7 @@ class AISignalEngineService:
             analytics.get('strongest_resistance'),
             chat_ids,
         )
+        self._alert_on_unusual_oi(symbol, chat_ids)
 
     def _linked_chat_ids(self) -> list[str]:
         db = SessionLocal()
@@ -96,29 +220,14 @@ class AISignalEngineService:
         finally:
             db.close()
 
-    def _alert_on_classification_change(self, symbol: str, classification: str, score: int, chat_ids: list[str]) -> None:
-        classification_key = self._classification_key(symbol)
-        previous = redis_client.get(classification_key)
-        if previous and previous != classification:
-            send_bulk_telegram_messages(
-                chat_ids,
-                (
-                    f'📈 AI Trading Signal Changed for {symbol}\n'
-                    f'Previous: {previous}\n'
-                    f'Current: {classification}\n'
-                    f'Score: {score}'
-                ),
-            )
-        redis_client.set(classification_key, classification)
-
     def _alert_on_pcr_extreme(self, symbol: str, pcr: float | None, chat_ids: list[str]) -> None:
         if pcr is None:
             return
         state_key = self._alert_state_key(symbol, 'pcr_extreme')
-        is_extreme = pcr >= 1.3 or pcr <= 0.7
+        is_extreme = pcr >= PCR_EXTREME_HIGH or pcr <= PCR_EXTREME_LOW
         previous_state = redis_client.get(state_key) == '1'
         if is_extreme and not previous_state:
-            direction = 'Bullish Extreme' if pcr >= 1.3 else 'Bearish Extreme'
+            direction = 'Bullish Extreme' if pcr >= PCR_EXTREME_HIGH else 'Bearish Extreme'
             send_bulk_telegram_messages(
                 chat_ids,
                 f'⚠️ PCR Extreme for {symbol}\nPCR: {pcr}\nState: {direction}',
@@ -163,6 +272,23 @@ class AISignalEngineService:
             )
         redis_client.set(state_key, '1' if is_broken else '0')
 
+    def _alert_on_unusual_oi(self, symbol: str, chat_ids: list[str]) -> None:
+        detection = self.unusual_oi_service.latest(symbol)
+        if detection is None:
+            return
+        state_key = self._alert_state_key(symbol, 'unusual_oi')
+        # Keyed on the detection's snapshot time so each one-minute sample alerts at most once.
+        if detection['strikes'] and redis_client.get(state_key) != detection['captured_at']:
+            lines = [
+                f"{item['expiry_date']} {item['strike']:g} {item['metric']}: {item['change']:+,.0f} (z={item['z_score']})"
+                for item in detection['strikes'][:5]
+            ]
+            send_bulk_telegram_messages(
+                chat_ids,
+                f'🔍 Unusual OI Activity for {symbol}\n' + '\n'.join(lines),
+            )
+        redis_client.set(state_key, detection['captured_at'])
+
     def _cache_key(self, symbol: str) -> str:
         return f'{AI_SIGNAL_CACHE_PREFIX}:{symbol}'
 
@@ -172,70 +298,111 @@ class AISignalEngineService:
     def _alert_state_key(self, symbol: str, alert_type: str) -> str:
         return f'{AI_ALERT_STATE_CACHE_PREFIX}:{symbol}:{alert_type}'
 
-    def _score_pcr(self, pcr: float | None) -> float:
-        if pcr is None:
-            return 50.0
-        if pcr >= 1.3:
-            return 90.0
-        if pcr >= 1.1:
-            return 80.0
-        if pcr >= 0.95:
-            return 60.0
-        if pcr >= 0.8:
-            return 40.0
-        return 20.0
-
-    def _score_change_in_oi(self, put_change: int | None, call_change: int | None) -> float:
-        put_value = put_change or 0
-        call_value = call_change or 0
-        net_change = put_value - call_value
-        total_magnitude = abs(put_value) + abs(call_value)
-        if total_magnitude == 0:
-            return 50.0
-        ratio = net_change / total_magnitude
-        return max(0.0, min(100.0, 50.0 + (ratio * 50.0)))
-
-    def _score_support_resistance_proximity(
-        self,
-        underlying: float | None,
-        support: float | None,
-        resistance: float | None,
-    ) -> float:
-        if underlying is None or support is None or resistance is None:
-            return 50.0
-        if support >= resistance:
-            return 50.0
-
-        support_distance = max(0.0, (underlying - support) / underlying)
-        resistance_distance = max(0.0, (resistance - underlying) / underlying)
-        if support_distance + resistance_distance == 0:
-            return 50.0
-
-        bullish_bias = resistance_distance - support_distance
-        normalized_bias = bullish_bias / (support_distance + resistance_distance)
-        return max(0.0, min(100.0, 50.0 + (normalized_bias * 50.0)))
-
-    def _score_oi_buildup(self, put_change: int | None, call_change: int | None, pcr: float | None) -> float:
-        put_value = put_change or 0
-        call_value = call_change or 0
-
-        if put_value > 0 and call_value < 0:
-            return 90.0
-        if put_value > 0 and call_value > 0:
-            return 70.0 if (pcr or 1.0) >= 1 else 55.0
-        if put_value < 0 and call_value > 0:
-            return 15.0
-        if put_value < 0 and call_value < 0:
-            return 45.0
-        return 50.0
-
-    def _classify_signal(self, score: int) -> str:
-        if score >= 75:
-            return 'Strong Bullish'
-        if score >= 60:
-            return 'Bullish'
-        if score >= 40:
-            return 'Neutral'
-        if score >= 25:
-            return 'Bearish'
-        return 'Strong Bearish'
+
+def classify_oi_buildup(put_change: int | None, call_change: int | None) -> str:
+    put_value = put_change or 0
+    call_value = call_change or 0
+
+    if put_value > 0 and call_value < 0:
+        return 'put_writing_call_unwinding'
+    if put_value > 0 and call_value > 0:
+        return 'both_writing'
+    if put_value < 0 and call_value > 0:
+        return 'call_writing_put_unwinding'
+    if put_value < 0 and call_value < 0:
+        return 'both_unwinding'
+    return 'neutral'
+
+
+def score_oi_buildup(put_change: int | None, call_change: int | None, pcr: float | None) -> float:
+    pattern = classify_oi_buildup(put_change, call_change)
+    if pattern == 'both_writing':
+        return 70.0 if (pcr or 1.0) >= 1 else 55.0
+    return OI_BUILDUP_SCORES[pattern]
+
+
+def signal_features(analytics: dict, oi_delta: tuple[int, int] | None) -> list[float]:
+    call_delta, put_delta = oi_delta if oi_delta is not None else (None, None)
+    values = [*(analytics.get(name) for name in AI_SIGNAL_FEATURES), put_delta, call_delta]
+    return [np.nan if value is None else float(value) for value in values]
+
+
+def score_signals(features: np.ndarray) -> np.ndarray:
+    # One row per symbol in signal_features order; missing values are NaN.
+    pcr, put_change, call_change, underlying, support, resistance, put_delta, call_delta = features.T
+    # Columns in AI_SIGNAL_WEIGHTS order.
+    components = np.column_stack(
+        (
+            _score_pcr(pcr),
+            _score_change_in_oi(put_change, call_change),
+            _score_support_resistance_proximity(underlying, support, resistance),
+            _score_oi_buildup(put_change, call_change, pcr),
+            _score_change_in_oi(put_delta, call_delta),
+        )
+    )
+    # Weights are renormalised so symbols without intraday deltas keep the original four-factor score.
+    weights = np.tile(np.array(list(AI_SIGNAL_WEIGHTS.values())), (len(features), 1))
+    weights[:, 4] = np.where(np.isnan(put_delta) | np.isnan(call_delta), 0.0, weights[:, 4])
+    return np.round((components * weights).sum(axis=1) / weights.sum(axis=1)).astype(np.int64)
+
+
+def classify_signals(scores: np.ndarray) -> np.ndarray:
+    return np.select(
+        [scores >= minimum for minimum, _ in SIGNAL_CLASSIFICATIONS],
+        [classification for _, classification in SIGNAL_CLASSIFICATIONS],
+        'Strong Bearish',
+    )
+
+
+def _score_pcr(pcr: np.ndarray) -> np.ndarray:
+    return np.select(
+        [np.isnan(pcr), *(pcr >= minimum for minimum, _ in PCR_SCORE_BANDS)],
+        [50.0, *(score for _, score in PCR_SCORE_BANDS)],
+        20.0,
+    )
+
+
+def _score_change_in_oi(put_change: np.ndarray, call_change: np.ndarray) -> np.ndarray:
+    put_value = np.nan_to_num(put_change)
+    call_value = np.nan_to_num(call_change)
+    total_magnitude = np.abs(put_value) + np.abs(call_value)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = (put_value - call_value) / total_magnitude
+    return np.where(total_magnitude == 0, 50.0, np.clip(50.0 + ratio * 50.0, 0.0, 100.0))
+
+
+def _score_support_resistance_proximity(
+    underlying: np.ndarray,
+    support: np.ndarray,
+    resistance: np.ndarray,
+) -> np.ndarray:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        support_distance = np.maximum(0.0, (underlying - support) / underlying)
+        resistance_distance = np.maximum(0.0, (resistance - underlying) / underlying)
+        spread = support_distance + resistance_distance
+        normalized_bias = (resistance_distance - support_distance) / spread
+    # NaN inputs fail every comparison, so missing levels fall through to neutral.
+    valid = (support < resistance) & (underlying > 0) & (spread > 0)
+    return np.where(valid, np.clip(50.0 + normalized_bias * 50.0, 0.0, 100.0), 50.0)
+
+
+def _score_oi_buildup(put_change: np.ndarray, call_change: np.ndarray, pcr: np.ndarray) -> np.ndarray:
+    put_value = np.nan_to_num(put_change)
+    call_value = np.nan_to_num(call_change)
+    # Mirrors `pcr or 1.0` in score_oi_buildup: a missing or zero PCR counts as 1.
+    pcr_value = np.where(np.isnan(pcr) | (pcr == 0), 1.0, pcr)
+    return np.select(
+        [
+            (put_value > 0) & (call_value < 0),
+            (put_value > 0) & (call_value > 0),
+            (put_value < 0) & (call_value > 0),
+            (put_value < 0) & (call_value < 0),
+        ],
+        [
+            OI_BUILDUP_SCORES['put_writing_call_unwinding'],
+            np.where(pcr_value >= 1, 70.0, 55.0),
+            OI_BUILDUP_SCORES['call_writing_put_unwinding'],
+            OI_BUILDUP_SCORES['both_unwinding'],
+        ],
+        OI_BUILDUP_SCORES['neutral'],
+    )
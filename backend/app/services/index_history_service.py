@@ -0,0 +1,155 @@
+import json
+import time
+from datetime import date, datetime, timezone
+
+import numpy as np
+from fastapi import HTTPException, status
+
+from app.core.config import get_settings
+from app.services.nifty_analytics_service import INDEX_IMPACT_STREAM_KEY, index_cache_key, tracked_indices
+from app.services.option_chain import nullable_list
+from app.utils import market_cache
+from app.utils.market_calendar import trade_date
+from app.utils.redis_client import redis_binary_client
+
+settings = get_settings()
+
+INDEX_HISTORY_INTERVALS = {'1m': 60, '5m': 5 * 60}
+INDEX_HISTORY_KEY = 'impact_history'
+INDEX_HISTORY_ROLLUP_BATCH = 1000
+# One float64 record per bucket: closing values, the bucket's total impact range and sample
+# count, then one closing impact per sector in the order of the day's `sectors` field.
+INDEX_HISTORY_FIELDS = ('total_impact', 'impact_high', 'impact_low', 'total_index_points', 'index_value', 'samples')
+INDEX_HISTORY_SECTORS_FIELD = b'sectors'
+
+
+class IndexHistoryService:
+    def __init__(self) -> None:
+        self.data_age_seconds = 0.0
+
+    def rollup(self, index_names: list[str] | None = None) -> dict[str, int]:
+        return {index_name: self._rollup_index(index_name) for index_name in index_names or tracked_indices()}
+
+    def get_history(self, index_name: str, interval: str, day: date | None = None) -> dict:
+        index_name = index_name.strip().upper()
+        if index_name not in tracked_indices():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail='Index is not tracked',
+            )
+        day = day or trade_date()
+
+        # One hash per index, interval and day: a query is a single HGETALL over finished buckets.
+        pipeline = redis_binary_client.pipeline(transaction=False)
+        pipeline.hgetall(self._history_key(index_name, interval, day))
+        pipeline.get(self._cursor_key(index_name))
+        buckets, cursor = pipeline.execute()
+
+        sectors = json.loads(buckets.pop(INDEX_HISTORY_SECTORS_FIELD, b'[]'))
+        starts = sorted(int(field) for field in buckets)
+        records = np.full((len(starts), len(INDEX_HISTORY_FIELDS) + len(sectors)), np.nan)
+        for row, start in enumerate(starts):
+            record = np.frombuffer(buckets[str(start).encode()], dtype=np.float64)
+            records[row, : record.size] = record
+        columns = dict(zip(INDEX_HISTORY_FIELDS, records.T))
+
+        if cursor is not None:
+            # Stream ids start with the append time in milliseconds.
+            rolled_up_at = int(cursor.split(b'-')[0]) / 1000
+            self.data_age_seconds = max(self.data_age_seconds, time.time() - rolled_up_at)
+        return {
+            'index': index_name,
+            'interval': interval,
+            'trade_date': day,
+            'timestamps': [datetime.fromtimestamp(start, tz=timezone.utc) for start in starts],
+            **{name: nullable_list(values) for name, values in columns.items() if name != 'samples'},
+            'samples': columns['samples'].astype(np.int64).tolist(),
+            'sector_impact': {
+                sector: nullable_list(records[:, len(INDEX_HISTORY_FIELDS) + column])
+                for column, sector in enumerate(sectors)
+            },
+        }
+
+    def _rollup_index(self, index_name: str) -> int:
+        lock = market_cache.acquire_refresh_lock(index_cache_key(index_name, INDEX_HISTORY_KEY))
+        if lock is None:
+            return 0
+        try:
+            cursor = redis_binary_client.get(self._cursor_key(index_name))
+            rolled_up = 0
+            while True:
+                entries = redis_binary_client.xrange(
+                    index_cache_key(index_name, INDEX_IMPACT_STREAM_KEY),
+                    min=b'(' + cursor if cursor else '-',
+                    count=INDEX_HISTORY_ROLLUP_BATCH,
+                )
+                if not entries:
+                    break
+                self._store_buckets(index_name, entries)
+                cursor = entries[-1][0]
+                rolled_up += len(entries)
+                if len(entries) < INDEX_HISTORY_ROLLUP_BATCH:
+                    break
+            return rolled_up
+        finally:
+            market_cache.release_refresh_lock(lock)
+
+    def _store_buckets(self, index_name: str, entries: list[tuple[bytes, dict[bytes, bytes]]]) -> None:
+        fields = sorted((entry for _, entry in entries), key=lambda entry: float(entry[b'fetched_at']))
+        fetched_at = np.array([float(entry[b'fetched_at']) for entry in fields])
+        closes = np.array(
+            [[_stream_float(entry[name]) for name in (b'total_impact', b'total_index_points', b'index_value')] for entry in fields]
+        )
+        sector_impacts = [json.loads(entry[b'sector_impact']) for entry in fields]
+
+        # Sorted by fetch time, each bucket is a contiguous run and reduceat aggregates all of them at once.
+        updates: dict[str, dict[int, tuple[np.ndarray, dict[str, float]]]] = {}
+        for interval, seconds in INDEX_HISTORY_INTERVALS.items():
+            starts = fetched_at // seconds * seconds
+            first = np.flatnonzero(np.r_[True, starts[1:] != starts[:-1]])
+            last = np.r_[first[1:] - 1, starts.size - 1]
+            high = np.fmax.reduceat(closes[:, 0], first)
+            low = np.fmin.reduceat(closes[:, 0], first)
+            for bucket, (start, close_row) in enumerate(zip(starts[first].astype(np.int64).tolist(), last.tolist())):
+                key = self._history_key(index_name, interval, trade_date(datetime.fromtimestamp(start, tz=timezone.utc)))
+                updates.setdefault(key, {})[start] = np.r_[
+                    closes[close_row, 0],
+                    high[bucket],
+                    low[bucket],
+                    closes[close_row, 1:],
+                    last[bucket] - first[bucket] + 1,
+                ], sector_impacts[close_row]
+
+        pipeline = redis_binary_client.pipeline(transaction=False)
+        for key, buckets in updates.items():
+            pipeline.hmget(key, [INDEX_HISTORY_SECTORS_FIELD, *(str(start) for start in buckets)])
+        existing = pipeline.execute()
+
+        pipeline = redis_binary_client.pipeline()
+        for (key, buckets), (raw_sectors, *previous) in zip(updates.items(), existing):
+            sectors = json.loads(raw_sectors) if raw_sectors else []
+            sectors.extend(sorted({sector for _, sector_close in buckets.values() for sector in sector_close} - set(sectors)))
+            mapping: dict[bytes | str, bytes] = {INDEX_HISTORY_SECTORS_FIELD: json.dumps(sectors).encode()}
+            for (start, (summary, sector_close)), raw in zip(buckets.items(), previous):
+                record = np.r_[summary, [sector_close.get(sector, np.nan) for sector in sectors]]
+                if raw is not None:
+                    # A bucket still open at the last rollup: widen its range and count, keep the newer close.
+                    stored = np.frombuffer(raw, dtype=np.float64)
+                    record[1] = np.fmax(record[1], stored[1])
+                    record[2] = np.fmin(record[2], stored[2])
+                    record[5] += stored[5]
+                mapping[str(start)] = record.tobytes()
+            pipeline.hset(key, mapping=mapping)
+            pipeline.expire(key, settings.INDEX_IMPACT_HISTORY_RETENTION_DAYS * 24 * 60 * 60)
+        pipeline.set(self._cursor_key(index_name), entries[-1][0])
+        pipeline.execute()
+
+    def _history_key(self, index_name: str, interval: str, day: date) -> str:
+        return index_cache_key(index_name, f'{INDEX_HISTORY_KEY}:{interval}:{day.isoformat()}')
+
+    def _cursor_key(self, index_name: str) -> str:
+        return index_cache_key(index_name, f'{INDEX_HISTORY_KEY}:cursor')
+
+
+def _stream_float(value: bytes) -> float:
+    return float(value) if value else np.nan
@@ -0,0 +1,117 @@
+import logging
+import time
+from dataclasses import dataclass
+from datetime import date
+
+import psycopg2
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.models.market_data import IndexWeight
+from app.repositories.index_weight_repository import IndexWeightRepository
+from app.utils.market_calendar import trade_date
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+INDEX_WEIGHT_RELOAD_SECONDS = 5 * 60
+
+
+@dataclass(frozen=True)
+class IndexWeightSet:
+    index_name: str
+    effective_date: date
+    constituents: dict[str, dict]
+    loaded_at: float
+
+
+# Per-process copy of the latest persisted set for each index; the live path never re-scrapes weights.
+_weight_sets: dict[str, IndexWeightSet] = {}
+
+
+class IndexWeightService:
+    def load(self) -> None:
+        db = SessionLocal()
+        try:
+            repository = IndexWeightRepository(db)
+            for index_name in repository.index_names():
+                self._cache(index_name, repository.latest(index_name))
+        finally:
+            db.close()
+
+    def current(self, index_name: str) -> IndexWeightSet | None:
+        weight_set = _weight_sets.get(index_name)
+        if weight_set is not None and time.monotonic() - weight_set.loaded_at < INDEX_WEIGHT_RELOAD_SECONDS:
+            return weight_set
+
+        # Periodic reload picks up sets persisted by other processes (daily task, rebalance seen elsewhere).
+        db = SessionLocal()
+        try:
+            return self._cache(index_name, IndexWeightRepository(db).latest(index_name)) or weight_set
+        except (SQLAlchemyError, psycopg2.Error) as exc:
+            logger.warning('Keeping in-memory weights for %s; reload failed: %s', index_name, str(exc).splitlines()[0])
+            return weight_set
+        finally:
+            db.close()
+
+    def save(self, index_name: str, constituents: dict[str, dict]) -> IndexWeightSet:
+        weight_set = IndexWeightSet(
+            index_name=index_name,
+            effective_date=trade_date(),
+            constituents=constituents,
+            loaded_at=time.monotonic(),
+        )
+        db = SessionLocal()
+        try:
+            IndexWeightRepository(db).replace(
+                index_name,
+                weight_set.effective_date,
+                [{'symbol': symbol, **row} for symbol, row in constituents.items()],
+            )
+        except (SQLAlchemyError, psycopg2.Error) as exc:
+            db.rollback()
+            logger.warning('Using unpersisted weights for %s: %s', index_name, str(exc).splitlines()[0])
+        finally:
+            db.close()
+        _weight_sets[index_name] = weight_set
+        return weight_set
+
+    def weights(self, weight_set: IndexWeightSet, base_prices: dict[str, float]) -> dict[str, float]:
+        weights = {symbol: row['weight'] for symbol, row in weight_set.constituents.items()}
+        if not settings.INDEX_WEIGHT_DRIFT_ADJUSTMENT:
+            return weights
+
+        # Carry the stored weights forward to today's base prices: each weight grows with its own price
+        # since capture, renormalized so the index total is unchanged.
+        drifted = {
+            symbol: weight * base_prices[symbol] / weight_set.constituents[symbol]['reference_price']
+            if base_prices.get(symbol) and weight_set.constituents[symbol]['reference_price'] > 0
+            else weight
+            for symbol, weight in weights.items()
+        }
+        total = sum(drifted.values())
+        if total <= 0:
+            return weights
+        scale = sum(weights.values()) / total
+        return {symbol: weight * scale for symbol, weight in drifted.items()}
+
+    def _cache(self, index_name: str, rows: list[IndexWeight]) -> IndexWeightSet | None:
+        if not rows:
+            return None
+        weight_set = IndexWeightSet(
+            index_name=index_name,
+            effective_date=rows[0].effective_date,
+            constituents={
+                row.symbol: {
+                    'company_name': row.company_name,
+                    'sector': row.sector,
+                    'weight': row.weight,
+                    'reference_price': row.reference_price,
+                }
+                for row in rows
+            },
+            loaded_at=time.monotonic(),
+        )
+        _weight_sets[index_name] = weight_set
+        return weight_set
@@ -0,0 +1,218 @@
+import json
+import logging
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+
+import psycopg2
+from fastapi import HTTPException
+from redis.exceptions import LockError
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.services.nifty_analytics_service import NiftyAnalyticsService, tracked_indices
+from app.services.oi_delta_service import OIDeltaService, OIFrame
+from app.services.option_chain import OptionChain
+from app.services.option_history_service import OptionHistoryService
+from app.services.options_analytics_service import (
+    OptionsAnalyticsService,
+    option_chain_request,
+    tracked_option_symbols,
+)
+from app.services.unusual_oi_service import UnusualOIService
+from app.utils import nse_client
+from app.utils.nse_client import NSEClientError
+from app.utils.redis_client import redis_client
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+MARKET_REFRESH_STATUS_KEY = 'market:refresh:status'
+MARKET_REFRESH_LOCK_KEY = 'market:refresh:lock'
+OPTION_CHAIN_REFRESH_BATCH_SIZE = 20
+OPTION_HISTORY_THROTTLE_KEY = 'market:refresh:option_history'
+OPTION_HISTORY_SOURCE = 'history:option_chains'
+OPTION_ANALYTICS_SOURCE = 'analytics:option_chains'
+OPTION_GREEKS_SOURCE = 'greeks:option_chains'
+OI_DELTA_SOURCE = 'oi_delta:option_chains'
+UNUSUAL_OI_SOURCE = 'unusual_oi:option_chains'
+
+
+class MarketRefreshService:
+    def __init__(self) -> None:
+        self.options_analytics_service = OptionsAnalyticsService()
+        self.nifty_analytics_service = NiftyAnalyticsService()
+        self.oi_delta_service = OIDeltaService()
+        self.unusual_oi_service = UnusualOIService()
+        self._previous_status: dict[str, dict] = {}
+        self._status_updates: dict[str, dict] = {}
+        self._refreshed_chains: list[OptionChain] = []
+        self._minute_deltas: list[tuple[str, OIFrame]] = []
+
+    def refresh_all(self) -> dict[str, str]:
+        lock = redis_client.lock(MARKET_REFRESH_LOCK_KEY, timeout=settings.MARKET_REFRESH_INTERVAL_SECONDS * 4)
+        if not lock.acquire(blocking=False):
+            logger.info('Skipping market refresh; previous run still in progress')
+            return {}
+
+        try:
+            self._previous_status = self._load_status()
+            results = self.refresh_option_chains(tracked_option_symbols())
+            # Each stage is isolated: a failure is recorded as its source's error and the later stages still run.
+            results[OPTION_ANALYTICS_SOURCE] = self._run_stage(
+                OPTION_ANALYTICS_SOURCE,
+                lambda: self.options_analytics_service.refresh_analytics(self._refreshed_chains),
+            )
+            results[OPTION_GREEKS_SOURCE] = self._run_stage(
+                OPTION_GREEKS_SOURCE,
+                lambda: self.options_analytics_service.refresh_greeks(self._refreshed_chains),
+            )
+            results[OI_DELTA_SOURCE] = self._run_stage(OI_DELTA_SOURCE, self._refresh_oi_deltas)
+            results[UNUSUAL_OI_SOURCE] = self._run_stage(
+                UNUSUAL_OI_SOURCE,
+                lambda: self.unusual_oi_service.update(self._minute_deltas),
+            )
+            results.update(self.refresh_index_snapshots())
+            if self._should_persist_history():
+                results[OPTION_HISTORY_SOURCE] = self.persist_option_history(self._refreshed_chains)
+            return results
+        finally:
+            self._save_status()
+            try:
+                lock.release()
+            except LockError:
+                pass
+
+    def refresh_option_chains(self, symbols: list[str]) -> dict[str, str]:
+        results: dict[str, str] = {}
+        for start in range(0, len(symbols), OPTION_CHAIN_REFRESH_BATCH_SIZE):
+            batch = symbols[start:start + OPTION_CHAIN_REFRESH_BATCH_SIZE]
+            started_at = time.time()
+            payloads = nse_client.fetch_json_many([option_chain_request(symbol) for symbol in batch])
+            for symbol, payload in zip(batch, payloads):
+                error = None
+                if isinstance(payload, NSEClientError):
+                    error = str(payload)
+                else:
+                    try:
+                        self._refreshed_chains.append(self.options_analytics_service.refresh_snapshot(symbol, payload))
+                    except HTTPException as exc:
+                        error = str(exc.detail)
+                results[self._option_source(symbol)] = self._record(self._option_source(symbol), started_at, error)
+        return results
+
+    def refresh_index_snapshots(self) -> dict[str, str]:
+        started_at = time.time()
+        try:
+            errors = self.nifty_analytics_service.refresh_snapshots()
+        except Exception as exc:
+            logger.exception('Index snapshot refresh raised')
+            errors = dict.fromkeys(tracked_indices(), _stage_error(exc))
+        return {
+            self._index_source(index_name): self._record(self._index_source(index_name), started_at, error)
+            for index_name, error in errors.items()
+        }
+
+    def persist_option_history(self, chains: list[OptionChain]) -> str:
+        started_at = time.time()
+        error = None
+        db = SessionLocal()
+        try:
+            OptionHistoryService(db).record_chains(chains)
+        except (SQLAlchemyError, psycopg2.Error) as exc:
+            db.rollback()
+            error = str(exc).splitlines()[0]
+        except Exception as exc:
+            db.rollback()
+            logger.exception('Option history persist raised')
+            error = _stage_error(exc)
+        finally:
+            db.close()
+        return self._record(OPTION_HISTORY_SOURCE, started_at, error)
+
+    def get_status(self) -> list[dict]:
+        now = time.time()
+        items = []
+        for source, entry in sorted(self._load_status().items()):
+            last_success_at = entry.get('last_success_at')
+            items.append(
+                {
+                    'source': source,
+                    'last_attempt_at': self._to_datetime(entry.get('last_attempt_at')),
+                    'last_success_at': self._to_datetime(last_success_at),
+                    'data_age_seconds': round(now - last_success_at, 3) if last_success_at else None,
+                    'refresh_lag_seconds': entry.get('refresh_lag_seconds'),
+                    'duration_ms': entry.get('duration_ms'),
+                    'error': entry.get('error'),
+                }
+            )
+        return items
+
+    def _run_stage(self, source: str, stage: Callable[[], object]) -> str:
+        started_at = time.time()
+        try:
+            stage()
+        except Exception as exc:
+            logger.exception('Market refresh stage raised source=%s', source)
+            return self._record(source, started_at, _stage_error(exc))
+        return self._record(source, started_at, None)
+
+    def _refresh_oi_deltas(self) -> None:
+        self._minute_deltas = self.oi_delta_service.refresh(self._refreshed_chains)
+
+    def _record(self, source: str, started_at: float, error: str | None) -> str:
+        now = time.time()
+        previous = self._previous_status.get(source, {})
+        previous_success_at = previous.get('last_success_at')
+        entry = {
+            'last_attempt_at': now,
+            'last_success_at': previous_success_at if error else now,
+            # Lag is how old the snapshot had become by the time this refresh replaced it.
+            'refresh_lag_seconds': (
+                previous.get('refresh_lag_seconds')
+                if error or previous_success_at is None
+                else round(now - previous_success_at, 3)
+            ),
+            'duration_ms': round((now - started_at) * 1000, 2),
+            'error': error,
+        }
+        self._status_updates[source] = entry
+        if error:
+            logger.warning('Market refresh failed source=%s error=%s', source, error)
+        return error or 'ok'
+
+    def _load_status(self) -> dict[str, dict]:
+        return {source: json.loads(entry) for source, entry in redis_client.hgetall(MARKET_REFRESH_STATUS_KEY).items()}
+
+    def _save_status(self) -> None:
+        if self._status_updates:
+            redis_client.hset(
+                MARKET_REFRESH_STATUS_KEY,
+                mapping={source: json.dumps(entry) for source, entry in self._status_updates.items()},
+            )
+        self._status_updates = {}
+
+    def _should_persist_history(self) -> bool:
+        if not settings.OPTION_SNAPSHOT_HISTORY_ENABLED or not self._refreshed_chains:
+            return False
+        # Snapshots are refreshed more often than history is sampled; keep one write per interval.
+        return bool(
+            redis_client.set(OPTION_HISTORY_THROTTLE_KEY, '1', nx=True, ex=settings.OPTION_SNAPSHOT_INTERVAL_SECONDS)
+        )
+
+    def _option_source(self, symbol: str) -> str:
+        return f'options:{symbol}'
+
+    def _index_source(self, index_name: str) -> str:
+        return f'index:{index_name}'
+
+    def _to_datetime(self, timestamp: float | None) -> datetime | None:
+        if timestamp is None:
+            return None
+        return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+
+def _stage_error(exc: Exception) -> str:
+    message = str(exc).splitlines()[0] if str(exc) else ''
+    return f'{type(exc).__name__}: {message}' if message else type(exc).__name__
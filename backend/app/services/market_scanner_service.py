@@ -0,0 +1,178 @@
+import json
+import time
+import zlib
+from datetime import datetime, timezone
+
+from fastapi import HTTPException, status
+
+from app.core.config import get_settings
+from app.services.ai_signal_service import (
+    PCR_EXTREME_HIGH,
+    PCR_EXTREME_LOW,
+    classify_oi_buildup,
+    score_oi_buildup,
+)
+from app.services.options_analytics_service import OPTIONS_ANALYTICS_CACHE_PREFIX, tracked_option_symbols
+from app.utils import market_cache
+from app.utils.redis_client import redis_client
+
+settings = get_settings()
+
+MARKET_SCANNER_PREFIX = 'scanner'
+MARKET_SCANNER_CURRENT_KEY = 'scanner:current'
+MARKET_SCANNER_RESULT_SECONDS = 24 * 60 * 60
+MARKET_SCANNER_RETIRE_SECONDS = 60
+# Sorted-set rankings; break rankings only hold symbols currently through the level.
+MARKET_SCANNER_RANKINGS = ('pcr', 'buildup_score', 'max_pain_distance_pct', 'support_break_pct', 'resistance_break_pct')
+# Publishes ARGV[1] unless a newer scan is already current; returns the scan id to retire, if any.
+MARKET_SCANNER_PUBLISH_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if current == ARGV[1] then
+    return false
+end
+if current and tonumber(current) > tonumber(ARGV[1]) then
+    return ARGV[1]
+end
+redis.call('SET', KEYS[1], ARGV[1])
+return current
+"""
+
+
+class MarketScannerService:
+    def __init__(self) -> None:
+        self.data_age_seconds = 0.0
+
+    def start_scan(self) -> tuple[str, int]:
+        scan_id = str(int(time.time() * 1000))
+        shard_count = max(1, settings.MARKET_SCANNER_SHARDS)
+        redis_client.hset(
+            self._run_key(scan_id, 'meta'),
+            mapping={'shard_count': shard_count, 'started_at': datetime.now(timezone.utc).isoformat()},
+        )
+        redis_client.expire(self._run_key(scan_id, 'meta'), market_cache.expire_seconds(MARKET_SCANNER_RESULT_SECONDS))
+        return scan_id, shard_count
+
+    def scan_shard(self, scan_id: str, shard: int, shard_count: int) -> int:
+        symbols = [symbol for symbol in tracked_option_symbols() if shard_for(symbol, shard_count) == shard]
+        entries = market_cache.read_many([f'{OPTIONS_ANALYTICS_CACHE_PREFIX}:{symbol}' for symbol in symbols])
+
+        rows = [self._scan_row(symbol, entry.value) for symbol, entry in zip(symbols, entries) if entry is not None]
+        rows = [row for row in rows if row is not None]
+
+        pipeline = redis_client.pipeline(transaction=False)
+        if rows:
+            pipeline.hset(self._run_key(scan_id, 'rows'), mapping={row['symbol']: json.dumps(row) for row in rows})
+            for ranking in MARKET_SCANNER_RANKINGS:
+                scores = {row['symbol']: row[ranking] for row in rows if row[ranking] is not None}
+                if scores:
+                    pipeline.zadd(self._run_key(scan_id, ranking), scores)
+            for key in self._result_keys(scan_id):
+                pipeline.expire(key, market_cache.expire_seconds(MARKET_SCANNER_RESULT_SECONDS))
+        pipeline.hincrby(self._run_key(scan_id, 'meta'), 'symbols', len(rows))
+        pipeline.hincrby(self._run_key(scan_id, 'meta'), 'shards_done', 1)
+        *_, shards_done = pipeline.execute()
+
+        # The last shard to finish publishes the run, so readers never see a partially written scan.
+        if shards_done == shard_count:
+            redis_client.hset(self._run_key(scan_id, 'meta'), 'completed_at', datetime.now(timezone.utc).isoformat())
+            # Compare-and-set, so an older scan finishing late never replaces a newer published one.
+            retired_scan_id = redis_client.eval(MARKET_SCANNER_PUBLISH_SCRIPT, 1, MARKET_SCANNER_CURRENT_KEY, scan_id)
+            if retired_scan_id:
+                self._retire(retired_scan_id)
+        return len(rows)
+
+    def get_rankings(self, rank_by: str, order: str, limit: int) -> dict:
+        scan_id = redis_client.get(MARKET_SCANNER_CURRENT_KEY)
+        meta = redis_client.hgetall(self._run_key(scan_id, 'meta')) if scan_id else {}
+        if not meta.get('completed_at'):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail='Market scan is not available yet',
+            )
+
+        ranked = redis_client.zrange(self._run_key(scan_id, rank_by), 0, limit - 1, desc=order == 'desc', withscores=True)
+        rows = redis_client.hmget(self._run_key(scan_id, 'rows'), [symbol for symbol, _ in ranked]) if ranked else []
+        scanned_at = datetime.fromisoformat(meta['started_at'])
+        self.data_age_seconds = max(self.data_age_seconds, (datetime.now(timezone.utc) - scanned_at).total_seconds())
+        return {
+            'scanned_at': scanned_at,
+            'rank_by': rank_by,
+            'order': order,
+            'total_symbols': int(meta.get('symbols') or 0),
+            'items': [
+                {'rank': rank, **json.loads(row)}
+                for rank, row in enumerate(rows, start=1)
+                if row is not None
+            ],
+        }
+
+    def _scan_row(self, symbol: str, expiry_analytics: dict) -> dict | None:
+        expiries = expiry_analytics.get('expiries') or []
+        if not expiries:
+            return None
+        analytics = expiries[0]
+
+        underlying = analytics.get('underlying_value')
+        pcr = analytics.get('pcr')
+        put_change = analytics.get('change_in_put_oi')
+        call_change = analytics.get('change_in_call_oi')
+        support = analytics.get('strongest_support')
+        resistance = analytics.get('strongest_resistance')
+        max_pain = analytics.get('max_pain')
+
+        pcr_extreme = None
+        if pcr is not None and pcr >= PCR_EXTREME_HIGH:
+            pcr_extreme = 'bullish'
+        elif pcr is not None and pcr <= PCR_EXTREME_LOW:
+            pcr_extreme = 'bearish'
+
+        # Percent beyond the level, relative to the level; None while the level holds.
+        support_break = -_percent_change(underlying, support) if _is_below(underlying, support) else None
+        resistance_break = _percent_change(underlying, resistance) if _is_below(resistance, underlying) else None
+
+        return {
+            'symbol': symbol,
+            'expiry_date': analytics['expiry_date'],
+            'underlying_value': underlying,
+            'pcr': pcr,
+            'pcr_extreme': pcr_extreme,
+            'change_in_call_oi': call_change,
+            'change_in_put_oi': put_change,
+            'buildup': classify_oi_buildup(put_change, call_change),
+            'buildup_score': score_oi_buildup(put_change, call_change, pcr),
+            'max_pain': max_pain,
+            'max_pain_distance_pct': _percent_change(max_pain, underlying),
+            'strongest_support': support,
+            'strongest_resistance': resistance,
+            'support_break_pct': support_break,
+            'resistance_break_pct': resistance_break,
+            'timestamp': analytics.get('timestamp'),
+        }
+
+    def _retire(self, scan_id: str) -> None:
+        # Short grace period rather than DEL so requests already reading the old run can finish.
+        pipeline = redis_client.pipeline(transaction=False)
+        for key in (*self._result_keys(scan_id), self._run_key(scan_id, 'meta')):
+            pipeline.expire(key, MARKET_SCANNER_RETIRE_SECONDS)
+        pipeline.execute()
+
+    def _result_keys(self, scan_id: str) -> list[str]:
+        return [self._run_key(scan_id, name) for name in (*MARKET_SCANNER_RANKINGS, 'rows')]
+
+    def _run_key(self, scan_id: str, name: str) -> str:
+        return f'{MARKET_SCANNER_PREFIX}:{scan_id}:{name}'
+
+
+def shard_for(symbol: str, shard_count: int) -> int:
+    # crc32 rather than hash(): stable across worker processes regardless of PYTHONHASHSEED.
+    return zlib.crc32(symbol.encode()) % shard_count
+
+
+def _percent_change(value: float | None, reference: float | None) -> float | None:
+    if value is None or not reference:
+        return None
+    return round((value - reference) / reference * 100.0, 4)
+
+
+def _is_below(value: float | None, level: float | None) -> bool:
+    return value is not None and level is not None and value < level
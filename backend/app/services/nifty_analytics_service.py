@@ -1,207 +1,445 @@
 import json
-import re
-from dataclasses import dataclass
+import logging
+from collections.abc import Callable
+from datetime import datetime, timezone
 
-import requests
+import numpy as np
 from fastapi import HTTPException, status
 
-from app.utils.redis_client import redis_client
+from app.core.config import get_settings
+from app.services.index_weight_service import IndexWeightService, IndexWeightSet
+from app.services.sector_service import SectorService
+from app.utils import market_cache, nse_client
+from app.utils.nse_client import NSEClientError, NSERequest
+from app.utils.redis_client import redis_binary_client, redis_client
 
+settings = get_settings()
+logger = logging.getLogger(__name__)
 
-NSE_BASE_URL = 'https://www.nseindia.com'
 NIFTY_50_INDEX = 'NIFTY 50'
-WEIGHTS_CACHE_KEY = 'nifty:50:weights'
-LIVE_CACHE_KEY = 'nifty:50:live'
-SECTOR_HEATMAP_CACHE_KEY = 'nifty:50:sector_heatmap'
-WEIGHTS_CACHE_SECONDS = 15 * 60
-LIVE_CACHE_SECONDS = 5 * 60
-SECTOR_HEATMAP_CACHE_SECONDS = 5 * 60
+INDEX_CACHE_PREFIX = 'index'
+INDEX_SNAPSHOT_VIEW = 'snapshot'
+INDEX_IMPACT_VIEW = 'impact'
+INDEX_SECTOR_HEATMAP_VIEW = 'sector_heatmap'
+INDEX_DIFFS_KEY = 'diffs'
+INDEX_IMPACT_STREAM_KEY = 'impact_stream'
+INDEX_SNAPSHOT_CACHE_SECONDS = 5 * 60
+INDEX_IMPACT_TOP_K = 5
+INDEX_DELTA_AGGREGATES = (
+    'timestamp',
+    'index_value',
+    'total_impact',
+    'total_index_points',
+    'top_draggers',
+    'top_lifters',
+)
 
 
-@dataclass
-class NiftyConstituent:
-    symbol: str
-    company_name: str
-    weight: float
-    last_price: float
-    percent_change: float
+def tracked_indices() -> list[str]:
+    return [index_name.strip().upper() for index_name in settings.TRACKED_INDICES] or [NIFTY_50_INDEX]
 
-    @property
-    def impact(self) -> float:
-        return self.weight * self.percent_change
+
+def index_cache_key(index_name: str, view: str) -> str:
+    return f'{INDEX_CACHE_PREFIX}:{index_name.lower().replace(" ", "_")}:{view}'
 
 
 class NiftyAnalyticsService:
     def __init__(self) -> None:
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
-                'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 '
-                '(KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
-                'Accept': 'application/json, text/plain, */*',
-                'Referer': f'{NSE_BASE_URL}/',
-            }
+        self.index_weight_service = IndexWeightService()
+        self.sector_service = SectorService()
+        self.data_age_seconds = 0.0
+
+    def get_impact_snapshot(self, index_name: str = NIFTY_50_INDEX) -> bytes:
+        return self._read_view(index_name, INDEX_IMPACT_VIEW)
+
+    def get_sector_impact_heatmap(self, index_name: str = NIFTY_50_INDEX) -> bytes:
+        return self._read_view(index_name, INDEX_SECTOR_HEATMAP_VIEW)
+
+    def get_impact_delta(self, index_name: str, since: int) -> bytes:
+        if not settings.MARKET_PREFETCH_ENABLED:
+            # Without the prefetch task nothing else refreshes the index, and with it the diff history.
+            self.get_impact_snapshot(index_name)
+        delta = self._merge_diffs(index_name.strip().upper(), since)
+        # Too far behind, ahead of the server, or no diff history yet: the client needs the full snapshot.
+        if delta is None:
+            return self.get_impact_snapshot(index_name)
+        self.data_age_seconds = max(
+            self.data_age_seconds,
+            (datetime.now(timezone.utc) - datetime.fromisoformat(delta['timestamp'])).total_seconds(),
         )
-
-    def get_impact_snapshot(self) -> dict:
-        weights = self._get_weights()
-        live_changes = self._get_live_changes()
-
-        constituents: list[NiftyConstituent] = []
-        for symbol, weight_payload in weights.items():
-            live_payload = live_changes.get(symbol)
-            if live_payload is None:
+        return json.dumps(delta).encode()
+
+    def refresh_snapshots(self, index_names: list[str] | None = None) -> dict[str, str | None]:
+        index_names = index_names or tracked_indices()
+        _, errors = self._refresh(index_names)
+        return {index_name: errors.get(index_name) for index_name in index_names}
+
+    def refresh_weights(self) -> dict[str, int]:
+        index_names = tracked_indices()
+        prices: dict[str, dict] = {}
+        saved: dict[str, int] = {}
+        for index_name, payload in zip(index_names, self._fetch_index_payloads(index_names)):
+            if isinstance(payload, NSEClientError):
+                logger.warning('Skipping %s weight refresh: %s', index_name, payload)
                 continue
-
-            constituent = NiftyConstituent(
-                symbol=symbol,
-                company_name=weight_payload['company_name'],
-                weight=weight_payload['weight'],
-                last_price=live_payload['last_price'],
-                percent_change=live_payload['percent_change'],
+            weights = self._parse_weights(self._parse_members(index_name, payload, prices), prices)
+            if weights:
+                saved[index_name] = len(self.index_weight_service.save(index_name, weights).constituents)
+        if not saved:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail='Unable to fetch index weights',
             )
-            constituents.append(constituent)
+        return saved
 
-        if not constituents:
+    def _read_view(self, index_name: str, view: str) -> bytes:
+        index_name = index_name.strip().upper()
+        if index_name not in tracked_indices():
             raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail='Nifty live data unavailable',
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail='Index is not tracked',
             )
+        # Views are stored already serialized, so serving one is a single Redis read with no JSON work.
+        return self._read_cached(
+            index_cache_key(index_name, view),
+            lambda: self._load_view(index_name, view),
+            fresh_seconds=INDEX_SNAPSHOT_CACHE_SECONDS,
+            encode=bytes,
+            decode=bytes,
+        )
 
-        constituents.sort(key=lambda row: row.impact)
-        top_draggers = constituents[:5]
-        total_impact = sum(row.impact for row in constituents)
+    def _load_view(self, index_name: str, view: str) -> bytes:
+        views, errors = self._refresh([index_name])
+        if index_name in errors:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=errors[index_name])
+        return views[index_cache_key(index_name, view)]
+
+    def _refresh(self, index_names: list[str]) -> tuple[dict[str, bytes], dict[str, str]]:
+        errors: dict[str, str] = {}
+        # Prices are shared: a stock listed in several indices is parsed once, from the first document it appears in.
+        prices: dict[str, dict] = {}
+        members: dict[str, dict[str, float | None]] = {}
+        quotes: dict[str, tuple[float | None, float | None]] = {}
+        for index_name, payload in zip(index_names, self._fetch_index_payloads(index_names)):
+            if isinstance(payload, NSEClientError):
+                errors[index_name] = 'NSE is currently unavailable'
+                continue
+            members[index_name] = self._parse_members(index_name, payload, prices)
+            quotes[index_name] = self._parse_index_quote(index_name, payload)
+
+        weight_sets: dict[str, IndexWeightSet] = {}
+        for index_name, index_members in members.items():
+            try:
+                weight_sets[index_name] = self._get_weight_set(index_name, index_members, prices)
+            except HTTPException as exc:
+                errors[index_name] = str(exc.detail)
+
+        snapshots = self._build_snapshots(weight_sets, members, prices, quotes, errors)
+        previous = market_cache.read_many([index_cache_key(index_name, INDEX_SNAPSHOT_VIEW) for index_name in snapshots])
+        views: dict[str, bytes] = {}
+        pipeline = redis_binary_client.pipeline()
+        for (index_name, snapshot), previous_snapshot in zip(snapshots.items(), previous):
+            impact_view = self._impact_view(snapshot)
+            views[index_cache_key(index_name, INDEX_SNAPSHOT_VIEW)] = json.dumps(snapshot).encode()
+            views[index_cache_key(index_name, INDEX_IMPACT_VIEW)] = json.dumps(impact_view).encode()
+            views[index_cache_key(index_name, INDEX_SECTOR_HEATMAP_VIEW)] = json.dumps(
+                self._sector_heatmap_view(snapshot)
+            ).encode()
+            pipeline.xadd(
+                index_cache_key(index_name, INDEX_IMPACT_STREAM_KEY),
+                self._stream_entry(snapshot, impact_view),
+                maxlen=settings.INDEX_IMPACT_STREAM_MAXLEN,
+                approximate=True,
+            )
+            if previous_snapshot is not None:
+                diffs_key = index_cache_key(index_name, INDEX_DIFFS_KEY)
+                diff = self._diff(previous_snapshot.value, impact_view)
+                pipeline.lpush(diffs_key, json.dumps(diff).encode())
+                pipeline.ltrim(diffs_key, 0, settings.INDEX_IMPACT_DIFF_HISTORY - 1)
+                pipeline.expire(diffs_key, market_cache.expire_seconds(INDEX_SNAPSHOT_CACHE_SECONDS))
+        if views:
+            # Diffs go out in the same MULTI as the views, so a client never sees a version it cannot diff from.
+            market_cache.store_many(views, fresh_seconds=INDEX_SNAPSHOT_CACHE_SECONDS, pipeline=pipeline)
+            pipeline.execute()
+        return views, errors
+
+    def _build_snapshots(
+        self,
+        weight_sets: dict[str, IndexWeightSet],
+        members: dict[str, dict[str, float | None]],
+        prices: dict[str, dict],
+        quotes: dict[str, tuple[float | None, float | None]],
+        errors: dict[str, str],
+    ) -> dict[str, dict]:
+        index_names = list(weight_sets)
+        symbols = list(prices)
+        columns = {symbol: column for column, symbol in enumerate(symbols)}
+        base_prices = {symbol: item['base_price'] for symbol, item in prices.items()}
+
+        # Weight matrix (index x symbol): every index's impacts come from one product with the change vector.
+        weights = np.zeros((len(index_names), len(symbols)))
+        listed = np.zeros(weights.shape, dtype=bool)
+        sector_of: dict[str, str] = {}
+        for row, index_name in enumerate(index_names):
+            weight_set = weight_sets[index_name]
+            for symbol, weight in self.index_weight_service.weights(weight_set, base_prices).items():
+                if symbol in members[index_name]:
+                    weights[row, columns[symbol]] = weight
+                    listed[row, columns[symbol]] = True
+                    sector_of.setdefault(symbol, prices[symbol]['sector'])
+
+        changes = np.array([prices[symbol]['percent_change'] for symbol in symbols])
+        impacts = weights * changes
+        totals = weights @ changes
+        sectors = sorted(set(sector_of.values()))
+        sector_columns = {sector: column for column, sector in enumerate(sectors)}
+        sector_matrix = np.zeros((len(symbols), len(sectors)))
+        for symbol, sector in sector_of.items():
+            sector_matrix[columns[symbol], sector_columns[sector]] = 1.0
+        sector_impacts = impacts @ sector_matrix
+        sector_members = listed @ sector_matrix
+
+        pipeline = redis_client.pipeline(transaction=False)
+        for index_name in index_names:
+            pipeline.incr(index_cache_key(index_name, 'version'))
+        versions = pipeline.execute()
+
+        fetched_at = datetime.now(timezone.utc).isoformat()
+        snapshots: dict[str, dict] = {}
+        for row, (index_name, version) in enumerate(zip(index_names, versions)):
+            index_value, index_base = quotes[index_name]
+            member_columns = np.flatnonzero(listed[row])
+            if member_columns.size == 0:
+                errors[index_name] = f'{index_name} live data unavailable'
+                continue
+            snapshots[index_name] = {
+                'index': index_name,
+                'version': version,
+                'fetched_at': fetched_at,
+                'weights_effective_date': weight_sets[index_name].effective_date.isoformat(),
+                'index_value': index_value,
+                'index_base': index_base,
+                'total_impact': float(totals[row]),
+                'sector_impact': {
+                    sector: float(sector_impacts[row, column])
+                    for sector, column in sector_columns.items()
+                    if sector_members[row, column]
+                },
+                'constituents': [
+                    {
+                        'symbol': symbols[column],
+                        'company_name': weight_sets[index_name].constituents[symbols[column]]['company_name'],
+                        'weight': float(weights[row, column]),
+                        'sector': sector_of[symbols[column]],
+                        'last_price': prices[symbols[column]]['last_price'],
+                        'percent_change': prices[symbols[column]]['percent_change'],
+                        'impact': float(impacts[row, column]),
+                        'index_points': self._index_points(index_base, float(impacts[row, column])),
+                    }
+                    for column in member_columns.tolist()
+                ],
+            }
+        return snapshots
 
+    def _diff(self, previous: dict, impact_view: dict) -> dict:
+        # Rows are compared with their cumulative_impact, so rows shifted by an earlier-sorted change are sent too.
+        previous_rows = {row['symbol']: row for row in self._impact_view(previous)['constituents']}
+        symbols = {row['symbol'] for row in impact_view['constituents']}
         return {
-            'index': NIFTY_50_INDEX,
-            'total_impact': round(total_impact, 6),
-            'top_draggers': [self._to_dict(row) for row in top_draggers],
-            'constituents': [self._to_dict(row) for row in constituents],
+            'version': impact_view['version'],
+            'previous_version': previous['version'],
+            **{name: impact_view[name] for name in INDEX_DELTA_AGGREGATES},
+            'changed': [row for row in impact_view['constituents'] if previous_rows.get(row['symbol']) != row],
+            'removed': [symbol for symbol in previous_rows if symbol not in symbols],
         }
 
-    def get_sector_impact_heatmap(self) -> dict[str, float]:
-        cached = redis_client.get(SECTOR_HEATMAP_CACHE_KEY)
-        if cached:
-            return json.loads(cached)
-
-        weights = self._get_weights()
-        live_changes = self._get_live_changes()
+    def _stream_entry(self, snapshot: dict, impact_view: dict) -> dict[str, str]:
+        return {
+            'fetched_at': repr(datetime.fromisoformat(snapshot['fetched_at']).timestamp()),
+            'total_impact': repr(snapshot['total_impact']),
+            'total_index_points': _optional_repr(impact_view['total_index_points']),
+            'index_value': _optional_repr(snapshot['index_value']),
+            'sector_impact': json.dumps(snapshot['sector_impact']),
+        }
 
-        sector_impact: dict[str, float] = {}
-        for symbol, weight_payload in weights.items():
-            live_payload = live_changes.get(symbol)
-            if live_payload is None:
-                continue
+    def _merge_diffs(self, index_name: str, since: int) -> dict | None:
+        # Newest first; walk back until the chain reaches the client's version.
+        chain: list[dict] = []
+        for raw in redis_binary_client.lrange(index_cache_key(index_name, INDEX_DIFFS_KEY), 0, -1):
+            diff = json.loads(raw)
+            if diff['version'] <= since:
+                if not chain and diff['version'] == since:
+                    return {'index': index_name, 'since': since, **self._delta_body(diff, {}, set())}
+                break
+            if chain and chain[-1]['previous_version'] != diff['version']:
+                return None
+            chain.append(diff)
+        if not chain or chain[-1]['previous_version'] != since:
+            return None
 
-            sector = weight_payload.get('sector', 'OTHERS')
-            impact = weight_payload['weight'] * live_payload['percent_change']
-            sector_impact[sector] = sector_impact.get(sector, 0.0) + impact
+        changed: dict[str, dict] = {}
+        removed: set[str] = set()
+        for diff in reversed(chain):
+            for row in diff['changed']:
+                changed[row['symbol']] = row
+                removed.discard(row['symbol'])
+            for symbol in diff['removed']:
+                changed.pop(symbol, None)
+                removed.add(symbol)
+        return {'index': index_name, 'since': since, **self._delta_body(chain[0], changed, removed)}
+
+    def _delta_body(self, latest: dict, changed: dict[str, dict], removed: set[str]) -> dict:
+        return {
+            'version': latest['version'],
+            **{name: latest[name] for name in INDEX_DELTA_AGGREGATES},
+            'changed': list(changed.values()),
+            'removed': sorted(removed),
+        }
 
-        if not sector_impact:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail='Nifty sector impact unavailable',
-            )
+    def _impact_view(self, snapshot: dict) -> dict:
+        constituents = sorted(snapshot['constituents'], key=lambda row: row['impact'])
+        cumulative = 0.0
+        rows = []
+        for row in constituents:
+            cumulative += row['impact']
+            rows.append(self._to_dict(row, cumulative))
 
-        rounded_payload = {
-            sector: round(impact, 6)
-            for sector, impact in sorted(sector_impact.items(), key=lambda row: row[0])
+        return {
+            'index': snapshot['index'],
+            'version': snapshot['version'],
+            'timestamp': snapshot['fetched_at'],
+            'index_value': snapshot['index_value'],
+            'total_impact': round(snapshot['total_impact'], 6),
+            'total_index_points': self._index_points(snapshot['index_base'], snapshot['total_impact']),
+            # Rows are already ascending by impact, so both ends are the top movers.
+            'top_draggers': rows[:INDEX_IMPACT_TOP_K],
+            'top_lifters': rows[::-1][:INDEX_IMPACT_TOP_K],
+            'constituents': rows,
         }
-        redis_client.set(
-            SECTOR_HEATMAP_CACHE_KEY,
-            json.dumps(rounded_payload),
-            ex=SECTOR_HEATMAP_CACHE_SECONDS,
-        )
-        return rounded_payload
 
-    def _to_dict(self, row: NiftyConstituent) -> dict:
+    def _sector_heatmap_view(self, snapshot: dict) -> dict[str, float]:
         return {
-            'symbol': row.symbol,
-            'company_name': row.company_name,
-            'weight': round(row.weight, 6),
-            'last_price': round(row.last_price, 2),
-            'percent_change': round(row.percent_change, 4),
-            'impact': round(row.impact, 6),
+            sector: round(impact, 6)
+            for sector, impact in sorted(snapshot['sector_impact'].items(), key=lambda row: row[0])
         }
 
-    def _get_weights(self) -> dict[str, dict]:
-        cached = redis_client.get(WEIGHTS_CACHE_KEY)
-        if cached:
-            return json.loads(cached)
-
-        payload = self._fetch_nifty50_payload()
-        weights: dict[str, dict] = {}
-        for item in payload.get('data', []):
-            symbol = str(item.get('symbol', '')).strip().upper()
-            if not symbol:
-                continue
-
-            weight = self._safe_float(item.get('weightage'))
-            if weight is None:
-                continue
-
-            weights[symbol] = {
-                'company_name': str(item.get('meta', {}).get('companyName') or symbol),
-                'weight': weight,
-                'sector': self._extract_sector(item),
-            }
-
-        if not weights:
+    def _get_weight_set(
+        self,
+        index_name: str,
+        members: dict[str, float | None],
+        prices: dict[str, dict],
+    ) -> IndexWeightSet:
+        weight_set = self.index_weight_service.current(index_name)
+        if weight_set is not None and set(weight_set.constituents) == set(members):
+            return weight_set
+
+        # A changed constituent set means a rebalance; re-capture weights from the document already in hand.
+        weights = self._parse_weights(members, prices)
+        if weights and (weight_set is None or set(weights) != set(weight_set.constituents)):
+            logger.info('%s constituents changed; saving %d weights', index_name, len(weights))
+            weight_set = self.index_weight_service.save(index_name, weights)
+        if weight_set is None:
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail='Unable to fetch Nifty 50 weights',
+                detail=f'Unable to fetch {index_name} weights',
             )
+        return weight_set
 
-        redis_client.set(WEIGHTS_CACHE_KEY, json.dumps(weights), ex=WEIGHTS_CACHE_SECONDS)
-        return weights
+    def _parse_members(self, index_name: str, payload: dict, prices: dict[str, dict]) -> dict[str, float | None]:
+        members: dict[str, float | None] = {}
+        for item in payload.get('data', []):
+            symbol = str(item.get('symbol', '')).strip().upper()
+            # The index itself is listed alongside its constituents.
+            if not symbol or symbol == index_name:
+                continue
 
-    def _get_live_changes(self) -> dict[str, dict]:
-        cached = redis_client.get(LIVE_CACHE_KEY)
-        if cached:
-            return json.loads(cached)
+            if symbol not in prices:
+                parsed = self._parse_price(symbol, item)
+                if parsed is None:
+                    continue
+                prices[symbol] = parsed
+            members[symbol] = self._safe_float(item.get('weightage'))
+        return members
+
+    def _parse_price(self, symbol: str, item: dict) -> dict | None:
+        last_price = self._safe_float(item.get('lastPrice'))
+        percent_change = self._safe_float(item.get('pChange'))
+        if last_price is None or percent_change is None:
+            return None
 
-        payload = self._fetch_nifty50_payload()
-        live_changes: dict[str, dict] = {}
+        # pChange is measured from the previous close, so that is the base weights must match.
+        base_price = self._safe_float(item.get('previousClose')) or _implied_previous_close(last_price, percent_change)
+        if base_price is None:
+            return None
+        return {
+            'company_name': str(item.get('meta', {}).get('companyName') or symbol),
+            'sector': self.sector_service.classify(item),
+            'last_price': last_price,
+            'percent_change': percent_change,
+            'base_price': base_price,
+        }
 
+    def _parse_index_quote(self, index_name: str, payload: dict) -> tuple[float | None, float | None]:
         for item in payload.get('data', []):
-            symbol = str(item.get('symbol', '')).strip().upper()
-            if not symbol:
+            if str(item.get('symbol', '')).strip().upper() != index_name:
                 continue
-
             last_price = self._safe_float(item.get('lastPrice'))
             percent_change = self._safe_float(item.get('pChange'))
-            if last_price is None or percent_change is None:
-                continue
+            previous_close = self._safe_float(item.get('previousClose'))
+            if previous_close is None and last_price is not None and percent_change is not None:
+                previous_close = _implied_previous_close(last_price, percent_change)
+            return last_price, previous_close
+        return None, None
 
-            live_changes[symbol] = {
-                'last_price': last_price,
-                'percent_change': percent_change,
+    def _parse_weights(self, members: dict[str, float | None], prices: dict[str, dict]) -> dict[str, dict]:
+        return {
+            symbol: {
+                'company_name': prices[symbol]['company_name'],
+                'sector': prices[symbol]['sector'],
+                'weight': weight,
+                'reference_price': prices[symbol]['base_price'],
             }
+            for symbol, weight in members.items()
+            if weight is not None
+        }
 
-        if not live_changes:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail='Unable to fetch Nifty 50 live prices',
-            )
-
-        redis_client.set(LIVE_CACHE_KEY, json.dumps(live_changes), ex=LIVE_CACHE_SECONDS)
-        return live_changes
+    def _to_dict(self, row: dict, cumulative_impact: float) -> dict:
+        return {
+            'symbol': row['symbol'],
+            'company_name': row['company_name'],
+            'weight': round(row['weight'], 6),
+            'last_price': round(row['last_price'], 2),
+            'percent_change': round(row['percent_change'], 4),
+            'impact': round(row['impact'], 6),
+            'index_points': row['index_points'],
+            'cumulative_impact': round(cumulative_impact, 6),
+        }
 
-    def _fetch_nifty50_payload(self) -> dict:
-        try:
-            self.session.get(f'{NSE_BASE_URL}/', timeout=10)
-            response = self.session.get(
-                f'{NSE_BASE_URL}/api/equity-stockIndices',
-                params={'index': NIFTY_50_INDEX},
-                timeout=10,
-            )
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as exc:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail='NSE is currently unavailable',
-            ) from exc
+    def _index_points(self, index_base: float | None, impact: float) -> float | None:
+        # impact is weight% x change%, so the move in index points is base x impact / 100^2.
+        return None if index_base is None else round(index_base * impact / 10000, 4)
+
+    def _read_cached(
+        self,
+        key: str,
+        loader: Callable[[], object],
+        *,
+        fresh_seconds: int,
+        encode: Callable[[object], bytes] | None = None,
+        decode: Callable[[bytes], object] | None = None,
+    ):
+        if settings.MARKET_PREFETCH_ENABLED:
+            cached = market_cache.read_snapshot(key, decode)
+        else:
+            cached = market_cache.cached_fetch(key, loader, fresh_seconds=fresh_seconds, encode=encode, decode=decode)
+        self.data_age_seconds = max(self.data_age_seconds, cached.age_seconds)
+        return cached.value
+
+    def _fetch_index_payloads(self, index_names: list[str]) -> list[dict | NSEClientError]:
+        # fetch_json_many runs the requests concurrently, capped by NSE_MAX_CONCURRENCY.
+        return nse_client.fetch_json_many(
+            [NSERequest(path='/api/equity-stockIndices', params={'index': index_name}) for index_name in index_names]
+        )
 
     def _safe_float(self, value: object) -> float | None:
         if value is None:
@@ -218,47 +456,12 @@ class NiftyAnalyticsService:
         except (TypeError, ValueError):
             return None
 
-    def _extract_sector(self, item: dict) -> str:
-        sector_sources = [
-            item.get('meta', {}).get('industry'),
-            item.get('meta', {}).get('sector'),
-            item.get('industry'),
-            item.get('sector'),
-        ]
-        for source in sector_sources:
-            normalized = self._normalize_sector(source)
-            if normalized:
-                return normalized
-        return 'OTHERS'
-
-    def _normalize_sector(self, sector_name: object) -> str | None:
-        if not sector_name:
-            return None
 
-        cleaned = re.sub(r'[^A-Za-z0-9 ]+', ' ', str(sector_name)).upper()
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
-        if not cleaned:
-            return None
+def _implied_previous_close(last_price: float, percent_change: float) -> float | None:
+    # A move of -100% or worse is bad data; no previous close can be recovered from it.
+    ratio = 1 + percent_change / 100
+    return last_price / ratio if ratio > 0 else None
+
 
-        if 'BANK' in cleaned:
-            return 'BANKING'
-        if 'INFORMATION TECHNOLOGY' in cleaned or cleaned == 'IT':
-            return 'IT'
-        if 'AUTO' in cleaned:
-            return 'AUTO'
-        if 'PHARMA' in cleaned or 'HEALTHCARE' in cleaned:
-            return 'PHARMA'
-        if 'FMCG' in cleaned or 'CONSUMER' in cleaned:
-            return 'FMCG'
-        if 'OIL' in cleaned or 'GAS' in cleaned or 'ENERGY' in cleaned:
-            return 'ENERGY'
-        if 'METAL' in cleaned or 'MINING' in cleaned:
-            return 'METALS'
-        if 'TELECOM' in cleaned:
-            return 'TELECOM'
-        if 'REALTY' in cleaned or 'REAL ESTATE' in cleaned:
-            return 'REALTY'
-        if 'POWER' in cleaned or 'UTILITY' in cleaned:
-            return 'UTILITIES'
-
-        return cleaned.replace(' ', '_')
+def _optional_repr(value: float | None) -> str:
+    return '' if value is None else repr(value)
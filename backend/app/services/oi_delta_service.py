@@ -0,0 +1,223 @@
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+
+import numpy as np
+from fastapi import HTTPException, status
+
+from app.services.option_chain import OptionChain, nullable_list, parse_expiry_date
+from app.utils.market_calendar import trade_date
+from app.utils.redis_client import redis_binary_client
+
+OI_FRAMES_CACHE_PREFIX = 'options:oi:frames'
+OI_DELTA_CACHE_PREFIX = 'options:oi:delta'
+OI_DELTA_WINDOWS = {'1m': 60, '5m': 5 * 60, '15m': 15 * 60}
+OI_MINUTE_WINDOW = '1m'
+OI_FRAME_SLOT_SECONDS = 60
+OI_FRAME_SLOTS = 16
+OI_DELTA_CACHE_SECONDS = 2 * OI_FRAME_SLOT_SECONDS
+STRIKE_SCALE = 100
+OI_FRAME_FIELDS = ('ce_oi', 'pe_oi', 'ce_volume', 'pe_volume', 'ce_ltp', 'pe_ltp')
+OI_FRAME_DTYPE = np.dtype([('key', '<i8'), *((name, '<f8') for name in OI_FRAME_FIELDS)])
+OI_FRAME_HEADER_DTYPE = np.dtype([('captured_at', '<f8'), ('baseline_at', '<f8')])
+
+
+@dataclass(frozen=True)
+class OIFrame:
+    captured_at: float
+    baseline_at: float
+    records: np.ndarray
+
+    @classmethod
+    def from_chain(cls, chain: OptionChain) -> 'OIFrame':
+        ordinals = np.array(
+            [expiry.toordinal() if expiry else -1 for expiry in map(parse_expiry_date, chain.expiry_dates)],
+            dtype=np.int64,
+        )
+        row_ordinals = ordinals[chain.expiry_index] if ordinals.size else np.empty(0, dtype=np.int64)
+        keep = row_ordinals >= 0
+
+        records = np.empty(int(keep.sum()), dtype=OI_FRAME_DTYPE)
+        # (expiry, strike) packed into one sortable int64 so frames align with a single searchsorted.
+        records['key'] = (row_ordinals[keep] << 32) | np.round(chain.strike[keep] * STRIKE_SCALE).astype(np.int64)
+        for name in OI_FRAME_FIELDS:
+            records[name] = getattr(chain, name)[keep]
+        records.sort(order='key')
+
+        fetched_at = datetime.fromisoformat(chain.fetched_at)
+        if fetched_at.tzinfo is None:
+            fetched_at = fetched_at.replace(tzinfo=timezone.utc)
+        return cls(captured_at=fetched_at.timestamp(), baseline_at=np.nan, records=records)
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> 'OIFrame':
+        header = np.frombuffer(raw, dtype=OI_FRAME_HEADER_DTYPE, count=1)[0]
+        records = np.frombuffer(raw, dtype=OI_FRAME_DTYPE, offset=OI_FRAME_HEADER_DTYPE.itemsize)
+        return cls(captured_at=float(header['captured_at']), baseline_at=float(header['baseline_at']), records=records)
+
+    def to_bytes(self) -> bytes:
+        header = np.array([(self.captured_at, self.baseline_at)], dtype=OI_FRAME_HEADER_DTYPE)
+        return header.tobytes() + self.records.tobytes()
+
+    def diff(self, baseline: 'OIFrame') -> 'OIFrame':
+        baseline_keys = baseline.records['key']
+        positions = np.minimum(np.searchsorted(baseline_keys, self.records['key']), max(baseline_keys.size - 1, 0))
+        matched = baseline_keys[positions] == self.records['key'] if baseline_keys.size else np.zeros(self.records.size, dtype=bool)
+
+        delta = np.empty_like(self.records)
+        delta['key'] = self.records['key']
+        for name in OI_FRAME_FIELDS:
+            current = self.records[name]
+            previous = baseline.records[name][positions] if baseline_keys.size else np.full(current.shape, np.nan)
+            delta[name] = np.where(matched, current - previous, np.nan)
+        return OIFrame(captured_at=self.captured_at, baseline_at=baseline.captured_at, records=delta)
+
+    def expiry_ordinals(self) -> list[int]:
+        return np.unique(self.records['key'] >> 32).tolist()
+
+    def for_expiry(self, ordinal: int) -> np.ndarray:
+        start, stop = np.searchsorted(self.records['key'], [ordinal << 32, (ordinal + 1) << 32])
+        return self.records[start:stop]
+
+
+def key_strikes(keys: np.ndarray) -> np.ndarray:
+    return (keys & 0xFFFFFFFF) / STRIKE_SCALE
+
+
+def format_expiry(ordinal: int) -> str:
+    return date.fromordinal(ordinal).strftime('%d-%b-%Y')
+
+
+class OIDeltaService:
+    def __init__(self) -> None:
+        self.data_age_seconds = 0.0
+
+    def refresh(self, chains: list[OptionChain]) -> list[tuple[str, OIFrame]]:
+        if not chains:
+            return []
+        frames = [OIFrame.from_chain(chain) for chain in chains]
+
+        pipeline = redis_binary_client.pipeline(transaction=False)
+        for chain, frame in zip(chains, frames):
+            pipeline.hmget(
+                self._frames_key(chain.symbol),
+                [self._slot(frame.captured_at), *(self._slot(frame.captured_at - window, nearest=True) for window in OI_DELTA_WINDOWS.values())],
+            )
+        stored_frames = pipeline.execute()
+
+        minute_deltas = []
+        pipeline = redis_binary_client.pipeline(transaction=False)
+        for chain, frame, (current_slot_frame, *baselines) in zip(chains, frames, stored_frames):
+            frames_key = self._frames_key(chain.symbol)
+            # Keep the first frame of each slot so a slot's baseline age never drifts with the refresh rate.
+            slot_start = frame.captured_at - frame.captured_at % OI_FRAME_SLOT_SECONDS
+            new_slot = current_slot_frame is None or OIFrame.from_bytes(current_slot_frame).captured_at < slot_start
+            if new_slot:
+                pipeline.hset(frames_key, str(self._slot(frame.captured_at)), frame.to_bytes())
+            pipeline.expire(frames_key, 2 * OI_FRAME_SLOTS * OI_FRAME_SLOT_SECONDS)
+
+            deltas = {}
+            for (label, window), raw in zip(OI_DELTA_WINDOWS.items(), baselines):
+                if raw is None:
+                    continue
+                baseline = OIFrame.from_bytes(raw)
+                if window / 2 <= frame.captured_at - baseline.captured_at <= window + OI_FRAME_SLOT_SECONDS:
+                    delta = frame.diff(baseline)
+                    deltas[label] = delta.to_bytes()
+                    if new_slot and label == OI_MINUTE_WINDOW:
+                        minute_deltas.append((chain.symbol, delta))
+
+            delta_key = self._delta_key(chain.symbol)
+            pipeline.delete(delta_key)
+            if deltas:
+                pipeline.hset(delta_key, mapping=deltas)
+                pipeline.expire(delta_key, OI_DELTA_CACHE_SECONDS)
+        pipeline.execute()
+        # One non-overlapping one-minute delta per symbol and slot, for consumers that need independent samples.
+        return minute_deltas
+
+    def get_delta(self, symbol: str, expiry_date: str | None, window: str) -> dict:
+        normalized_symbol = symbol.strip().upper()
+        frame = self._read_delta(normalized_symbol, window)
+        if frame is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail='OI delta for the selected window is not available yet',
+            )
+
+        ordinal = self._select_expiry(frame, expiry_date)
+        records = frame.for_expiry(ordinal)
+        self.data_age_seconds = max(self.data_age_seconds, time.time() - frame.captured_at)
+        columns = {
+            'strike': key_strikes(records['key']),
+            'call_oi_change': records['ce_oi'],
+            'put_oi_change': records['pe_oi'],
+            'call_volume_change': records['ce_volume'],
+            'put_volume_change': records['pe_volume'],
+            'call_ltp_change': records['ce_ltp'],
+            'put_ltp_change': records['pe_ltp'],
+        }
+        columns = {name: nullable_list(values.astype(np.float64)) for name, values in columns.items()}
+
+        return {
+            'symbol': normalized_symbol,
+            'expiry_date': format_expiry(ordinal),
+            'window': window,
+            'window_seconds': round(frame.captured_at - frame.baseline_at, 3),
+            'timestamp': datetime.fromtimestamp(frame.captured_at, tz=timezone.utc),
+            'baseline_at': datetime.fromtimestamp(frame.baseline_at, tz=timezone.utc),
+            'total_call_oi_change': int(np.nansum(records['ce_oi'])),
+            'total_put_oi_change': int(np.nansum(records['pe_oi'])),
+            'strikes': [dict(zip(columns, values)) for values in zip(*columns.values())],
+        }
+
+    def get_delta_totals(self, symbol: str, expiry_date: str, window: str) -> tuple[int, int] | None:
+        return self._totals(self._read_delta(symbol.strip().upper(), window), expiry_date)
+
+    def get_delta_totals_many(self, requests: list[tuple[str, str]], window: str) -> list[tuple[int, int] | None]:
+        pipeline = redis_binary_client.pipeline(transaction=False)
+        for symbol, _ in requests:
+            pipeline.hget(self._delta_key(symbol.strip().upper()), window)
+        return [
+            self._totals(OIFrame.from_bytes(raw) if raw is not None else None, expiry_date)
+            for (_, expiry_date), raw in zip(requests, pipeline.execute())
+        ]
+
+    def _totals(self, frame: OIFrame | None, expiry_date: str) -> tuple[int, int] | None:
+        expiry = parse_expiry_date(expiry_date)
+        if frame is None or expiry is None:
+            return None
+        records = frame.for_expiry(expiry.toordinal())
+        if records.size == 0:
+            return None
+        return int(np.nansum(records['ce_oi'])), int(np.nansum(records['pe_oi']))
+
+    def _read_delta(self, symbol: str, window: str) -> OIFrame | None:
+        raw = redis_binary_client.hget(self._delta_key(symbol), window)
+        return OIFrame.from_bytes(raw) if raw is not None else None
+
+    def _select_expiry(self, frame: OIFrame, expiry_date: str | None) -> int:
+        ordinals = frame.expiry_ordinals()
+        if expiry_date is None:
+            today = trade_date().toordinal()
+            upcoming = [ordinal for ordinal in ordinals if ordinal >= today]
+            if upcoming or ordinals:
+                return (upcoming or ordinals)[0]
+        else:
+            expiry = parse_expiry_date(expiry_date)
+            if expiry is not None and expiry.toordinal() in ordinals:
+                return expiry.toordinal()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail='No option chain data found for selected expiry',
+        )
+
+    def _slot(self, timestamp: float, nearest: bool = False) -> int:
+        position = round(timestamp / OI_FRAME_SLOT_SECONDS) if nearest else int(timestamp // OI_FRAME_SLOT_SECONDS)
+        return position % OI_FRAME_SLOTS
+
+    def _frames_key(self, symbol: str) -> str:
+        return f'{OI_FRAMES_CACHE_PREFIX}:{symbol}'
+
+    def _delta_key(self, symbol: str) -> str:
+        return f'{OI_DELTA_CACHE_PREFIX}:{symbol}'
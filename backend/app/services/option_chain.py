@@ -0,0 +1,185 @@
+import io
+from dataclasses import dataclass, fields
+from datetime import date, datetime
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class OptionChain:
+    symbol: str
+    fetched_at: str
+    underlying_value: float | None
+    expiry_dates: tuple[str, ...]
+    expiry_index: np.ndarray
+    strike: np.ndarray
+    ce_oi: np.ndarray
+    pe_oi: np.ndarray
+    ce_change_oi: np.ndarray
+    pe_change_oi: np.ndarray
+    ce_ltp: np.ndarray
+    pe_ltp: np.ndarray
+    ce_iv: np.ndarray
+    pe_iv: np.ndarray
+    ce_volume: np.ndarray
+    pe_volume: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.strike.size)
+
+    @classmethod
+    def from_payload(cls, symbol: str, payload: dict, fetched_at: str | None = None) -> 'OptionChain':
+        records = payload.get('records') or {}
+        expiry_dates = [str(expiry) for expiry in records.get('expiryDates') or []]
+        expiry_positions = {expiry: position for position, expiry in enumerate(expiry_dates)}
+
+        expiry_index: list[int] = []
+        strike: list[float] = []
+        ce_oi: list[int] = []
+        pe_oi: list[int] = []
+        ce_change_oi: list[int] = []
+        pe_change_oi: list[int] = []
+        ce_ltp: list[float] = []
+        pe_ltp: list[float] = []
+        ce_iv: list[float] = []
+        pe_iv: list[float] = []
+        ce_volume: list[int] = []
+        pe_volume: list[int] = []
+
+        for row in records.get('data') or []:
+            strike_price = _as_float(row.get('strikePrice'))
+            expiry = row.get('expiryDate')
+            if strike_price is None or expiry is None:
+                continue
+
+            position = expiry_positions.get(expiry)
+            if position is None:
+                position = expiry_positions[expiry] = len(expiry_dates)
+                expiry_dates.append(expiry)
+
+            call = row.get('CE') or {}
+            put = row.get('PE') or {}
+            expiry_index.append(position)
+            strike.append(strike_price)
+            ce_oi.append(_as_int(call.get('openInterest')))
+            pe_oi.append(_as_int(put.get('openInterest')))
+            ce_change_oi.append(_as_int(call.get('changeinOpenInterest')))
+            pe_change_oi.append(_as_int(put.get('changeinOpenInterest')))
+            ce_ltp.append(_as_float(call.get('lastPrice'), np.nan))
+            pe_ltp.append(_as_float(put.get('lastPrice'), np.nan))
+            ce_iv.append(_as_float(call.get('impliedVolatility'), np.nan))
+            pe_iv.append(_as_float(put.get('impliedVolatility'), np.nan))
+            ce_volume.append(_as_int(call.get('totalTradedVolume')))
+            pe_volume.append(_as_int(put.get('totalTradedVolume')))
+
+        expiry_array = np.asarray(expiry_index, dtype=np.int16)
+        strike_array = np.asarray(strike, dtype=np.float64)
+        # Rows are kept grouped by expiry and sorted by strike so each expiry is a contiguous slice.
+        order = np.lexsort((strike_array, expiry_array))
+
+        return cls(
+            symbol=symbol,
+            fetched_at=fetched_at or datetime.utcnow().isoformat(),
+            underlying_value=_as_float(records.get('underlyingValue')),
+            expiry_dates=tuple(expiry_dates),
+            expiry_index=expiry_array[order],
+            strike=strike_array[order],
+            ce_oi=np.asarray(ce_oi, dtype=np.int64)[order],
+            pe_oi=np.asarray(pe_oi, dtype=np.int64)[order],
+            ce_change_oi=np.asarray(ce_change_oi, dtype=np.int64)[order],
+            pe_change_oi=np.asarray(pe_change_oi, dtype=np.int64)[order],
+            ce_ltp=np.asarray(ce_ltp, dtype=np.float64)[order],
+            pe_ltp=np.asarray(pe_ltp, dtype=np.float64)[order],
+            ce_iv=np.asarray(ce_iv, dtype=np.float64)[order],
+            pe_iv=np.asarray(pe_iv, dtype=np.float64)[order],
+            ce_volume=np.asarray(ce_volume, dtype=np.int64)[order],
+            pe_volume=np.asarray(pe_volume, dtype=np.int64)[order],
+        )
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> 'OptionChain':
+        with np.load(io.BytesIO(raw), allow_pickle=False) as archive:
+            underlying_value = float(archive['underlying_value'])
+            return cls(
+                symbol=str(archive['symbol']),
+                fetched_at=str(archive['fetched_at']),
+                underlying_value=None if np.isnan(underlying_value) else underlying_value,
+                expiry_dates=tuple(str(expiry) for expiry in archive['expiry_dates']),
+                **{name: archive[name] for name in _ARRAY_FIELDS},
+            )
+
+    def to_bytes(self) -> bytes:
+        buffer = io.BytesIO()
+        np.savez(
+            buffer,
+            symbol=np.array(self.symbol),
+            fetched_at=np.array(self.fetched_at),
+            underlying_value=np.array(np.nan if self.underlying_value is None else self.underlying_value),
+            expiry_dates=np.array(self.expiry_dates, dtype=np.str_),
+            **{name: getattr(self, name) for name in _ARRAY_FIELDS},
+        )
+        return buffer.getvalue()
+
+    def for_expiry(self, expiry_date: str) -> 'OptionChain':
+        if expiry_date not in self.expiry_dates:
+            return self._slice(slice(0, 0), (expiry_date,))
+
+        position = self.expiry_dates.index(expiry_date)
+        start, stop = np.searchsorted(self.expiry_index, [position, position + 1])
+        return self._slice(slice(int(start), int(stop)), (expiry_date,))
+
+    def _slice(self, rows: slice, expiry_dates: tuple[str, ...]) -> 'OptionChain':
+        return OptionChain(
+            symbol=self.symbol,
+            fetched_at=self.fetched_at,
+            underlying_value=self.underlying_value,
+            expiry_dates=expiry_dates,
+            expiry_index=np.zeros(rows.stop - rows.start, dtype=np.int16),
+            strike=self.strike[rows],
+            ce_oi=self.ce_oi[rows],
+            pe_oi=self.pe_oi[rows],
+            ce_change_oi=self.ce_change_oi[rows],
+            pe_change_oi=self.pe_change_oi[rows],
+            ce_ltp=self.ce_ltp[rows],
+            pe_ltp=self.pe_ltp[rows],
+            ce_iv=self.ce_iv[rows],
+            pe_iv=self.pe_iv[rows],
+            ce_volume=self.ce_volume[rows],
+            pe_volume=self.pe_volume[rows],
+        )
+
+
+def parse_expiry_date(expiry: str) -> date | None:
+    try:
+        return datetime.strptime(expiry, '%d-%b-%Y').date()
+    except ValueError:
+        return None
+
+
+def nullable_list(values: np.ndarray) -> list[float | None]:
+    return np.where(np.isnan(values), None, values).tolist()
+
+
+_ARRAY_FIELDS = tuple(
+    field.name
+    for field in fields(OptionChain)
+    if field.name not in {'symbol', 'fetched_at', 'underlying_value', 'expiry_dates'}
+)
+
+
+def _as_int(value: object) -> int:
+    if not value:
+        return 0
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _as_float(value: object, default: float | None = None) -> float | None:
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
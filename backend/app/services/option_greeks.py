@@ -0,0 +1,277 @@
+import io
+import math
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import numpy as np
+
+from app.services.option_chain import OptionChain, parse_expiry_date
+from app.utils.market_calendar import IST, REGULAR_END
+
+SECONDS_PER_YEAR = 365.0 * 24 * 60 * 60
+IV_LOWER_BOUND = 1e-4
+IV_UPPER_BOUND = 5.0
+IV_PRICE_TOLERANCE = 1e-4
+IV_BRACKET_TOLERANCE = 1e-7
+IV_MAX_ITERATIONS = 64
+GREEK_FIELDS = ('iv', 'delta', 'gamma', 'vega', 'theta')
+_INV_SQRT_2PI = 1.0 / math.sqrt(2.0 * math.pi)
+
+
+@dataclass(frozen=True)
+class Greeks:
+    iv: np.ndarray
+    delta: np.ndarray
+    gamma: np.ndarray
+    vega: np.ndarray
+    theta: np.ndarray
+
+
+@dataclass(frozen=True)
+class ChainGreeks:
+    fetched_at: str
+    years_to_expiry: np.ndarray
+    call: Greeks
+    put: Greeks
+    gamma_exposure: np.ndarray
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> 'ChainGreeks':
+        with np.load(io.BytesIO(raw), allow_pickle=False) as archive:
+            return cls(
+                fetched_at=str(archive['fetched_at']),
+                years_to_expiry=archive['years_to_expiry'],
+                call=Greeks(*(archive[f'call_{name}'] for name in GREEK_FIELDS)),
+                put=Greeks(*(archive[f'put_{name}'] for name in GREEK_FIELDS)),
+                gamma_exposure=archive['gamma_exposure'],
+            )
+
+    def to_bytes(self) -> bytes:
+        buffer = io.BytesIO()
+        np.savez(
+            buffer,
+            fetched_at=np.array(self.fetched_at),
+            years_to_expiry=self.years_to_expiry,
+            gamma_exposure=self.gamma_exposure,
+            **{f'call_{name}': getattr(self.call, name) for name in GREEK_FIELDS},
+            **{f'put_{name}': getattr(self.put, name) for name in GREEK_FIELDS},
+        )
+        return buffer.getvalue()
+
+
+def norm_pdf(x: np.ndarray) -> np.ndarray:
+    return _INV_SQRT_2PI * np.exp(-0.5 * x * x)
+
+
+def norm_cdf(x: np.ndarray) -> np.ndarray:
+    return 0.5 * _erfc(-x / math.sqrt(2.0))
+
+
+def black_scholes_price(
+    spot: np.ndarray | float,
+    strike: np.ndarray,
+    years: np.ndarray,
+    rate: float,
+    sigma: np.ndarray,
+    is_call: np.ndarray,
+) -> np.ndarray:
+    price, _ = _price_and_vega(spot, strike, years, rate, sigma, is_call)
+    return price
+
+
+def implied_volatility(
+    price: np.ndarray,
+    spot: np.ndarray | float,
+    strike: np.ndarray,
+    years: np.ndarray,
+    rate: float,
+    is_call: np.ndarray,
+) -> np.ndarray:
+    price, spot, strike, years, is_call = (
+        np.asarray(array) for array in np.broadcast_arrays(price, spot, strike, years, is_call)
+    )
+    result = np.full(price.shape, np.nan)
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        discounted_strike = strike * np.exp(-rate * years)
+        lower = np.maximum(np.where(is_call, spot - discounted_strike, discounted_strike - spot), 0.0)
+        upper = np.where(is_call, spot, discounted_strike)
+        # Prices outside the no-arbitrage bounds have no implied volatility.
+        solvable = np.isfinite(price) & (years > 0) & (spot > 0) & (price > lower) & (price < upper)
+
+        active = np.flatnonzero(solvable)
+        p, s, k, t, c = price[active], spot[active], strike[active], years[active], is_call[active]
+        reachable = black_scholes_price(s, k, t, rate, np.full(active.size, IV_UPPER_BOUND), c) >= p
+        active, p, s, k, t, c = (array[reachable] for array in (active, p, s, k, t, c))
+
+        low = np.full(active.size, IV_LOWER_BOUND)
+        high = np.full(active.size, IV_UPPER_BOUND)
+        # Brenner-Subrahmanyam seed: exact for ATM options, close enough elsewhere for Newton.
+        sigma = np.clip(np.sqrt(2.0 * np.pi / t) * p / s, 0.05, 2.0)
+
+        for _ in range(IV_MAX_ITERATIONS):
+            if active.size == 0:
+                break
+            model, vega = _price_and_vega(s, k, t, rate, sigma, c)
+            diff = model - p
+            converged = (np.abs(diff) < IV_PRICE_TOLERANCE) | (high - low < IV_BRACKET_TOLERANCE)
+            result[active[converged]] = sigma[converged]
+
+            pending = ~converged
+            active, p, s, k, t, c = (array[pending] for array in (active, p, s, k, t, c))
+            sigma, diff, vega, low, high = (array[pending] for array in (sigma, diff, vega, low, high))
+
+            high = np.where(diff > 0, sigma, high)
+            low = np.where(diff < 0, sigma, low)
+            newton = sigma - diff / vega
+            # Fall back to bisection whenever Newton would leave the bracket (tiny vega, far OTM).
+            sigma = np.where(np.isfinite(newton) & (newton > low) & (newton < high), newton, 0.5 * (low + high))
+
+    return result
+
+
+def greeks(
+    spot: np.ndarray | float,
+    strike: np.ndarray,
+    years: np.ndarray,
+    rate: float,
+    sigma: np.ndarray,
+    is_call: np.ndarray,
+) -> Greeks:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sqrt_years = np.sqrt(years)
+        d1 = (np.log(spot / strike) + (rate + 0.5 * sigma * sigma) * years) / (sigma * sqrt_years)
+        d2 = d1 - sigma * sqrt_years
+        density = norm_pdf(d1)
+        discounted_strike = strike * np.exp(-rate * years)
+        decay = -spot * density * sigma / (2.0 * sqrt_years)
+
+        return Greeks(
+            iv=np.asarray(sigma, dtype=np.float64),
+            delta=np.where(is_call, norm_cdf(d1), norm_cdf(d1) - 1.0),
+            gamma=density / (spot * sigma * sqrt_years),
+            # Vega per 1 volatility point, theta per calendar day.
+            vega=spot * density * sqrt_years / 100.0,
+            theta=np.where(
+                is_call,
+                decay - rate * discounted_strike * norm_cdf(d2),
+                decay + rate * discounted_strike * norm_cdf(-d2),
+            )
+            / 365.0,
+        )
+
+
+def gamma_exposure(
+    spot: np.ndarray | float,
+    call_gamma: np.ndarray,
+    call_oi: np.ndarray,
+    put_gamma: np.ndarray,
+    put_oi: np.ndarray,
+) -> np.ndarray:
+    # Dealer-short-put / long-call convention, per 1% move in the underlying and per unit of reported OI.
+    return (np.nan_to_num(call_gamma) * call_oi - np.nan_to_num(put_gamma) * put_oi) * spot * spot * 0.01
+
+
+def years_to_expiry(chain: OptionChain) -> np.ndarray:
+    fetched_at = datetime.fromisoformat(chain.fetched_at)
+    if fetched_at.tzinfo is None:
+        fetched_at = fetched_at.replace(tzinfo=timezone.utc)
+    expiry_years = np.array(
+        [
+            (datetime.combine(expiry, REGULAR_END, tzinfo=IST) - fetched_at).total_seconds() / SECONDS_PER_YEAR
+            if expiry is not None
+            else np.nan
+            for expiry in (parse_expiry_date(value) for value in chain.expiry_dates)
+        ],
+        dtype=np.float64,
+    )
+    years = expiry_years[chain.expiry_index] if expiry_years.size else np.empty(0)
+    return np.where(years > 0, years, np.nan)
+
+
+def compute_chain_greeks(chain: OptionChain, rate: float) -> ChainGreeks:
+    return compute_greeks_batch([chain], rate)[0]
+
+
+def compute_greeks_batch(chains: list[OptionChain], rate: float) -> list[ChainGreeks]:
+    if not chains:
+        return []
+
+    # Every chain (calls and puts alike) is solved in one batch: per-call numpy overhead, not
+    # arithmetic, dominates small chains, so one set of Newton iterations serves the whole refresh.
+    sizes = [len(chain) for chain in chains]
+    years = np.concatenate([years_to_expiry(chain) for chain in chains])
+    spot = np.repeat([chain.underlying_value or np.nan for chain in chains], sizes).astype(np.float64)
+    strike = np.concatenate([chain.strike for chain in chains])
+    call_oi = np.concatenate([chain.ce_oi for chain in chains])
+    put_oi = np.concatenate([chain.pe_oi for chain in chains])
+    price = np.concatenate([chain.ce_ltp for chain in chains] + [chain.pe_ltp for chain in chains])
+    price = np.where(price > 0, price, np.nan)
+
+    rows = strike.size
+    is_call = np.arange(2 * rows) < rows
+    both = (np.tile(spot, 2), np.tile(strike, 2), np.tile(years, 2))
+    sigma = implied_volatility(price, *both, rate, is_call)
+    solved = greeks(*both, rate, sigma, is_call)
+    call = Greeks(*(getattr(solved, name)[:rows] for name in GREEK_FIELDS))
+    put = Greeks(*(getattr(solved, name)[rows:] for name in GREEK_FIELDS))
+    exposure = gamma_exposure(spot, call.gamma, call_oi, put.gamma, put_oi)
+
+    offsets = np.cumsum(sizes)[:-1]
+    call_parts = zip(*(np.split(getattr(call, name), offsets) for name in GREEK_FIELDS))
+    put_parts = zip(*(np.split(getattr(put, name), offsets) for name in GREEK_FIELDS))
+    return [
+        ChainGreeks(
+            fetched_at=chain.fetched_at,
+            years_to_expiry=chain_years,
+            call=Greeks(*call_values),
+            put=Greeks(*put_values),
+            gamma_exposure=chain_exposure,
+        )
+        for chain, chain_years, call_values, put_values, chain_exposure in zip(
+            chains,
+            np.split(years, offsets),
+            call_parts,
+            put_parts,
+            np.split(exposure, offsets),
+        )
+    ]
+
+
+def _price_and_vega(
+    spot: np.ndarray | float,
+    strike: np.ndarray,
+    years: np.ndarray,
+    rate: float,
+    sigma: np.ndarray,
+    is_call: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    sqrt_years = np.sqrt(years)
+    d1 = (np.log(spot / strike) + (rate + 0.5 * sigma * sigma) * years) / (sigma * sqrt_years)
+    d2 = d1 - sigma * sqrt_years
+    discounted_strike = strike * np.exp(-rate * years)
+    call = spot * norm_cdf(d1) - discounted_strike * norm_cdf(d2)
+    # Put via parity keeps both legs on the same cdf evaluations.
+    price = np.where(is_call, call, call - spot + discounted_strike)
+    return price, spot * norm_pdf(d1) * sqrt_years
+
+
+def _erfc(x: np.ndarray) -> np.ndarray:
+    # Chebyshev fit with fractional error below 1.2e-7 everywhere (Numerical Recipes erfcc).
+    z = np.abs(x)
+    t = 1.0 / (1.0 + 0.5 * z)
+    poly = -z * z - 1.26551223 + t * (
+        1.00002368
+        + t * (
+            0.37409196
+            + t * (
+                0.09678418
+                + t * (
+                    -0.18628806
+                    + t * (0.27886807 + t * (-1.13520398 + t * (1.48851587 + t * (-0.82215223 + t * 0.17087277))))
+                )
+            )
+        )
+    )
+    result = t * np.exp(poly)
+    return np.where(x >= 0, result, 2.0 - result)
@@ -0,0 +1,210 @@
+from collections.abc import Callable, Iterator
+from datetime import date, datetime, time, timedelta, timezone
+from itertools import repeat
+
+import numpy as np
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.repositories.option_snapshot_repository import OptionSnapshotRepository
+from app.services.option_chain import OptionChain, nullable_list, parse_expiry_date
+from app.services.options_analytics_service import (
+    calculate_change_in_oi,
+    calculate_max_pain,
+    calculate_pcr,
+    calculate_total_call_oi,
+    calculate_total_put_oi,
+)
+from app.utils.downsampling import lttb, min_max
+from app.utils.market_calendar import IST
+from app.utils.market_calendar import trade_date as ist_trade_date
+
+settings = get_settings()
+
+OPTION_HISTORY_MAX_RANGE_DAYS = 31
+SUMMARY_METRICS = ('underlying_value', 'total_call_oi', 'total_put_oi', 'pcr', 'change_oi_pcr', 'max_pain')
+STRIKE_METRICS = ('ce_oi', 'pe_oi', 'ce_change_oi', 'pe_change_oi')
+DOWNSAMPLERS: dict[str, Callable[[np.ndarray, np.ndarray, int], np.ndarray]] = {'lttb': lttb, 'minmax': min_max}
+
+
+class OptionHistoryService:
+    def __init__(self, db: Session) -> None:
+        self.repository = OptionSnapshotRepository(db)
+
+    def record_chains(self, chains: list[OptionChain]) -> int:
+        captured = [(chain, self._captured_at(chain)) for chain in chains if len(chain)]
+        if not captured:
+            return 0
+        self.repository.ensure_partitions({ist_trade_date(captured_at) for _, captured_at in captured})
+        return self.repository.copy_rows(
+            snapshots=(row for chain, captured_at in captured for row in self._snapshot_rows(chain, captured_at)),
+            summaries=(row for chain, captured_at in captured for row in self._summary_rows(chain, captured_at)),
+        )
+
+    def get_history(
+        self,
+        *,
+        symbol: str,
+        expiry_date: str,
+        start: datetime | None,
+        end: datetime | None,
+        points: int,
+        method: str,
+    ) -> dict:
+        normalized_symbol = symbol.strip().upper()
+        expiry = self._parse_expiry_param(expiry_date)
+        start, end = self._resolve_range(start, end)
+        rows = self.repository.summary_series(symbol=normalized_symbol, expiry_date=expiry, start=start, end=end)
+        captured_at = [row.captured_at for row in rows]
+
+        return {
+            'symbol': normalized_symbol,
+            'expiry_date': expiry_date,
+            'start': start,
+            'end': end,
+            'method': method,
+            'raw_points': len(rows),
+            'series': [
+                {
+                    'metric': metric,
+                    'strike': None,
+                    'points': _downsample(captured_at, [getattr(row, metric) for row in rows], points, method),
+                }
+                for metric in SUMMARY_METRICS
+            ],
+        }
+
+    def get_strike_history(
+        self,
+        *,
+        symbol: str,
+        expiry_date: str,
+        strikes: list[float],
+        start: datetime | None,
+        end: datetime | None,
+        points: int,
+        method: str,
+    ) -> dict:
+        normalized_symbol = symbol.strip().upper()
+        expiry = self._parse_expiry_param(expiry_date)
+        start, end = self._resolve_range(start, end)
+        rows = self.repository.strike_series(
+            symbol=normalized_symbol,
+            expiry_date=expiry,
+            strikes=sorted(set(strikes)),
+            start=start,
+            end=end,
+        )
+
+        by_strike: dict[float, list] = {}
+        for row in rows:
+            by_strike.setdefault(row.strike, []).append(row)
+
+        series = []
+        for strike, strike_rows in by_strike.items():
+            captured_at = [row.captured_at for row in strike_rows]
+            for metric in STRIKE_METRICS:
+                series.append(
+                    {
+                        'metric': metric,
+                        'strike': strike,
+                        'points': _downsample(captured_at, [getattr(row, metric) for row in strike_rows], points, method),
+                    }
+                )
+
+        return {
+            'symbol': normalized_symbol,
+            'expiry_date': expiry_date,
+            'start': start,
+            'end': end,
+            'method': method,
+            'raw_points': len(rows),
+            'series': series,
+        }
+
+    def prune(self, today: date | None = None) -> list[str]:
+        cutoff = (today or ist_trade_date()) - timedelta(days=settings.OPTION_SNAPSHOT_RETENTION_DAYS)
+        return self.repository.drop_partitions_before(cutoff)
+
+    def _snapshot_rows(self, chain: OptionChain, captured_at: datetime) -> Iterator[tuple]:
+        expiries = np.array([parse_expiry_date(expiry) for expiry in chain.expiry_dates], dtype=object)
+        expiry_date = expiries[chain.expiry_index]
+        keep = expiry_date != None  # noqa: E711
+
+        return zip(
+            repeat(chain.symbol),
+            expiry_date[keep].tolist(),
+            repeat(captured_at.isoformat()),
+            chain.strike[keep].tolist(),
+            repeat(ist_trade_date(captured_at)),
+            chain.ce_oi[keep].tolist(),
+            chain.pe_oi[keep].tolist(),
+            chain.ce_change_oi[keep].tolist(),
+            chain.pe_change_oi[keep].tolist(),
+            nullable_list(chain.ce_ltp[keep]),
+            nullable_list(chain.pe_ltp[keep]),
+            nullable_list(chain.ce_iv[keep]),
+            nullable_list(chain.pe_iv[keep]),
+        )
+
+    def _summary_rows(self, chain: OptionChain, captured_at: datetime) -> Iterator[tuple]:
+        for expiry in chain.expiry_dates:
+            expiry_date = parse_expiry_date(expiry)
+            expiry_chain = chain.for_expiry(expiry)
+            if expiry_date is None or not len(expiry_chain):
+                continue
+
+            total_call_oi = calculate_total_call_oi(expiry_chain)
+            total_put_oi = calculate_total_put_oi(expiry_chain)
+            call_change_oi, put_change_oi = calculate_change_in_oi(expiry_chain)
+            yield (
+                chain.symbol,
+                expiry_date,
+                captured_at.isoformat(),
+                ist_trade_date(captured_at),
+                chain.underlying_value,
+                total_call_oi,
+                total_put_oi,
+                calculate_pcr(total_put_oi, total_call_oi),
+                calculate_pcr(put_change_oi, call_change_oi),
+                calculate_max_pain(expiry_chain),
+            )
+
+    def _captured_at(self, chain: OptionChain) -> datetime:
+        return _as_aware(datetime.fromisoformat(chain.fetched_at))
+
+    def _parse_expiry_param(self, expiry_date: str) -> date:
+        expiry = parse_expiry_date(expiry_date)
+        if expiry is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail='expiry_date must be formatted like 28-Mar-2024',
+            )
+        return expiry
+
+    def _resolve_range(self, start: datetime | None, end: datetime | None) -> tuple[datetime, datetime]:
+        end = _as_aware(end) if end else datetime.now(timezone.utc)
+        start = _as_aware(start) if start else datetime.combine(ist_trade_date(end), time.min, tzinfo=IST)
+        if start >= end:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='start must be before end')
+        if end - start > timedelta(days=OPTION_HISTORY_MAX_RANGE_DAYS):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f'History range cannot exceed {OPTION_HISTORY_MAX_RANGE_DAYS} days',
+            )
+        return start, end
+
+
+def _as_aware(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _downsample(captured_at: list[datetime], values: list, points: int, method: str) -> list[dict]:
+    y = np.array(values, dtype=np.float64)
+    valid = np.flatnonzero(~np.isnan(y))
+    if valid.size == 0:
+        return []
+    x = np.array([moment.timestamp() for moment in captured_at], dtype=np.float64)
+    keep = valid[DOWNSAMPLERS[method](x[valid], y[valid], points)]
+    return [{'timestamp': captured_at[index], 'value': float(y[index])} for index in keep.tolist()]
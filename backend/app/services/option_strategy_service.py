@@ -0,0 +1,157 @@
+import numpy as np
+from fastapi import HTTPException, status
+
+from app.core.config import get_settings
+from app.schemas.market import OptionStrategyLeg, OptionStrategyRequest
+from app.services.option_chain import OptionChain
+from app.services.option_greeks import greeks, implied_volatility, norm_cdf, years_to_expiry
+from app.services.options_analytics_service import OptionsAnalyticsService
+
+settings = get_settings()
+
+DAYS_PER_YEAR = 365.0
+
+
+class OptionStrategyService:
+    def __init__(self) -> None:
+        self.options_analytics_service = OptionsAnalyticsService()
+        self.data_age_seconds = 0.0
+
+    def evaluate(self, payload: OptionStrategyRequest) -> dict:
+        chain = self.options_analytics_service.get_chain(payload.symbol)
+        self.data_age_seconds = self.options_analytics_service.data_age_seconds
+        spot = chain.underlying_value
+        if spot is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail='Underlying value unavailable for selected symbol',
+            )
+
+        rate = settings.OPTIONS_RISK_FREE_RATE
+        legs = self._resolve_legs(chain, payload.legs)
+        strike, is_call, years = legs['strike'], legs['is_call'], legs['years']
+        premium, sigma, quantity = legs['premium'], legs['sigma'], legs['quantity']
+
+        # Grid rows run from now to the earliest leg expiry; later legs keep their remaining time value.
+        horizon = float(years.min())
+        elapsed = np.linspace(0.0, horizon, payload.days_points)
+        prices = np.linspace(spot * (1 - payload.price_range_pct / 100), spot * (1 + payload.price_range_pct / 100), payload.price_points)
+        remaining = np.maximum(years[None, :] - elapsed[:, None], 0.0)
+        values = _leg_values(prices, strike, remaining, rate, sigma, is_call)
+        pnl_grid = ((values - premium) * quantity).sum(axis=2)
+        expiry_pnl = pnl_grid[-1]
+
+        # Payoff kinks sit at the strikes and the curve is linear beyond them, so these points bound the extremes.
+        kinks = np.concatenate(([0.0], strike))
+        kink_values = _leg_values(kinks, strike, (years - horizon)[None, :], rate, sigma, is_call)[0]
+        kink_pnl = ((kink_values - premium) * quantity).sum(axis=1)
+        extremes = np.concatenate((expiry_pnl, kink_pnl))
+        upside_slope = float(quantity[is_call].sum())
+
+        position = greeks(spot, strike, years, rate, sigma, is_call)
+        return {
+            'symbol': chain.symbol,
+            'underlying_value': spot,
+            'timestamp': chain.fetched_at,
+            'risk_free_rate': rate,
+            'legs': [
+                {**leg.model_dump(), 'expiry_date': expiry, 'premium': float(leg_premium), 'iv': float(leg_sigma)}
+                for leg, expiry, leg_premium, leg_sigma in zip(payload.legs, legs['expiry_dates'], premium, sigma)
+            ],
+            'net_premium': float((premium * quantity).sum()),
+            'prices': prices.round(2).tolist(),
+            'days_to_expiry': ((horizon - elapsed) * DAYS_PER_YEAR).round(4).tolist(),
+            'expiry_pnl': expiry_pnl.round(2).tolist(),
+            'pnl_grid': pnl_grid.round(2).tolist(),
+            'breakevens': _breakevens(prices, expiry_pnl),
+            # Net long calls make the upside unbounded in either direction; puts are bounded at zero.
+            'max_profit': None if upside_slope > 0 else round(float(extremes.max()), 2),
+            'max_loss': None if upside_slope < 0 else round(float(extremes.min()), 2),
+            # Later legs are priced off Black-Scholes, not a piecewise-linear payoff, so extremes can fall between kinks.
+            'bounds_approximate': len(set(legs['expiry_dates'])) > 1,
+            'net_greeks': {
+                name: float((getattr(position, name) * quantity).sum())
+                for name in ('delta', 'gamma', 'vega', 'theta')
+            },
+        }
+
+    def _resolve_legs(self, chain: OptionChain, legs: list[OptionStrategyLeg]) -> dict:
+        row_years = years_to_expiry(chain)
+        rows: list[int] = []
+        expiry_dates: list[str] = []
+        for leg in legs:
+            expiry_rows = self.options_analytics_service.select_expiry_rows(chain, leg.expiry_date)
+            strikes = chain.strike[expiry_rows]
+            position = int(np.searchsorted(strikes, leg.strike))
+            if position == strikes.size or not np.isclose(strikes[position], leg.strike):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f'Strike {leg.strike:g} is not listed for the selected expiry',
+                )
+            rows.append(expiry_rows.start + position)
+            expiry_dates.append(chain.expiry_dates[int(chain.expiry_index[expiry_rows.start])])
+
+        index = np.asarray(rows)
+        is_call = np.array([leg.option_type == 'CE' for leg in legs])
+        market_premium = np.where(is_call, chain.ce_ltp[index], chain.pe_ltp[index])
+        premium = np.array([np.nan if leg.premium is None else leg.premium for leg in legs], dtype=np.float64)
+        premium = np.where(np.isnan(premium), market_premium, premium)
+        years = row_years[index]
+        if not np.all(years > 0):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail='Strategy legs must not be expired',
+            )
+        if not np.all(premium > 0):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail='Premium unavailable for a leg; pass it explicitly',
+            )
+
+        sigma = implied_volatility(premium, chain.underlying_value, chain.strike[index], years, settings.OPTIONS_RISK_FREE_RATE, is_call)
+        # Fall back to NSE's quoted IV (in percent) when the premium has no Black-Scholes solution.
+        sigma = np.where(np.isnan(sigma), np.where(is_call, chain.ce_iv[index], chain.pe_iv[index]) / 100.0, sigma)
+        if not np.all(sigma > 0):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail='Implied volatility unavailable for a leg',
+            )
+
+        return {
+            'strike': chain.strike[index],
+            'is_call': is_call,
+            'years': years,
+            'premium': premium,
+            'sigma': sigma,
+            'quantity': np.array([leg.quantity * (1 if leg.side == 'buy' else -1) for leg in legs], dtype=np.float64),
+            'expiry_dates': expiry_dates,
+        }
+
+
+def _leg_values(
+    prices: np.ndarray,
+    strike: np.ndarray,
+    remaining: np.ndarray,
+    rate: float,
+    sigma: np.ndarray,
+    is_call: np.ndarray,
+) -> np.ndarray:
+    # Values on a (time, price, leg) grid. Terms depending only on price or only on time are
+    # computed on their own axis and broadcast, so the full grid only pays for the two cdf calls.
+    spot = prices[:, None]
+    intrinsic = np.maximum(np.where(is_call, spot - strike, strike - spot), 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vol_time = (sigma * np.sqrt(remaining))[:, None, :]
+        drift = ((rate + 0.5 * sigma * sigma) * remaining)[:, None, :]
+        discounted_strike = (strike * np.exp(-rate * remaining))[:, None, :]
+        d1 = (np.log(spot / strike) + drift) / vol_time
+        call = spot * norm_cdf(d1) - discounted_strike * norm_cdf(d1 - vol_time)
+        value = np.where(is_call, call, call - spot + discounted_strike)
+    return np.where((remaining > 0)[:, None, :], value, intrinsic)
+
+
+def _breakevens(prices: np.ndarray, pnl: np.ndarray) -> list[float]:
+    crossings = np.flatnonzero(np.signbit(pnl[:-1]) != np.signbit(pnl[1:]))
+    # Linear interpolation between the grid points either side of each sign change.
+    weights = pnl[crossings] / (pnl[crossings] - pnl[crossings + 1])
+    return (prices[crossings] + weights * (prices[crossings + 1] - prices[crossings])).round(2).tolist()
@@ -1,99 +1,417 @@
 import json
-from datetime import datetime
+import time
+from collections.abc import Callable
+from typing import TypeVar
 
-import requests
+import numpy as np
 from fastapi import HTTPException, status
 
+from app.core.config import get_settings
+from app.services.option_chain import OptionChain, nullable_list
+from app.services.option_greeks import GREEK_FIELDS, ChainGreeks, compute_chain_greeks, compute_greeks_batch
+from app.utils import market_cache, nse_client
+from app.utils.nse_client import NSEClientError, NSERequest
 from app.utils.redis_client import redis_client
 
+settings = get_settings()
+
+T = TypeVar('T')
 
-NSE_BASE_URL = 'https://www.nseindia.com'
 OPTION_CHAIN_INDICES_ENDPOINT = '/api/option-chain-indices'
 OPTION_CHAIN_EQUITIES_ENDPOINT = '/api/option-chain-equities'
 OPTIONS_ANALYTICS_CACHE_PREFIX = 'options:analytics'
 OPTIONS_ANALYTICS_CACHE_SECONDS = 60
+OPTIONS_BATCH_MAX_SYMBOLS = 50
+OPTION_CHAIN_CACHE_PREFIX = 'options:chain'
+OPTION_CHAIN_CACHE_SECONDS = 60
+OPTION_GREEKS_CACHE_PREFIX = 'options:greeks'
+OPTION_GREEKS_CACHE_SECONDS = 60
+OPTION_STRIKE_WINDOW_CACHE_PREFIX = 'options:window'
+OPTION_STRIKE_WINDOW_VERSION_FIELD = 'version'
 INDEX_SYMBOLS = {'NIFTY', 'BANKNIFTY', 'FINNIFTY', 'MIDCPNIFTY', 'NIFTYNXT50'}
 
 
 class OptionsAnalyticsService:
     def __init__(self) -> None:
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
-                'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 '
-                '(KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
-                'Accept': 'application/json, text/plain, */*',
-                'Referer': f'{NSE_BASE_URL}/option-chain',
-            }
-        )
+        self.data_age_seconds = 0.0
 
     def get_analytics(self, symbol: str, expiry_date: str | None = None) -> dict:
+        expiry_analytics = self.get_expiry_analytics(symbol)
+        selected_expiry = self._select_expiry(expiry_analytics['expiry_dates'], expiry_date)
+        return next(entry for entry in expiry_analytics['expiries'] if entry['expiry_date'] == selected_expiry)
+
+    def get_expiry_analytics(self, symbol: str) -> dict:
+        normalized_symbol = symbol.strip().upper()
+        return self._read_derived(
+            normalized_symbol,
+            self._cache_key(normalized_symbol),
+            self._build_expiry_analytics,
+            fresh_seconds=OPTIONS_ANALYTICS_CACHE_SECONDS,
+        )
+
+    def get_greeks(self, symbol: str, expiry_date: str | None = None) -> dict:
+        normalized_symbol = symbol.strip().upper()
+        chain = self.get_chain(normalized_symbol)
+        chain_greeks = self._read_derived(
+            normalized_symbol,
+            self._greeks_cache_key(normalized_symbol),
+            self._build_greeks,
+            fresh_seconds=OPTION_GREEKS_CACHE_SECONDS,
+            encode=ChainGreeks.to_bytes,
+            decode=ChainGreeks.from_bytes,
+        )
+        if chain_greeks.fetched_at != chain.fetched_at:
+            # The beat refresh stores chains before their Greeks; never pair rows from different snapshots.
+            chain_greeks = compute_chain_greeks(chain, settings.OPTIONS_RISK_FREE_RATE)
+
+        return self._greeks_payload(chain, chain_greeks, self.select_expiry_rows(chain, expiry_date))
+
+    def get_strike_window(self, symbol: str, expiry_date: str | None = None, window: int = 10) -> dict:
         normalized_symbol = symbol.strip().upper()
-        cache_key = self._cache_key(normalized_symbol, expiry_date)
-        cached = redis_client.get(cache_key)
-        if cached:
-            return json.loads(cached)
+        cache_key = self._strike_window_cache_key(normalized_symbol)
+        if not is_prefetched_symbol(normalized_symbol):
+            cached = market_cache.cached_fetch(
+                f'{cache_key}:{expiry_date or "nearest"}:{window}',
+                lambda: self._build_strike_window(normalized_symbol, expiry_date, window),
+                fresh_seconds=OPTION_CHAIN_CACHE_SECONDS,
+            )
+            self.data_age_seconds = max(self.data_age_seconds, cached.age_seconds)
+            return cached.value
+
+        version = redis_client.hget(cache_key, OPTION_STRIKE_WINDOW_VERSION_FIELD)
+        if version is not None:
+            cached = redis_client.hget(cache_key, self._strike_window_field(version, expiry_date, window))
+            if cached is not None:
+                entry = json.loads(cached)
+                self.data_age_seconds = max(self.data_age_seconds, time.time() - entry['stored_at'])
+                return entry['data']
+
+        cached_chain = self._get_cached_chain(normalized_symbol)
+        chain = cached_chain.value
+        payload = self._strike_window_payload(chain, self.select_expiry_rows(chain, expiry_date), window)
+        self.data_age_seconds = max(self.data_age_seconds, cached_chain.age_seconds)
+        if version is not None:
+            # Filed under the snapshot actually used, so a build racing a refresh is never served as the newer one.
+            pipeline = redis_client.pipeline()
+            pipeline.hset(
+                cache_key,
+                self._strike_window_field(chain.fetched_at, expiry_date, window),
+                json.dumps({'stored_at': time.time() - cached_chain.age_seconds, 'data': payload}),
+            )
+            pipeline.expire(cache_key, market_cache.expire_seconds(OPTION_CHAIN_CACHE_SECONDS))
+            pipeline.execute()
+        return payload
+
+    def get_chain(self, symbol: str) -> OptionChain:
+        cached = self._get_cached_chain(symbol.strip().upper())
+        self.data_age_seconds = max(self.data_age_seconds, cached.age_seconds)
+        return cached.value
+
+    def get_analytics_batch(self, symbols: list[str]) -> list[dict]:
+        normalized_symbols = list(dict.fromkeys(symbol.strip().upper() for symbol in symbols if symbol.strip()))
+        if not normalized_symbols or len(normalized_symbols) > OPTIONS_BATCH_MAX_SYMBOLS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f'Provide between 1 and {OPTIONS_BATCH_MAX_SYMBOLS} symbols',
+            )
 
-        payload = self._fetch_option_chain_payload(normalized_symbol)
-        selected_expiry = expiry_date or payload['records'].get('expiryDates', [None])[0]
+        entries = market_cache.read_many([self._cache_key(symbol) for symbol in normalized_symbols])
+        items: dict[str, dict] = {}
+        misses: dict[str, market_cache.CachedValue[dict] | None] = {}
+        for symbol, entry in zip(normalized_symbols, entries):
+            if entry is not None and (is_prefetched_symbol(symbol) or entry.age_seconds < OPTIONS_ANALYTICS_CACHE_SECONDS):
+                items[symbol] = self._batch_item(symbol, entry)
+            elif is_prefetched_symbol(symbol):
+                items[symbol] = self._batch_error(symbol, 'Market data snapshot is not available yet')
+            else:
+                misses[symbol] = entry
+        if misses:
+            items.update(self._fetch_batch_misses(misses))
+        return [items[symbol] for symbol in normalized_symbols]
+
+    def select_expiry_rows(self, chain: OptionChain, expiry_date: str | None) -> slice:
+        bounds = np.searchsorted(chain.expiry_index, np.arange(len(chain.expiry_dates) + 1)).tolist()
+        listed = [expiry for position, expiry in enumerate(chain.expiry_dates) if bounds[position] < bounds[position + 1]]
+        selected_expiry = self._select_expiry(listed, expiry_date)
+        position = chain.expiry_dates.index(selected_expiry)
+        return slice(bounds[position], bounds[position + 1])
+
+    def refresh_snapshot(self, symbol: str, payload: dict) -> OptionChain:
+        self._validate_payload(payload)
+        chain = OptionChain.from_payload(symbol, payload)
+        # Analytics for the whole refresh are stored together afterwards, see refresh_analytics.
+        self._store_chain(chain)
+        return chain
+
+    def refresh_analytics(self, chains: list[OptionChain]) -> None:
+        if not chains:
+            return
+        market_cache.store_many(
+            {
+                self._cache_key(chain.symbol): json.dumps(self._expiry_analytics_payload(chain.symbol, chain)).encode()
+                for chain in chains
+            },
+            fresh_seconds=OPTIONS_ANALYTICS_CACHE_SECONDS,
+        )
+
+    def _store_snapshot(self, chain: OptionChain) -> dict:
+        analytics = self._expiry_analytics_payload(chain.symbol, chain)
+        self._store_chain(chain)
+        market_cache.store(self._cache_key(chain.symbol), analytics, fresh_seconds=OPTIONS_ANALYTICS_CACHE_SECONDS)
+        return analytics
+
+    def _store_chain(self, chain: OptionChain) -> None:
+        symbol = chain.symbol
+        market_cache.store(
+            self._chain_cache_key(symbol),
+            chain,
+            fresh_seconds=OPTION_CHAIN_CACHE_SECONDS,
+            encode=OptionChain.to_bytes,
+        )
+        pipeline = redis_client.pipeline()
+        pipeline.delete(self._strike_window_cache_key(symbol))
+        pipeline.hset(self._strike_window_cache_key(symbol), OPTION_STRIKE_WINDOW_VERSION_FIELD, chain.fetched_at)
+        pipeline.expire(self._strike_window_cache_key(symbol), market_cache.expire_seconds(OPTION_CHAIN_CACHE_SECONDS))
+        pipeline.execute()
+
+    def _fetch_batch_misses(self, misses: dict[str, market_cache.CachedValue[dict] | None]) -> dict[str, dict]:
+        items: dict[str, dict] = {}
+        locks = {}
+        for symbol, stale in misses.items():
+            lock = market_cache.acquire_refresh_lock(self._cache_key(symbol))
+            if lock is None and stale is not None:
+                # Another worker is already refreshing this symbol; serve what we have, as cached_fetch does.
+                items[symbol] = self._batch_item(symbol, stale)
+            else:
+                locks[symbol] = lock
+
+        try:
+            symbols = list(locks)
+            # fetch_json_many runs the requests concurrently, capped by NSE_MAX_CONCURRENCY.
+            payloads = nse_client.fetch_json_many([option_chain_request(symbol) for symbol in symbols]) if symbols else []
+            for symbol, payload in zip(symbols, payloads):
+                try:
+                    if isinstance(payload, NSEClientError):
+                        raise HTTPException(
+                            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            detail='NSE option chain is currently unavailable',
+                        )
+                    self._validate_payload(payload)
+                    analytics = self._store_snapshot(OptionChain.from_payload(symbol, payload))
+                    items[symbol] = self._batch_item(symbol, market_cache.CachedValue(value=analytics, age_seconds=0.0))
+                except HTTPException as exc:
+                    stale = misses[symbol]
+                    items[symbol] = self._batch_item(symbol, stale) if stale is not None else self._batch_error(symbol, exc.detail)
+        finally:
+            for lock in locks.values():
+                if lock is not None:
+                    market_cache.release_refresh_lock(lock)
+        return items
+
+    def _batch_item(self, symbol: str, entry: market_cache.CachedValue[dict]) -> dict:
+        try:
+            selected_expiry = self._select_expiry(entry.value['expiry_dates'], None)
+        except HTTPException as exc:
+            return self._batch_error(symbol, exc.detail)
+        self.data_age_seconds = max(self.data_age_seconds, entry.age_seconds)
+        return {
+            'symbol': symbol,
+            'status': 'ok',
+            'error': None,
+            'data_age_seconds': round(entry.age_seconds, 3),
+            'analytics': next(row for row in entry.value['expiries'] if row['expiry_date'] == selected_expiry),
+        }
+
+    def _batch_error(self, symbol: str, error: str) -> dict:
+        return {'symbol': symbol, 'status': 'error', 'error': error, 'data_age_seconds': None, 'analytics': None}
+
+    def refresh_greeks(self, chains: list[OptionChain]) -> None:
+        for chain, chain_greeks in zip(chains, compute_greeks_batch(chains, settings.OPTIONS_RISK_FREE_RATE)):
+            market_cache.store(
+                self._greeks_cache_key(chain.symbol),
+                chain_greeks,
+                fresh_seconds=OPTION_GREEKS_CACHE_SECONDS,
+                encode=ChainGreeks.to_bytes,
+            )
+
+    def _read_derived(
+        self,
+        symbol: str,
+        cache_key: str,
+        build: Callable[[str], market_cache.CachedValue[T]],
+        *,
+        fresh_seconds: int,
+        encode: Callable[[T], bytes] | None = None,
+        decode: Callable[[bytes], T] | None = None,
+    ) -> T:
+        if is_prefetched_symbol(symbol):
+            cached = market_cache.read_snapshot(cache_key, decode=decode)
+        else:
+            cached = market_cache.cached_fetch(
+                cache_key,
+                lambda: build(symbol),
+                fresh_seconds=fresh_seconds,
+                encode=encode,
+                decode=decode,
+            )
+        self.data_age_seconds = max(self.data_age_seconds, cached.age_seconds)
+        return cached.value
+
+    def _select_expiry(self, expiry_dates: list[str], expiry_date: str | None) -> str:
+        selected_expiry = expiry_date or next(iter(expiry_dates), None)
         if not selected_expiry:
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail='Expiry date unavailable for selected symbol',
             )
-
-        rows = [
-            row
-            for row in payload['records'].get('data', [])
-            if row.get('expiryDate') == selected_expiry
-        ]
-        if not rows:
+        if selected_expiry not in expiry_dates:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail='No option chain data found for selected expiry',
             )
+        return selected_expiry
+
+    def _get_cached_chain(self, symbol: str) -> market_cache.CachedValue[OptionChain]:
+        cache_key = self._chain_cache_key(symbol)
+        if is_prefetched_symbol(symbol):
+            return market_cache.read_snapshot(cache_key, decode=OptionChain.from_bytes)
+        return market_cache.cached_fetch(
+            cache_key,
+            lambda: OptionChain.from_payload(symbol, self._fetch_option_chain_payload(symbol)),
+            fresh_seconds=OPTION_CHAIN_CACHE_SECONDS,
+            encode=OptionChain.to_bytes,
+            decode=OptionChain.from_bytes,
+        )
 
-        analytics = self._calculate_analytics(rows)
-        response_payload = {
-            'symbol': normalized_symbol,
-            'expiry_date': selected_expiry,
-            'underlying_value': self._safe_float(payload['records'].get('underlyingValue')),
-            'timestamp': datetime.utcnow().isoformat(),
-            **analytics,
+    def _build_strike_window(self, symbol: str, expiry_date: str | None, window: int) -> market_cache.CachedValue[dict]:
+        cached_chain = self._get_cached_chain(symbol)
+        chain = cached_chain.value
+        payload = self._strike_window_payload(chain, self.select_expiry_rows(chain, expiry_date), window)
+        return market_cache.CachedValue(value=payload, age_seconds=cached_chain.age_seconds)
+
+    def _build_expiry_analytics(self, symbol: str) -> market_cache.CachedValue[dict]:
+        cached_chain = self._get_cached_chain(symbol)
+        payload = self._expiry_analytics_payload(symbol, cached_chain.value)
+        return market_cache.CachedValue(value=payload, age_seconds=cached_chain.age_seconds)
+
+    def _expiry_analytics_payload(self, symbol: str, chain: OptionChain) -> dict:
+        expiries: list[dict] = []
+        for expiry in chain.expiry_dates:
+            expiry_chain = chain.for_expiry(expiry)
+            if len(expiry_chain) == 0:
+                continue
+            expiries.append(
+                {
+                    'symbol': symbol,
+                    'expiry_date': expiry,
+                    'underlying_value': chain.underlying_value,
+                    'timestamp': chain.fetched_at,
+                    **self._calculate_analytics(expiry_chain),
+                }
+            )
+
+        return {
+            'symbol': symbol,
+            'underlying_value': chain.underlying_value,
+            'timestamp': chain.fetched_at,
+            'expiry_dates': [row['expiry_date'] for row in expiries],
+            'expiries': expiries,
+            'term_structure': [
+                {
+                    'expiry_date': row['expiry_date'],
+                    'pcr': row['pcr'],
+                    'change_oi_pcr': row['change_oi_pcr'],
+                    'max_pain': row['max_pain'],
+                }
+                for row in expiries
+            ],
+        }
+
+    def _build_greeks(self, symbol: str) -> market_cache.CachedValue[ChainGreeks]:
+        cached_chain = self._get_cached_chain(symbol)
+        chain_greeks = compute_chain_greeks(cached_chain.value, settings.OPTIONS_RISK_FREE_RATE)
+        return market_cache.CachedValue(value=chain_greeks, age_seconds=cached_chain.age_seconds)
+
+    def _greeks_payload(self, chain: OptionChain, chain_greeks: ChainGreeks, rows: slice) -> dict:
+        columns = {
+            'strike': chain.strike[rows].tolist(),
+            'call_oi': chain.ce_oi[rows].tolist(),
+            'put_oi': chain.pe_oi[rows].tolist(),
+            **{f'call_{name}': nullable_list(getattr(chain_greeks.call, name)[rows]) for name in GREEK_FIELDS},
+            **{f'put_{name}': nullable_list(getattr(chain_greeks.put, name)[rows]) for name in GREEK_FIELDS},
+            'gamma_exposure': nullable_list(chain_greeks.gamma_exposure[rows]),
+        }
+        return {
+            'symbol': chain.symbol,
+            'expiry_date': chain.expiry_dates[int(chain.expiry_index[rows.start])],
+            'underlying_value': chain.underlying_value,
+            'timestamp': chain.fetched_at,
+            'risk_free_rate': settings.OPTIONS_RISK_FREE_RATE,
+            'years_to_expiry': nullable_list(chain_greeks.years_to_expiry[rows.start:rows.start + 1])[0],
+            'total_gamma_exposure': float(np.nansum(chain_greeks.gamma_exposure[rows])),
+            'strikes': [dict(zip(columns, values)) for values in zip(*columns.values())],
+        }
+
+    def _strike_window_payload(self, chain: OptionChain, rows: slice, window: int) -> dict:
+        underlying = chain.underlying_value
+        if underlying is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail='Underlying value unavailable for selected symbol',
+            )
+
+        # Strikes are sorted within each expiry slice, so ATM is one binary search away.
+        strikes = chain.strike[rows]
+        atm = int(np.searchsorted(strikes, underlying))
+        if atm == strikes.size or (atm > 0 and underlying - strikes[atm - 1] <= strikes[atm] - underlying):
+            atm -= 1
+        selected = slice(rows.start + max(atm - window, 0), rows.start + min(atm + window + 1, strikes.size))
+
+        columns = {
+            'strike': chain.strike[selected].tolist(),
+            'call_oi': chain.ce_oi[selected].tolist(),
+            'put_oi': chain.pe_oi[selected].tolist(),
+            'call_change_oi': chain.ce_change_oi[selected].tolist(),
+            'put_change_oi': chain.pe_change_oi[selected].tolist(),
+            'call_ltp': nullable_list(chain.ce_ltp[selected]),
+            'put_ltp': nullable_list(chain.pe_ltp[selected]),
+            'call_iv': nullable_list(chain.ce_iv[selected]),
+            'put_iv': nullable_list(chain.pe_iv[selected]),
+        }
+        return {
+            'symbol': chain.symbol,
+            'expiry_date': chain.expiry_dates[int(chain.expiry_index[rows.start])],
+            'underlying_value': underlying,
+            'timestamp': chain.fetched_at,
+            'atm_strike': float(strikes[atm]),
+            'strikes': [dict(zip(columns, values)) for values in zip(*columns.values())],
         }
-        redis_client.set(cache_key, json.dumps(response_payload), ex=OPTIONS_ANALYTICS_CACHE_SECONDS)
-        return response_payload
 
     def _fetch_option_chain_payload(self, symbol: str) -> dict:
-        endpoint = (
-            OPTION_CHAIN_INDICES_ENDPOINT if symbol in INDEX_SYMBOLS else OPTION_CHAIN_EQUITIES_ENDPOINT
-        )
+        request = option_chain_request(symbol)
         try:
-            self.session.get(f'{NSE_BASE_URL}/option-chain', timeout=10)
-            response = self.session.get(
-                f'{NSE_BASE_URL}{endpoint}',
-                params={'symbol': symbol},
-                timeout=10,
-            )
-            response.raise_for_status()
-            payload = response.json()
-        except requests.RequestException as exc:
+            payload = nse_client.fetch_json(request.path, params=request.params, referer=request.referer)
+        except NSEClientError as exc:
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail='NSE option chain is currently unavailable',
             ) from exc
 
+        self._validate_payload(payload)
+        return payload
+
+    def _validate_payload(self, payload: dict) -> None:
         if 'records' not in payload:
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail='Invalid option chain payload from NSE',
             )
-        return payload
 
-    def _calculate_analytics(self, rows: list[dict]) -> dict:
-        total_call_oi = calculate_total_call_oi(rows)
-        total_put_oi = calculate_total_put_oi(rows)
-        total_call_change_oi, total_put_change_oi = calculate_change_in_oi(rows)
+    def _calculate_analytics(self, chain: OptionChain) -> dict:
+        total_call_oi = calculate_total_call_oi(chain)
+        total_put_oi = calculate_total_put_oi(chain)
+        total_call_change_oi, total_put_change_oi = calculate_change_in_oi(chain)
+        pain_strikes, pain = calculate_pain_curve(chain)
 
         return {
             'total_call_oi': total_call_oi,
@@ -102,36 +420,52 @@ class OptionsAnalyticsService:
             'change_in_call_oi': total_call_change_oi,
             'change_in_put_oi': total_put_change_oi,
             'change_oi_pcr': calculate_pcr(total_put_change_oi, total_call_change_oi),
-            'strongest_support': calculate_strongest_support(rows),
-            'strongest_resistance': calculate_strongest_resistance(rows),
-            'max_pain': calculate_max_pain(rows),
+            'strongest_support': calculate_strongest_support(chain),
+            'strongest_resistance': calculate_strongest_resistance(chain),
+            'max_pain': _max_pain_strike(pain_strikes, pain),
+            'pain_curve': {'strike': pain_strikes.tolist(), 'pain': pain.tolist()},
         }
 
-    def _cache_key(self, symbol: str, expiry_date: str | None) -> str:
-        expiry_segment = expiry_date or 'nearest'
-        return f'{OPTIONS_ANALYTICS_CACHE_PREFIX}:{symbol}:{expiry_segment}'
+    def _cache_key(self, symbol: str) -> str:
+        return f'{OPTIONS_ANALYTICS_CACHE_PREFIX}:{symbol}'
 
-    def _safe_float(self, value: object) -> float | None:
-        if value is None:
-            return None
-        try:
-            return float(value)
-        except (TypeError, ValueError):
-            return None
+    def _chain_cache_key(self, symbol: str) -> str:
+        return f'{OPTION_CHAIN_CACHE_PREFIX}:{symbol}'
+
+    def _greeks_cache_key(self, symbol: str) -> str:
+        return f'{OPTION_GREEKS_CACHE_PREFIX}:{symbol}'
+
+    def _strike_window_cache_key(self, symbol: str) -> str:
+        return f'{OPTION_STRIKE_WINDOW_CACHE_PREFIX}:{symbol}'
+
+    def _strike_window_field(self, version: str, expiry_date: str | None, window: int) -> str:
+        return f'{version}|{expiry_date or ""}|{window}'
+
+
+def tracked_option_symbols() -> list[str]:
+    symbols = [*sorted(INDEX_SYMBOLS), *(symbol.strip().upper() for symbol in settings.FNO_SYMBOLS)]
+    return list(dict.fromkeys(symbol for symbol in symbols if symbol))
 
 
-def calculate_total_call_oi(rows: list[dict]) -> int:
-    return sum(int((row.get('CE') or {}).get('openInterest', 0) or 0) for row in rows)
+def is_prefetched_symbol(symbol: str) -> bool:
+    return settings.MARKET_PREFETCH_ENABLED and symbol in tracked_option_symbols()
 
 
-def calculate_total_put_oi(rows: list[dict]) -> int:
-    return sum(int((row.get('PE') or {}).get('openInterest', 0) or 0) for row in rows)
+def option_chain_request(symbol: str) -> NSERequest:
+    endpoint = OPTION_CHAIN_INDICES_ENDPOINT if symbol in INDEX_SYMBOLS else OPTION_CHAIN_EQUITIES_ENDPOINT
+    return NSERequest(path=endpoint, params={'symbol': symbol}, referer='/option-chain')
 
 
-def calculate_change_in_oi(rows: list[dict]) -> tuple[int, int]:
-    total_call_change_oi = sum(int((row.get('CE') or {}).get('changeinOpenInterest', 0) or 0) for row in rows)
-    total_put_change_oi = sum(int((row.get('PE') or {}).get('changeinOpenInterest', 0) or 0) for row in rows)
-    return total_call_change_oi, total_put_change_oi
+def calculate_total_call_oi(chain: OptionChain) -> int:
+    return int(chain.ce_oi.sum())
+
+
+def calculate_total_put_oi(chain: OptionChain) -> int:
+    return int(chain.pe_oi.sum())
+
+
+def calculate_change_in_oi(chain: OptionChain) -> tuple[int, int]:
+    return int(chain.ce_change_oi.sum()), int(chain.pe_change_oi.sum())
 
 
 def calculate_pcr(put_oi: int, call_oi: int) -> float | None:
@@ -140,46 +474,51 @@ def calculate_pcr(put_oi: int, call_oi: int) -> float | None:
     return round(put_oi / call_oi, 6)
 
 
-def calculate_strongest_support(rows: list[dict]) -> float | None:
-    support_row = max(rows, key=lambda row: int((row.get('PE') or {}).get('openInterest', 0) or 0), default=None)
-    if support_row is None:
+def calculate_strongest_support(chain: OptionChain) -> float | None:
+    if len(chain) == 0:
         return None
-    return float(support_row.get('strikePrice'))
+    return float(chain.strike[np.argmax(chain.pe_oi)])
 
 
-def calculate_strongest_resistance(rows: list[dict]) -> float | None:
-    resistance_row = max(rows, key=lambda row: int((row.get('CE') or {}).get('openInterest', 0) or 0), default=None)
-    if resistance_row is None:
+def calculate_strongest_resistance(chain: OptionChain) -> float | None:
+    if len(chain) == 0:
         return None
-    return float(resistance_row.get('strikePrice'))
+    return float(chain.strike[np.argmax(chain.ce_oi)])
 
 
-def calculate_max_pain(rows: list[dict]) -> float | None:
-    if not rows:
-        return None
+def calculate_pain_curve(chain: OptionChain) -> tuple[np.ndarray, np.ndarray]:
+    return _pain_curve(chain.strike, chain.ce_oi, chain.pe_oi)
 
-    strike_rows: list[tuple[float, int, int]] = []
-    for row in rows:
-        strike = row.get('strikePrice')
-        if strike is None:
-            continue
-        strike_rows.append(
-            (
-                float(strike),
-                int((row.get('CE') or {}).get('openInterest', 0) or 0),
-                int((row.get('PE') or {}).get('openInterest', 0) or 0),
-            )
-        )
 
-    if not strike_rows:
+def calculate_max_pain(chain: OptionChain) -> float | None:
+    if len(chain) == 0:
         return None
+    return _max_pain_strike(*calculate_pain_curve(chain))
 
-    pain_by_strike: dict[float, float] = {}
-    for candidate_strike, _, _ in strike_rows:
-        total_pain = 0.0
-        for strike, call_oi, put_oi in strike_rows:
-            total_pain += max(0.0, candidate_strike - strike) * call_oi
-            total_pain += max(0.0, strike - candidate_strike) * put_oi
-        pain_by_strike[candidate_strike] = total_pain
 
-    return min(pain_by_strike, key=pain_by_strike.get)
+def _max_pain_strike(strikes: np.ndarray, pain: np.ndarray) -> float | None:
+    if strikes.size == 0:
+        return None
+    # Strikes are ascending, so ties resolve to the lowest strike as the chain lists it first.
+    return float(strikes[np.argmin(pain)])
+
+
+def _pain_curve(
+    strikes: np.ndarray,
+    call_oi: np.ndarray,
+    put_oi: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    # Pain at K is sum(call_oi * (K - s)) over s <= K plus sum(put_oi * (s - K)) over s >= K,
+    # so prefix/suffix sums of OI and OI * strike over sorted strikes price every K at once.
+    unique_strikes, inverse = np.unique(strikes, return_inverse=True)
+    call_by_strike = np.bincount(inverse, weights=call_oi, minlength=unique_strikes.size)
+    put_by_strike = np.bincount(inverse, weights=put_oi, minlength=unique_strikes.size)
+
+    call_oi_below = np.cumsum(call_by_strike)
+    call_notional_below = np.cumsum(call_by_strike * unique_strikes)
+    put_oi_above = np.cumsum(put_by_strike[::-1])[::-1]
+    put_notional_above = np.cumsum((put_by_strike * unique_strikes)[::-1])[::-1]
+
+    call_pain = unique_strikes * call_oi_below - call_notional_below
+    put_pain = put_notional_above - unique_strikes * put_oi_above
+    return unique_strikes, call_pain + put_pain
@@ -0,0 +1,127 @@
+import json
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from functools import cache
+from pathlib import Path
+
+import psycopg2
+from redis import RedisError
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.database import SessionLocal
+from app.repositories.sector_override_repository import SectorOverrideRepository
+from app.utils.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+INDUSTRY_SECTORS_PATH = Path(__file__).resolve().parent.parent / 'data' / 'industry_sectors.json'
+SECTOR_OVERRIDE_RELOAD_SECONDS = 5 * 60
+SECTOR_UNKNOWN_INDUSTRIES_KEY = 'sectors:unknown_industries'
+DEFAULT_SECTOR = 'OTHERS'
+_NON_ALPHANUMERIC = re.compile(r'[^A-Z0-9]+')
+
+
+@dataclass
+class SectorTable:
+    overrides: dict[str, str]
+    loaded_at: float
+    # Raw industry string -> sector, filled on first sight; None when the string has no usable characters.
+    resolved: dict[str, str | None] = field(default_factory=dict)
+
+
+_table = SectorTable(overrides={}, loaded_at=float('-inf'))
+
+
+def normalize_industry(raw: object) -> str:
+    return _NON_ALPHANUMERIC.sub(' ', str(raw).upper()).strip()
+
+
+def sector_slug(raw: object) -> str:
+    return normalize_industry(raw).replace(' ', '_')
+
+
+@cache
+def _industry_sectors() -> tuple[dict[str, str], tuple[tuple[str, str], ...]]:
+    data = json.loads(INDUSTRY_SECTORS_PATH.read_text())
+    industries = {normalize_industry(industry): sector for industry, sector in data['industries'].items()}
+    return industries, tuple((keyword, sector) for keyword, sector in data['keywords'])
+
+
+class SectorService:
+    def load(self) -> None:
+        self._reload()
+
+    def invalidate(self) -> None:
+        _table.loaded_at = float('-inf')
+
+    def classify(self, item: dict) -> str:
+        table = self._current()
+        meta = item.get('meta') or {}
+        for source in (meta.get('industry'), meta.get('sector'), item.get('industry'), item.get('sector')):
+            if not source:
+                continue
+            raw = str(source)
+            try:
+                sector = table.resolved[raw]
+            except KeyError:
+                sector = table.resolved[raw] = self._resolve(raw, table.overrides)
+            if sector:
+                return sector
+        return DEFAULT_SECTOR
+
+    def unknown_industries(self) -> list[str]:
+        return sorted(redis_client.smembers(SECTOR_UNKNOWN_INDUSTRIES_KEY))
+
+    def forget_unknown(self, industry: str) -> None:
+        resolved = [raw for raw in redis_client.smembers(SECTOR_UNKNOWN_INDUSTRIES_KEY) if normalize_industry(raw) == industry]
+        if resolved:
+            redis_client.srem(SECTOR_UNKNOWN_INDUSTRIES_KEY, *resolved)
+
+    def _resolve(self, raw: str, overrides: dict[str, str]) -> str | None:
+        industry = normalize_industry(raw)
+        if not industry:
+            return None
+
+        industries, keywords = _industry_sectors()
+        sector = overrides.get(industry) or industries.get(industry)
+        if sector:
+            return sector
+        for keyword, keyword_sector in keywords:
+            if keyword in industry:
+                return keyword_sector
+
+        self._report_unknown(raw)
+        return industry.replace(' ', '_')
+
+    def _report_unknown(self, raw: str) -> None:
+        # The shared set makes the warning fire once across all workers, not once per process.
+        try:
+            is_new = redis_client.sadd(SECTOR_UNKNOWN_INDUSTRIES_KEY, raw)
+        except RedisError:
+            is_new = True
+        if is_new:
+            logger.warning('Unmapped industry %r; add it to industry_sectors.json or a sector override', raw)
+
+    def _current(self) -> SectorTable:
+        if time.monotonic() - _table.loaded_at >= SECTOR_OVERRIDE_RELOAD_SECONDS:
+            self._reload()
+        return _table
+
+    def _reload(self) -> None:
+        global _table
+        db = SessionLocal()
+        try:
+            overrides = {row.industry: row.sector for row in SectorOverrideRepository(db).list_all()}
+        except (SQLAlchemyError, psycopg2.Error) as exc:
+            logger.warning('Keeping in-memory sector overrides; reload failed: %s', str(exc).splitlines()[0])
+            overrides = _table.overrides
+        finally:
+            db.close()
+
+        # Resolutions are only thrown away when the overrides actually changed.
+        if overrides == _table.overrides:
+            _table.loaded_at = time.monotonic()
+        else:
+            _table = SectorTable(overrides=overrides, loaded_at=time.monotonic())
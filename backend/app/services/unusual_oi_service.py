@@ -0,0 +1,130 @@
+import json
+from datetime import datetime, timezone
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.services.oi_delta_service import OIFrame, format_expiry, key_strikes
+from app.utils.market_calendar import trade_date
+from app.utils.redis_client import redis_binary_client, redis_client
+
+settings = get_settings()
+
+UNUSUAL_OI_STATS_KEY = 'options:oi:stats'
+# Statistics roll across sessions, so the hash outlives weekends and holidays but not an abandoned deployment.
+UNUSUAL_OI_STATS_RETENTION_SECONDS = 7 * 24 * 60 * 60
+UNUSUAL_OI_DETECTIONS_KEY = 'options:oi:unusual'
+UNUSUAL_OI_MAX_DETECTIONS = 20
+UNUSUAL_OI_MIN_STD = 1.0
+# Delta frame field -> reported metric name (matches the /options/oi-delta schema).
+UNUSUAL_OI_METRICS = {
+    'ce_oi': 'call_oi_change',
+    'pe_oi': 'put_oi_change',
+    'ce_volume': 'call_volume_change',
+    'pe_volume': 'put_volume_change',
+}
+UNUSUAL_OI_STATS_DTYPE = np.dtype(
+    [
+        ('key', '<i8'),
+        ('count', '<f8'),
+        ('mean', '<f8', (len(UNUSUAL_OI_METRICS),)),
+        ('m2', '<f8', (len(UNUSUAL_OI_METRICS),)),
+    ]
+)
+
+
+class UnusualOIService:
+    def __init__(self, stats_key: str = UNUSUAL_OI_STATS_KEY, detections_key: str = UNUSUAL_OI_DETECTIONS_KEY) -> None:
+        self.stats_key = stats_key
+        self.detections_key = detections_key
+
+    def update(self, minute_deltas: list[tuple[str, OIFrame]]) -> dict[str, list[dict]]:
+        if not minute_deltas:
+            return {}
+
+        stored = redis_binary_client.hmget(self.stats_key, [symbol for symbol, _ in minute_deltas])
+        first_live_expiry = trade_date().toordinal()
+        stats_updates: dict[str, bytes] = {}
+        detections: dict[str, list[dict]] = {}
+        for (symbol, delta), raw in zip(minute_deltas, stored):
+            previous = np.frombuffer(raw, dtype=UNUSUAL_OI_STATS_DTYPE) if raw else np.empty(0, UNUSUAL_OI_STATS_DTYPE)
+            # Contracts that expired before today never trade again; keep their records out of the blob.
+            previous = previous[previous['key'] >> 32 >= first_live_expiry]
+            stats, flagged = self._update_stats(previous, delta)
+            stats_updates[symbol] = stats.tobytes()
+            detections[symbol] = flagged
+
+        pipeline = redis_binary_client.pipeline()
+        pipeline.hset(self.stats_key, mapping=stats_updates)
+        pipeline.expire(self.stats_key, UNUSUAL_OI_STATS_RETENTION_SECONDS)
+        pipeline.execute()
+        redis_client.hset(
+            self.detections_key,
+            mapping={
+                symbol: json.dumps(
+                    {
+                        'captured_at': datetime.fromtimestamp(delta.captured_at, tz=timezone.utc).isoformat(),
+                        'strikes': detections[symbol],
+                    }
+                )
+                for symbol, delta in minute_deltas
+            },
+        )
+        return detections
+
+    def latest(self, symbol: str) -> dict | None:
+        raw = redis_client.hget(self.detections_key, symbol.strip().upper())
+        return json.loads(raw) if raw else None
+
+    def _update_stats(self, previous: np.ndarray, delta: OIFrame) -> tuple[np.ndarray, list[dict]]:
+        values = np.column_stack([delta.records[field] for field in UNUSUAL_OI_METRICS])
+        sampled = np.isfinite(values).all(axis=1)
+        keys = delta.records['key'][sampled]
+        values = values[sampled]
+
+        # Strikes missing from this sample keep their statistics untouched.
+        all_keys = np.union1d(previous['key'], keys)
+        stats = np.zeros(all_keys.size, dtype=UNUSUAL_OI_STATS_DTYPE)
+        stats['key'] = all_keys
+        stats[np.searchsorted(stats['key'], previous['key'])] = previous
+        rows = np.searchsorted(stats['key'], keys)
+
+        count = stats['count'][rows]
+        mean = stats['mean'][rows]
+        m2 = stats['m2'][rows]
+
+        # Score against the statistics before this sample so a spike cannot dampen its own z-score.
+        with np.errstate(divide='ignore', invalid='ignore'):
+            std = np.sqrt(m2 / (count - 1)[:, None])
+            z_scores = (values - mean) / np.maximum(std, UNUSUAL_OI_MIN_STD)
+        unusual = (count >= settings.UNUSUAL_OI_MIN_SAMPLES)[:, None] & (np.abs(z_scores) >= settings.UNUSUAL_OI_Z_SCORE_THRESHOLD)
+
+        # Welford update; once the sample cap is reached the oldest weight decays geometrically,
+        # which keeps the statistics rolling over roughly the last UNUSUAL_OI_WINDOW_SAMPLES minutes.
+        window = settings.UNUSUAL_OI_WINDOW_SAMPLES
+        capped = count >= window
+        m2 = np.where(capped[:, None], m2 * (window - 1) / window, m2)
+        count = np.where(capped, window - 1, count) + 1
+        step = values - mean
+        mean = mean + step / count[:, None]
+        m2 = m2 + step * (values - mean)
+
+        stats['count'][rows] = count
+        stats['mean'][rows] = mean
+        stats['m2'][rows] = m2
+        return stats, self._detections(keys, values, z_scores, unusual)
+
+    def _detections(self, keys: np.ndarray, values: np.ndarray, z_scores: np.ndarray, unusual: np.ndarray) -> list[dict]:
+        rows, columns = np.nonzero(unusual)
+        order = np.argsort(-np.abs(z_scores[rows, columns]), kind='stable')[:UNUSUAL_OI_MAX_DETECTIONS]
+        metrics = list(UNUSUAL_OI_METRICS.values())
+        return [
+            {
+                'expiry_date': format_expiry(int(keys[row] >> 32)),
+                'strike': float(key_strikes(keys[row])),
+                'metric': metrics[column],
+                'change': float(values[row, column]),
+                'z_score': round(float(z_scores[row, column]), 2),
+            }
+            for row, column in zip(rows[order], columns[order])
+        ]
@@ -2,6 +2,7 @@ from celery import Celery
 from celery.schedules import crontab
 
 from app.core.config import get_settings
+from app.tasks.schedules import MarketHoursSchedule
 
 settings = get_settings()
 
@@ -19,10 +20,47 @@ celery_app.conf.update(
     enable_utc=True,
     imports=('app.tasks.market_tasks',),
     beat_schedule={
-        'monitor-market-alerts-every-minute': {
+        'monitor-market-alerts': {
             'task': 'tasks.monitor_market_alerts',
-            'schedule': crontab(),
-            'args': ('NIFTY',),
+            'schedule': MarketHoursSchedule(
+                'monitor-market-alerts',
+                regular_seconds=settings.MARKET_REFRESH_INTERVAL_SECONDS,
+                extended_seconds=settings.MARKET_EXTENDED_REFRESH_INTERVAL_SECONDS,
+            ),
+            'options': {'expires': settings.MARKET_REFRESH_INTERVAL_SECONDS},
+        },
+        'refresh-market-snapshots': {
+            'task': 'tasks.refresh_market_snapshots',
+            'schedule': MarketHoursSchedule(
+                'refresh-market-snapshots',
+                regular_seconds=settings.MARKET_REFRESH_INTERVAL_SECONDS,
+                extended_seconds=settings.MARKET_EXTENDED_REFRESH_INTERVAL_SECONDS,
+            ),
+            'options': {'expires': settings.MARKET_REFRESH_INTERVAL_SECONDS},
+        },
+        'rollup-index-impact': {
+            'task': 'tasks.rollup_index_impact',
+            'schedule': MarketHoursSchedule(
+                'rollup-index-impact',
+                regular_seconds=settings.INDEX_IMPACT_ROLLUP_INTERVAL_SECONDS,
+                extended_seconds=settings.MARKET_EXTENDED_REFRESH_INTERVAL_SECONDS,
+            ),
+            'options': {'expires': settings.INDEX_IMPACT_ROLLUP_INTERVAL_SECONDS},
+        },
+        'rollup-index-impact-post-close': {
+            'task': 'tasks.rollup_index_impact',
+            # 16:05 IST, after the last post-close refresh, so the day's final buckets are not left for the next pre-open.
+            'schedule': crontab(hour=10, minute=35, day_of_week='mon-fri'),
+        },
+        'refresh-index-weights-daily': {
+            'task': 'tasks.refresh_index_weights',
+            # 08:45 IST, before pre-open, so captured reference prices are the previous close.
+            'schedule': crontab(hour=3, minute=15, day_of_week='mon-fri'),
+        },
+        'prune-option-snapshots-daily': {
+            'task': 'tasks.prune_option_snapshots',
+            # 00:15 IST, after the previous trading day's partition is complete.
+            'schedule': crontab(hour=18, minute=45),
         },
     },
 )
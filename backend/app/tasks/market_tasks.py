@@ -1,4 +1,12 @@
+from celery import group
+
+from app.core.database import SessionLocal
 from app.services.ai_signal_service import AISignalEngineService
+from app.services.index_history_service import IndexHistoryService
+from app.services.market_refresh_service import MarketRefreshService
+from app.services.market_scanner_service import MarketScannerService
+from app.services.nifty_analytics_service import NiftyAnalyticsService
+from app.services.option_history_service import OptionHistoryService
 from app.tasks.celery_app import celery_app
 from app.utils.redis_client import redis_client
 
@@ -15,5 +23,47 @@ def generate_ai_trading_signal(symbol: str = 'NIFTY') -> dict:
 
 
 @celery_app.task(name='tasks.monitor_market_alerts')
-def monitor_market_alerts(symbol: str = 'NIFTY') -> dict:
-    return AISignalEngineService().generate_signal(symbol=symbol)
+def monitor_market_alerts(symbol: str | None = None) -> dict:
+    if symbol is not None:
+        return AISignalEngineService().generate_signal(symbol=symbol)
+    return AISignalEngineService().generate_signals()
+
+
+@celery_app.task(name='tasks.refresh_market_snapshots')
+def refresh_market_snapshots() -> dict:
+    results = MarketRefreshService().refresh_all()
+    if results:
+        # Rank the analytics this refresh just stored.
+        scan_fno_market.delay()
+    return results
+
+
+@celery_app.task(name='tasks.refresh_index_weights')
+def refresh_index_weights() -> dict[str, int]:
+    return NiftyAnalyticsService().refresh_weights()
+
+
+@celery_app.task(name='tasks.rollup_index_impact')
+def rollup_index_impact() -> dict[str, int]:
+    return IndexHistoryService().rollup()
+
+
+@celery_app.task(name='tasks.scan_fno_market')
+def scan_fno_market() -> str:
+    scan_id, shard_count = MarketScannerService().start_scan()
+    group(scan_fno_market_shard.s(scan_id, shard, shard_count) for shard in range(shard_count)).apply_async()
+    return scan_id
+
+
+@celery_app.task(name='tasks.scan_fno_market_shard')
+def scan_fno_market_shard(scan_id: str, shard: int, shard_count: int) -> int:
+    return MarketScannerService().scan_shard(scan_id, shard, shard_count)
+
+
+@celery_app.task(name='tasks.prune_option_snapshots')
+def prune_option_snapshots() -> list[str]:
+    db = SessionLocal()
+    try:
+        return OptionHistoryService(db).prune()
+    finally:
+        db.close()
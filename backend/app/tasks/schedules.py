@@ -0,0 +1,82 @@
+import logging
+from datetime import datetime, timedelta
+
+from celery.schedules import schedstate, schedule
+
+from app.utils.market_calendar import MarketSession, market_session, next_session_start, record_schedule_decision
+
+logger = logging.getLogger(__name__)
+
+# Beat re-checks a sleeping entry at least this often so holiday/config changes are picked up.
+MAX_IDLE_CHECK_SECONDS = 15 * 60
+
+
+class MarketHoursSchedule(schedule):
+    def __init__(self, name: str, regular_seconds: float, extended_seconds: float, nowfun=None, app=None) -> None:
+        super().__init__(run_every=timedelta(seconds=regular_seconds), nowfun=nowfun, app=app)
+        self.name = name
+        self.regular_seconds = regular_seconds
+        self.extended_seconds = extended_seconds
+        self._last_session: MarketSession | None = None
+
+    def interval_for(self, session: MarketSession) -> float | None:
+        if session == MarketSession.REGULAR:
+            return self.regular_seconds
+        if session in {MarketSession.PRE_OPEN, MarketSession.POST_CLOSE}:
+            return self.extended_seconds
+        return None
+
+    def is_due(self, last_run_at: datetime) -> schedstate:
+        now = self.now()
+        session = market_session(now)
+        interval = self.interval_for(session)
+
+        if interval is None:
+            wake_at = next_session_start(now)
+            decision = schedstate(False, min(MAX_IDLE_CHECK_SECONDS, max(1.0, (wake_at - now).total_seconds())))
+        else:
+            elapsed = (now - self.maybe_make_aware(last_run_at)).total_seconds()
+            if elapsed >= interval:
+                decision = schedstate(True, interval)
+            else:
+                decision = schedstate(False, interval - elapsed)
+
+        self._report(now, session, interval, decision)
+        return decision
+
+    def _report(self, now: datetime, session: MarketSession, interval: float | None, decision: schedstate) -> None:
+        if session != self._last_session:
+            logger.info(
+                'Market schedule %s entered session=%s interval=%s next_check=%.1fs',
+                self.name,
+                session.value,
+                interval,
+                decision.next,
+            )
+            self._last_session = session
+
+        record_schedule_decision(
+            self.name,
+            {
+                'session': session.value,
+                'interval_seconds': interval,
+                'is_due': decision.is_due,
+                'next_check_seconds': round(decision.next, 3),
+                'decided_at': now.isoformat(),
+            },
+        )
+
+    def __reduce__(self):
+        return self.__class__, (self.name, self.regular_seconds, self.extended_seconds, self.nowfun)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, MarketHoursSchedule):
+            return (self.name, self.regular_seconds, self.extended_seconds) == (
+                other.name,
+                other.regular_seconds,
+                other.extended_seconds,
+            )
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f'<MarketHoursSchedule: {self.name} regular={self.regular_seconds}s extended={self.extended_seconds}s>'
@@ -0,0 +1,44 @@
+import numpy as np
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    # Largest-Triangle-Three-Buckets; returns the indices of the points to keep.
+    size = x.size
+    if threshold >= size or threshold < 3:
+        return np.arange(size)
+
+    edges = 1 + np.arange(threshold - 1) * (size - 2) // (threshold - 2)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = size - 1
+
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_end = edges[bucket + 2] if bucket + 2 < edges.size else size
+        average_x = x[end:next_end].mean()
+        average_y = y[end:next_end].mean()
+
+        areas = np.abs(
+            (x[previous] - average_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (average_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+    return selected
+
+
+def min_max(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    # Keeps the lowest and highest point of each bucket so spikes survive downsampling.
+    size = x.size
+    if threshold >= size or threshold < 4:
+        return np.arange(size)
+
+    bucket_count = (threshold - 2) // 2
+    inner = np.arange(1, size - 1)
+    buckets = (inner - 1) * bucket_count // (size - 2)
+    order = inner[np.lexsort((y[inner], buckets))]
+    bounds = np.searchsorted(buckets[order - 1], np.arange(bucket_count + 1))
+    lows = order[bounds[:-1]]
+    highs = order[bounds[1:] - 1]
+    return np.unique(np.concatenate(([0], lows, highs, [size - 1])))
@@ -0,0 +1,202 @@
+import json
+import logging
+import math
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Generic, TypeVar
+
+from fastapi import HTTPException, status
+from redis.client import Pipeline
+from redis.exceptions import LockError
+from redis.lock import Lock
+
+from app.core.config import get_settings
+from app.utils.market_calendar import MarketSession, market_session, next_session_start
+from app.utils.redis_client import redis_binary_client
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+DATA_AGE_HEADER = 'X-Data-Age'
+LOCK_POLL_SECONDS = 0.1
+# A failed cold load is remembered briefly so queued and new requests fail fast instead of each retrying upstream.
+REFRESH_FAILURE_SECONDS = 5
+
+
+@dataclass
+class CachedValue(Generic[T]):
+    value: T
+    age_seconds: float
+
+
+def cached_fetch(
+    key: str,
+    loader: Callable[[], T | CachedValue[T]],
+    *,
+    fresh_seconds: int,
+    encode: Callable[[T], bytes] | None = None,
+    decode: Callable[[bytes], T] | None = None,
+) -> CachedValue[T]:
+    encode = encode or _encode_json
+    decode = decode or json.loads
+
+    entry = read(key, decode)
+    if entry is not None and entry.age_seconds < fresh_seconds:
+        return entry
+    if entry is None:
+        _raise_if_failed(key)
+
+    lock = acquire_refresh_lock(key)
+    if lock is None:
+        if entry is not None:
+            return entry
+        waited = _wait_for_refresh(key, decode)
+        if waited is not None:
+            return waited
+        # The holder finished without storing anything; only a request that takes over the lock may load.
+        lock = acquire_refresh_lock(key)
+        if lock is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail='Market data is being refreshed, retry shortly',
+            )
+
+    try:
+        return _load_and_store(key, loader, fresh_seconds=fresh_seconds, encode=encode, stale=entry)
+    finally:
+        release_refresh_lock(lock)
+
+
+def read(key: str, decode: Callable[[bytes], T] | None = None) -> CachedValue[T] | None:
+    return _decode_entry(redis_binary_client.hgetall(key), decode or json.loads)
+
+
+def read_many(keys: list[str], decode: Callable[[bytes], T] | None = None) -> list[CachedValue[T] | None]:
+    pipeline = redis_binary_client.pipeline(transaction=False)
+    for key in keys:
+        pipeline.hgetall(key)
+    return [_decode_entry(entry, decode or json.loads) for entry in pipeline.execute()]
+
+
+def read_snapshot(key: str, decode: Callable[[bytes], T] | None = None) -> CachedValue[T]:
+    entry = read(key, decode)
+    if entry is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail='Market data snapshot is not available yet',
+        )
+    return entry
+
+
+def store(
+    key: str,
+    value: T,
+    *,
+    fresh_seconds: int,
+    encode: Callable[[T], bytes] | None = None,
+    age_seconds: float = 0.0,
+) -> None:
+    store_many({key: (encode or _encode_json)(value)}, fresh_seconds=fresh_seconds, age_seconds=age_seconds)
+
+
+def store_many(
+    values: dict[str, bytes],
+    *,
+    fresh_seconds: int,
+    age_seconds: float = 0.0,
+    pipeline: Pipeline | None = None,
+) -> None:
+    # One MULTI so views derived from the same data are never observed half-updated.
+    # Callers passing their own pipeline can add related writes and execute it themselves.
+    stored_at = time.time() - age_seconds
+    transaction = pipeline if pipeline is not None else redis_binary_client.pipeline()
+    for key, data in values.items():
+        transaction.hset(key, mapping={'data': data, 'stored_at': repr(stored_at)})
+        transaction.expire(key, expire_seconds(fresh_seconds))
+    if pipeline is None:
+        transaction.execute()
+
+
+def expire_seconds(fresh_seconds: int) -> int:
+    # Nothing refreshes while the market is closed, so the last writes of a session are kept until the next one opens.
+    now = datetime.now(timezone.utc)
+    ttl = fresh_seconds + settings.MARKET_CACHE_STALE_IF_ERROR_SECONDS
+    expires_at = now + timedelta(seconds=ttl)
+    if market_session(expires_at) in (MarketSession.CLOSED, MarketSession.HOLIDAY):
+        ttl += math.ceil((next_session_start(expires_at) - now).total_seconds())
+    return ttl
+
+
+def acquire_refresh_lock(key: str) -> Lock | None:
+    lock = redis_binary_client.lock(f'{key}:lock', timeout=settings.MARKET_CACHE_LOCK_SECONDS)
+    return lock if lock.acquire(blocking=False) else None
+
+
+def release_refresh_lock(lock: Lock) -> None:
+    try:
+        lock.release()
+    except LockError:
+        pass
+
+
+def _decode_entry(entry: dict[bytes, bytes], decode: Callable[[bytes], T]) -> CachedValue[T] | None:
+    if not entry or b'data' not in entry:
+        return None
+    stored_at = float(entry.get(b'stored_at') or 0.0)
+    return CachedValue(value=decode(entry[b'data']), age_seconds=max(0.0, time.time() - stored_at))
+
+
+def _load_and_store(
+    key: str,
+    loader: Callable[[], T | CachedValue[T]],
+    *,
+    fresh_seconds: int,
+    encode: Callable[[T], bytes],
+    stale: CachedValue[T] | None,
+) -> CachedValue[T]:
+    try:
+        loaded = loader()
+    except HTTPException as exc:
+        if exc.status_code < 500:
+            raise
+        if stale is None:
+            redis_binary_client.set(_failure_key(key), str(exc.detail), ex=REFRESH_FAILURE_SECONDS)
+            raise
+        logger.warning('Serving stale cache key=%s age=%.1fs after refresh failure: %s', key, stale.age_seconds, exc.detail)
+        return stale
+
+    # Loaders that derive from another cached value pass its age through so staleness is not reset.
+    result = loaded if isinstance(loaded, CachedValue) else CachedValue(value=loaded, age_seconds=0.0)
+    store(key, result.value, fresh_seconds=fresh_seconds, encode=encode, age_seconds=result.age_seconds)
+    return result
+
+
+def _wait_for_refresh(key: str, decode: Callable[[bytes], Any]) -> CachedValue | None:
+    deadline = time.monotonic() + settings.MARKET_CACHE_LOCK_SECONDS
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_SECONDS)
+        entry = read(key, decode)
+        if entry is not None:
+            return entry
+        _raise_if_failed(key)
+        if not redis_binary_client.exists(f'{key}:lock'):
+            return None
+    return None
+
+
+def _raise_if_failed(key: str) -> None:
+    detail = redis_binary_client.get(_failure_key(key))
+    if detail is not None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=detail.decode())
+
+
+def _failure_key(key: str) -> str:
+    return f'{key}:failed'
+
+
+def _encode_json(value: Any) -> bytes:
+    return json.dumps(value).encode()
@@ -0,0 +1,66 @@
+import enum
+import json
+from datetime import date, datetime, time, timedelta, timezone
+
+from app.core.config import get_settings
+from app.utils.redis_client import redis_client
+
+settings = get_settings()
+
+# India does not observe DST, so a fixed offset avoids depending on tzdata in slim images.
+IST = timezone(timedelta(hours=5, minutes=30), name='IST')
+PRE_OPEN_START = time(9, 0)
+REGULAR_START = time(9, 15)
+REGULAR_END = time(15, 30)
+POST_CLOSE_END = time(16, 0)
+MARKET_SCHEDULE_STATUS_KEY = 'market:schedule:status'
+
+
+class MarketSession(str, enum.Enum):
+    HOLIDAY = 'holiday'
+    CLOSED = 'closed'
+    PRE_OPEN = 'pre_open'
+    REGULAR = 'regular'
+    POST_CLOSE = 'post_close'
+
+
+def is_trading_day(day: date) -> bool:
+    return day.weekday() < 5 and day not in set(settings.MARKET_HOLIDAYS)
+
+
+def market_session(at: datetime | None = None) -> MarketSession:
+    local = (at or datetime.now(timezone.utc)).astimezone(IST)
+    if not is_trading_day(local.date()):
+        return MarketSession.HOLIDAY
+
+    clock = local.time()
+    if PRE_OPEN_START <= clock < REGULAR_START:
+        return MarketSession.PRE_OPEN
+    if REGULAR_START <= clock < REGULAR_END:
+        return MarketSession.REGULAR
+    if REGULAR_END <= clock < POST_CLOSE_END:
+        return MarketSession.POST_CLOSE
+    return MarketSession.CLOSED
+
+
+def next_session_start(at: datetime | None = None) -> datetime:
+    local = (at or datetime.now(timezone.utc)).astimezone(IST)
+    day = local.date()
+    if local.time() >= PRE_OPEN_START:
+        day += timedelta(days=1)
+    while not is_trading_day(day):
+        day += timedelta(days=1)
+    return datetime.combine(day, PRE_OPEN_START, tzinfo=IST)
+
+
+def trade_date(at: datetime | None = None) -> date:
+    return (at or datetime.now(timezone.utc)).astimezone(IST).date()
+
+
+def record_schedule_decision(name: str, decision: dict) -> None:
+    redis_client.hset(MARKET_SCHEDULE_STATUS_KEY, name, json.dumps(decision))
+
+
+def schedule_decisions() -> list[dict]:
+    entries = redis_client.hgetall(MARKET_SCHEDULE_STATUS_KEY)
+    return [{'name': name, **json.loads(entry)} for name, entry in sorted(entries.items())]
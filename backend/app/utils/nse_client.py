@@ -0,0 +1,197 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Coroutine
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+import httpx
+import orjson
+
+from app.core.config import get_settings
+from app.utils.redis_client import redis_client
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+NSE_BASE_URL = 'https://www.nseindia.com'
+NSE_COOKIE_CACHE_KEY = 'nse:cookies'
+NSE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
+    'Accept': 'application/json, text/plain, */*',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+COOKIE_REJECTED_STATUSES = {401, 403}
+
+
+class NSEClientError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class NSERequest:
+    path: str
+    params: dict[str, str] = field(default_factory=dict)
+    referer: str = '/'
+
+
+class NSEClient:
+    def __init__(self) -> None:
+        self._client = httpx.AsyncClient(
+            base_url=NSE_BASE_URL,
+            headers=NSE_HEADERS,
+            timeout=httpx.Timeout(settings.NSE_TIMEOUT_SECONDS),
+            limits=httpx.Limits(
+                max_connections=settings.NSE_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.NSE_MAX_CONNECTIONS,
+                keepalive_expiry=60,
+            ),
+            follow_redirects=True,
+        )
+        self._semaphore = asyncio.Semaphore(settings.NSE_MAX_CONCURRENCY)
+        self._cookie_lock = asyncio.Lock()
+        self._cookies_valid_until = 0.0
+
+    async def get_bytes(self, request: NSERequest) -> bytes:
+        async with self._semaphore:
+            await self._ensure_cookies()
+            response = await self._send(request)
+            if response.status_code in COOKIE_REJECTED_STATUSES:
+                await self._ensure_cookies(force=True)
+                response = await self._send(request)
+
+        if response.is_error:
+            raise NSEClientError(f'NSE responded with HTTP {response.status_code} for {request.path}')
+        return response.content
+
+    async def get_json(self, request: NSERequest) -> dict:
+        raw = await self.get_bytes(request)
+        try:
+            # orjson decodes multi-MB option chains several times faster than json and with a smaller peak.
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError as exc:
+            raise NSEClientError(f'Invalid JSON from NSE for {request.path}') from exc
+
+    async def _send(self, request: NSERequest) -> httpx.Response:
+        try:
+            return await self._client.get(
+                request.path,
+                params=request.params,
+                headers={'Referer': f'{NSE_BASE_URL}{request.referer}'},
+            )
+        except httpx.HTTPError as exc:
+            raise NSEClientError(f'NSE request failed for {request.path}') from exc
+
+    async def _ensure_cookies(self, force: bool = False) -> None:
+        if not force and time.monotonic() < self._cookies_valid_until:
+            return
+
+        async with self._cookie_lock:
+            if not force and time.monotonic() < self._cookies_valid_until:
+                return
+
+            if not force:
+                # Redis calls are blocking; run them off the event loop so other requests keep flowing.
+                cached, ttl = await asyncio.to_thread(_read_cached_cookies)
+                if cached and ttl > 0:
+                    for cookie in json.loads(cached):
+                        self._client.cookies.set(
+                            cookie['name'],
+                            cookie['value'],
+                            domain=cookie['domain'],
+                            path=cookie['path'],
+                        )
+                    self._cookies_valid_until = time.monotonic() + ttl
+                    return
+
+            try:
+                response = await self._client.get('/', headers={'Referer': f'{NSE_BASE_URL}/'})
+            except httpx.HTTPError as exc:
+                raise NSEClientError('NSE cookie warmup failed') from exc
+            # Cookies from a rejected or failed warmup would be shared with every worker for the whole TTL.
+            if response.is_error:
+                raise NSEClientError(f'NSE cookie warmup failed with HTTP {response.status_code}')
+
+            cookies = [
+                {'name': cookie.name, 'value': cookie.value, 'domain': cookie.domain, 'path': cookie.path}
+                for cookie in self._client.cookies.jar
+            ]
+            await asyncio.to_thread(
+                redis_client.set,
+                NSE_COOKIE_CACHE_KEY,
+                json.dumps(cookies),
+                ex=settings.NSE_COOKIE_TTL_SECONDS,
+            )
+            self._cookies_valid_until = time.monotonic() + settings.NSE_COOKIE_TTL_SECONDS
+            logger.info('Refreshed NSE cookies (forced=%s)', force)
+
+
+def _read_cached_cookies() -> tuple[str | None, int]:
+    pipeline = redis_client.pipeline(transaction=False)
+    pipeline.get(NSE_COOKIE_CACHE_KEY)
+    pipeline.ttl(NSE_COOKIE_CACHE_KEY)
+    cached, ttl = pipeline.execute()
+    return cached, ttl
+
+
+class _LoopRunner:
+    def __init__(self) -> None:
+        self.pid = os.getpid()
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name='nse-client', daemon=True)
+        self.thread.start()
+        self.client = self.run(self._create_client())
+
+    def run(self, coroutine: Coroutine[Any, Any, T], batches: int = 1) -> T:
+        # A request can take up to four round trips: warmup, call, forced warmup, retry.
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        try:
+            return future.result(timeout=settings.NSE_TIMEOUT_SECONDS * 4 * batches)
+        except TimeoutError as exc:
+            future.cancel()
+            raise NSEClientError('NSE request timed out') from exc
+
+    async def _create_client(self) -> NSEClient:
+        return NSEClient()
+
+
+_runner: _LoopRunner | None = None
+_runner_lock = threading.Lock()
+
+
+def _get_runner() -> _LoopRunner:
+    global _runner
+    # Celery prefork children inherit the parent's runner object but not its thread, so rebuild per pid.
+    with _runner_lock:
+        if _runner is None or _runner.pid != os.getpid():
+            _runner = _LoopRunner()
+        return _runner
+
+
+def fetch_json(path: str, params: dict[str, str] | None = None, *, referer: str = '/') -> dict:
+    runner = _get_runner()
+    return runner.run(runner.client.get_json(NSERequest(path=path, params=params or {}, referer=referer)))
+
+
+def fetch_json_many(requests: list[NSERequest]) -> list[dict | NSEClientError]:
+    runner = _get_runner()
+
+    async def gather() -> list[dict | NSEClientError]:
+        results = await asyncio.gather(
+            *(runner.client.get_json(request) for request in requests),
+            return_exceptions=True,
+        )
+        return [
+            result if isinstance(result, dict | NSEClientError) else NSEClientError(str(result))
+            for result in results
+        ]
+
+    batches = -(-len(requests) // settings.NSE_MAX_CONCURRENCY)
+    return runner.run(gather(), batches=max(1, batches))
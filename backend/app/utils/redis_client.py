@@ -4,3 +4,4 @@ from app.core.config import get_settings
 
 settings = get_settings()
 redis_client = Redis.from_url(settings.REDIS_URL, decode_responses=True)
+redis_binary_client = Redis.from_url(settings.REDIS_URL)
@@ -0,0 +1,85 @@
+# Decode latency and peak memory of orjson vs json on an NSE-sized option chain body.
+# Run from backend/: python -m scripts.benchmark_json_decode [--payload recorded.json] [--expiries 18 --strikes 220]
+import argparse
+import json
+import timeit
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import orjson
+
+from app.services.option_chain import OptionChain
+
+
+def synthetic_body(expiries: int, strikes: int) -> bytes:
+    rng = np.random.default_rng(5)
+    expiry_dates = [f'{day:02d}-Apr-2024' for day in range(1, expiries + 1)]
+    data = []
+    for expiry in expiry_dates:
+        for strike in 18000 + 50 * np.arange(strikes):
+            row = {'strikePrice': int(strike), 'expiryDate': expiry}
+            for side in ('CE', 'PE'):
+                row[side] = {
+                    'strikePrice': int(strike),
+                    'expiryDate': expiry,
+                    'underlying': 'NIFTY',
+                    'identifier': f'OPTIDXNIFTY{expiry}{side}{strike}.00',
+                    'openInterest': int(rng.integers(0, 200000)),
+                    'changeinOpenInterest': int(rng.integers(-20000, 20000)),
+                    'pchangeinOpenInterest': round(float(rng.normal(0, 20)), 6),
+                    'totalTradedVolume': int(rng.integers(0, 5000000)),
+                    'impliedVolatility': round(float(rng.uniform(8, 40)), 2),
+                    'lastPrice': round(float(rng.uniform(0.05, 4000)), 2),
+                    'change': round(float(rng.normal(0, 50)), 6),
+                    'pChange': round(float(rng.normal(0, 10)), 6),
+                    'totalBuyQuantity': int(rng.integers(0, 500000)),
+                    'totalSellQuantity': int(rng.integers(0, 500000)),
+                    'bidQty': int(rng.integers(0, 5000)),
+                    'bidprice': round(float(rng.uniform(0.05, 4000)), 2),
+                    'askQty': int(rng.integers(0, 5000)),
+                    'askPrice': round(float(rng.uniform(0.05, 4000)), 2),
+                    'underlyingValue': 22326.9,
+                }
+            data.append(row)
+    payload = {
+        'records': {'expiryDates': expiry_dates, 'data': data, 'timestamp': '28-Mar-2024 15:30:00', 'underlyingValue': 22326.9},
+        'filtered': {'data': data[:strikes]},
+    }
+    return json.dumps(payload).encode()
+
+
+def peak_bytes(decode, body: bytes) -> int:
+    # Python heap only, which is where both decoders build the result objects.
+    tracemalloc.start()
+    try:
+        decode(body)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--payload', type=Path, help='recorded NSE response body; synthetic when omitted')
+    parser.add_argument('--expiries', type=int, default=18)
+    parser.add_argument('--strikes', type=int, default=220)
+    parser.add_argument('--number', type=int, default=10)
+    args = parser.parse_args()
+
+    body = args.payload.read_bytes() if args.payload else synthetic_body(args.expiries, args.strikes)
+    assert orjson.loads(body) == json.loads(body)
+
+    print(f'body {len(body) / 2**20:.2f} MiB')
+    print(f'{"":>22} {"median ms":>10} {"peak MiB":>9}')
+    for name, loads in (('json', json.loads), ('orjson', orjson.loads)):
+        for label, decode in (
+            (name, loads),
+            (f'{name} + OptionChain', lambda raw, loads=loads: OptionChain.from_payload('NIFTY', loads(raw))),
+        ):
+            runs = timeit.repeat(lambda: decode(body), number=args.number, repeat=5)
+            print(f'{label:>22} {np.median(runs) / args.number * 1000:>10.1f} {peak_bytes(decode, body) / 2**20:>9.1f}')
+
+
+if __name__ == '__main__':
+    main()
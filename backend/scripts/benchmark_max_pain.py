@@ -0,0 +1,48 @@
+# Vectorized calculate_max_pain against the per-candidate loop it replaced.
+# Run from backend/: python -m scripts.benchmark_max_pain [--strikes 50 200 1000]
+import argparse
+import timeit
+
+import numpy as np
+
+from app.services.option_chain import OptionChain
+from app.services.options_analytics_service import calculate_max_pain
+from scripts.max_pain_reference import reference_max_pain
+
+
+def synthetic_rows(rng: np.random.Generator, strikes: int) -> list[dict]:
+    return [
+        {
+            'strikePrice': float(18000 + 50 * index),
+            'expiryDate': '28-Mar-2024',
+            'CE': {'openInterest': int(rng.integers(0, 10**6))},
+            'PE': {'openInterest': int(rng.integers(0, 10**6))},
+        }
+        for index in range(strikes)
+    ]
+
+
+def best_of(function, number: int) -> float:
+    return min(timeit.repeat(function, number=number, repeat=3)) / number
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--strikes', type=int, nargs='+', default=[50, 200, 1000])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(3)
+    print(f'{"strikes":>8} {"loop ms":>10} {"vectorized ms":>14} {"speedup":>8}')
+    for strikes in args.strikes:
+        rows = synthetic_rows(rng, strikes)
+        chain = OptionChain.from_payload('BENCH', {'records': {'expiryDates': ['28-Mar-2024'], 'data': rows}})
+        assert calculate_max_pain(chain) == reference_max_pain(rows)
+
+        # The quadratic loop gets fewer iterations as the chain grows.
+        loop = best_of(lambda: reference_max_pain(rows), number=max(1, 200000 // strikes**2))
+        vectorized = best_of(lambda: calculate_max_pain(chain), number=500)
+        print(f'{strikes:>8} {loop * 1000:>10.3f} {vectorized * 1000:>14.4f} {loop / vectorized:>7.0f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+# Per-minute cost of UnusualOIService.update for a full F&O universe.
+# Run from backend/: python -m scripts.benchmark_unusual_oi [--symbols 200] [--expiries 3] [--strikes 80]
+# Uses the configured Redis under its own bench: keys, never the live statistics, and deletes them afterwards.
+import argparse
+import os
+import time
+from datetime import timedelta
+
+import numpy as np
+
+from app.services.oi_delta_service import OI_FRAME_DTYPE, OI_FRAME_FIELDS, STRIKE_SCALE, OIFrame
+from app.services.unusual_oi_service import (
+    UNUSUAL_OI_DETECTIONS_KEY,
+    UNUSUAL_OI_STATS_DTYPE,
+    UNUSUAL_OI_STATS_KEY,
+    UnusualOIService,
+)
+from app.utils.market_calendar import trade_date
+from app.utils.redis_client import redis_binary_client
+
+
+def minute_delta(rng: np.random.Generator, expiries: int, strikes: int, captured_at: float) -> OIFrame:
+    first_expiry = trade_date().toordinal()
+    ordinals = np.repeat([first_expiry + 7 * week for week in range(expiries)], strikes)
+    strike_values = np.tile(20000 + 50 * np.arange(strikes), expiries)
+
+    records = np.empty(ordinals.size, dtype=OI_FRAME_DTYPE)
+    records['key'] = (ordinals << 32) | (strike_values * STRIKE_SCALE)
+    for name in OI_FRAME_FIELDS:
+        records[name] = rng.normal(0, 200, ordinals.size).round()
+    return OIFrame(captured_at=captured_at, baseline_at=captured_at - 60, records=records)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--symbols', type=int, default=200)
+    parser.add_argument('--expiries', type=int, default=3)
+    parser.add_argument('--strikes', type=int, default=80)
+    parser.add_argument('--warmup', type=int, default=40, help='minute samples before timing')
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    run = f'bench:{os.getpid()}:{int(time.time())}'
+    service = UnusualOIService(stats_key=f'{run}:{UNUSUAL_OI_STATS_KEY}', detections_key=f'{run}:{UNUSUAL_OI_DETECTIONS_KEY}')
+    symbols = [f'BENCH{index}' for index in range(args.symbols)]
+    started_at = time.time() - timedelta(minutes=args.warmup + args.runs).total_seconds()
+
+    def sample(minute: int) -> list[tuple[str, OIFrame]]:
+        return [(symbol, minute_delta(rng, args.expiries, args.strikes, started_at + 60 * minute)) for symbol in symbols]
+
+    try:
+        for minute in range(args.warmup):
+            service.update(sample(minute))
+
+        update_ms = []
+        compute_ms = []
+        for minute in range(args.warmup, args.warmup + args.runs):
+            deltas = sample(minute)
+            stored = redis_binary_client.hmget(service.stats_key, symbols)
+            started = time.perf_counter()
+            for (_, delta), raw in zip(deltas, stored):
+                service._update_stats(np.frombuffer(raw, dtype=UNUSUAL_OI_STATS_DTYPE), delta)
+            compute_ms.append((time.perf_counter() - started) * 1000)
+
+            started = time.perf_counter()
+            service.update(deltas)
+            update_ms.append((time.perf_counter() - started) * 1000)
+    finally:
+        redis_binary_client.delete(service.stats_key, service.detections_key)
+
+    rows = args.expiries * args.strikes
+    print(f'{args.symbols} symbols x {rows} expiry/strike rows, {args.warmup} warm-up samples')
+    print(f'stats blob per symbol: {rows * UNUSUAL_OI_STATS_DTYPE.itemsize / 1024:.1f} KiB')
+    print(f'update (Redis included): median {np.median(update_ms):.1f} ms, max {np.max(update_ms):.1f} ms')
+    print(f'statistics only:         median {np.median(compute_ms):.1f} ms, max {np.max(compute_ms):.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
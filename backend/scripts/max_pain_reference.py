@@ -0,0 +1,33 @@
+# The per-candidate max pain loop calculate_max_pain replaced, kept verbatim. Shared by tests/test_max_pain.py and
+# scripts/benchmark_max_pain.py as the correctness oracle and timing baseline.
+
+
+def reference_max_pain(rows: list[dict]) -> float | None:
+    if not rows:
+        return None
+
+    strike_rows: list[tuple[float, int, int]] = []
+    for row in rows:
+        strike = row.get('strikePrice')
+        if strike is None:
+            continue
+        strike_rows.append(
+            (
+                float(strike),
+                int((row.get('CE') or {}).get('openInterest', 0) or 0),
+                int((row.get('PE') or {}).get('openInterest', 0) or 0),
+            )
+        )
+
+    if not strike_rows:
+        return None
+
+    pain_by_strike: dict[float, float] = {}
+    for candidate_strike, _, _ in strike_rows:
+        total_pain = 0.0
+        for strike, call_oi, put_oi in strike_rows:
+            total_pain += max(0.0, candidate_strike - strike) * call_oi
+            total_pain += max(0.0, strike - candidate_strike) * put_oi
+        pain_by_strike[candidate_strike] = total_pain
+
+    return min(pain_by_strike, key=pain_by_strike.get)
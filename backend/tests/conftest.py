@@ -0,0 +1,20 @@
+import sys
+
+import fakeredis
+import pytest
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    # Modules bind the clients at import time, so every loaded app module gets the fake pair.
+    server = fakeredis.FakeServer()
+    clients = {
+        'redis_client': fakeredis.FakeRedis(server=server, decode_responses=True),
+        'redis_binary_client': fakeredis.FakeRedis(server=server),
+    }
+    for name, module in list(sys.modules.items()):
+        if name == 'app' or name.startswith('app.'):
+            for attribute, client in clients.items():
+                if hasattr(module, attribute):
+                    monkeypatch.setattr(module, attribute, client)
+    return clients['redis_binary_client']
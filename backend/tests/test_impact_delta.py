@@ -0,0 +1,122 @@
+import json
+
+from app.services.nifty_analytics_service import (
+    INDEX_DELTA_AGGREGATES,
+    INDEX_DIFFS_KEY,
+    INDEX_IMPACT_VIEW,
+    INDEX_SNAPSHOT_CACHE_SECONDS,
+    NiftyAnalyticsService,
+    index_cache_key,
+)
+from app.utils import market_cache
+
+INDEX = 'NIFTY 50'
+
+
+def row(symbol: str, impact: float) -> dict:
+    return {'symbol': symbol, 'impact': impact}
+
+
+def diff(version: int, previous_version: int, changed: list[dict] = (), removed: list[str] = ()) -> dict:
+    return {
+        'version': version,
+        'previous_version': previous_version,
+        **aggregates(version),
+        'changed': list(changed),
+        'removed': list(removed),
+    }
+
+
+def aggregates(version: int) -> dict:
+    return {
+        **{name: f'{name}@{version}' for name in INDEX_DELTA_AGGREGATES},
+        'timestamp': f'2024-03-28T10:00:{version:02d}+00:00',
+    }
+
+
+def push(fake_redis, *diffs: dict) -> None:
+    # Oldest first, so the list ends up newest first like the refresh writes it.
+    for entry in diffs:
+        fake_redis.lpush(index_cache_key(INDEX, INDEX_DIFFS_KEY), json.dumps(entry).encode())
+
+
+def test_merge_walks_the_chain_back_to_the_client_version(fake_redis) -> None:
+    push(
+        fake_redis,
+        diff(1, 0, changed=[row('INFY', 1.0)]),
+        diff(2, 1, changed=[row('TCS', 2.0), row('HDFCBANK', 0.5)]),
+        diff(3, 2, changed=[row('INFY', 1.5)], removed=['HDFCBANK']),
+        diff(4, 3, changed=[row('WIPRO', -0.2)]),
+    )
+
+    delta = NiftyAnalyticsService()._merge_diffs(INDEX, 1)
+
+    assert delta['index'] == INDEX
+    assert (delta['since'], delta['version']) == (1, 4)
+    assert {name: delta[name] for name in INDEX_DELTA_AGGREGATES} == aggregates(4)
+    assert sorted(delta['changed'], key=lambda entry: entry['symbol']) == [
+        row('INFY', 1.5),
+        row('TCS', 2.0),
+        row('WIPRO', -0.2),
+    ]
+    assert delta['removed'] == ['HDFCBANK']
+
+
+def test_symbol_re_added_after_removal_is_changed_not_removed(fake_redis) -> None:
+    push(
+        fake_redis,
+        diff(2, 1, removed=['INFY']),
+        diff(3, 2, changed=[row('INFY', 0.7)]),
+    )
+
+    delta = NiftyAnalyticsService()._merge_diffs(INDEX, 1)
+
+    assert delta['changed'] == [row('INFY', 0.7)]
+    assert delta['removed'] == []
+
+
+def test_client_at_latest_version_gets_an_empty_delta(fake_redis) -> None:
+    push(fake_redis, diff(2, 1, changed=[row('INFY', 1.0)]), diff(3, 2, changed=[row('TCS', 2.0)]))
+
+    delta = NiftyAnalyticsService()._merge_diffs(INDEX, 3)
+
+    assert (delta['since'], delta['version']) == (3, 3)
+    assert (delta['changed'], delta['removed']) == ([], [])
+
+
+def test_gap_in_the_ring_falls_back_to_full_snapshot(fake_redis) -> None:
+    # Version 3 is missing, so 4 does not link to 2.
+    push(fake_redis, diff(2, 1), diff(4, 3, changed=[row('INFY', 1.0)]))
+
+    service = NiftyAnalyticsService()
+
+    assert service._merge_diffs(INDEX, 1) is None
+    assert service._merge_diffs(INDEX, 3)['version'] == 4
+
+
+def test_version_older_than_the_ring_falls_back_to_full_snapshot(fake_redis) -> None:
+    push(fake_redis, diff(5, 4), diff(6, 5), diff(7, 6))
+
+    service = NiftyAnalyticsService()
+
+    assert service._merge_diffs(INDEX, 2) is None
+    assert service._merge_diffs(INDEX, 4)['version'] == 7
+
+
+def test_unknown_or_future_version_falls_back_to_full_snapshot(fake_redis) -> None:
+    service = NiftyAnalyticsService()
+
+    assert service._merge_diffs(INDEX, 1) is None
+    push(fake_redis, diff(2, 1), diff(3, 2))
+    assert service._merge_diffs(INDEX, 10) is None
+
+
+def test_impact_delta_serves_the_full_snapshot_when_the_chain_breaks(fake_redis) -> None:
+    full = json.dumps({'version': 7, 'constituents': [row('INFY', 1.0)]}).encode()
+    market_cache.store_many({index_cache_key(INDEX, INDEX_IMPACT_VIEW): full}, fresh_seconds=INDEX_SNAPSHOT_CACHE_SECONDS)
+    push(fake_redis, diff(5, 4), diff(6, 5), diff(7, 6))
+
+    service = NiftyAnalyticsService()
+
+    assert service.get_impact_delta(INDEX, 2) == full
+    assert json.loads(service.get_impact_delta(INDEX, 6))['changed'] == []
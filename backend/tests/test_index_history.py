@@ -0,0 +1,81 @@
+import json
+from datetime import datetime, timezone
+
+from app.services.index_history_service import IndexHistoryService
+from app.services.nifty_analytics_service import INDEX_IMPACT_STREAM_KEY, index_cache_key
+from app.tasks.celery_app import celery_app
+from app.utils.market_calendar import IST, POST_CLOSE_END, MarketSession, market_session
+
+INDEX = 'NIFTY 50'
+# 15:58 IST on a trading day, two minutes before the post-close session ends.
+SESSION_END = datetime(2024, 3, 28, 15, 58, tzinfo=IST).timestamp()
+
+
+def add_sample(fake_redis, fetched_at: float, total_impact: float, sectors: dict[str, float] | None = None) -> None:
+    fake_redis.xadd(
+        index_cache_key(INDEX, INDEX_IMPACT_STREAM_KEY),
+        {
+            'fetched_at': repr(fetched_at),
+            'total_impact': repr(total_impact),
+            'total_index_points': repr(total_impact * 2),
+            'index_value': repr(22000 + total_impact),
+            'sector_impact': json.dumps(sectors or {'IT': total_impact / 2}),
+        },
+    )
+
+
+def history(interval: str) -> dict:
+    return IndexHistoryService().get_history(INDEX, interval, datetime.fromtimestamp(SESSION_END, tz=IST).date())
+
+
+def test_rollup_aggregates_buckets_across_a_boundary(fake_redis) -> None:
+    # Three samples in the 15:58 minute, two in 15:59.
+    for offset, impact in ((5, 1.0), (25, 4.0), (45, -2.0), (65, 3.0), (85, 2.5)):
+        add_sample(fake_redis, SESSION_END + offset, impact)
+
+    assert IndexHistoryService().rollup([INDEX]) == {INDEX: 5}
+    minutes = history('1m')
+
+    assert [stamp.timestamp() for stamp in minutes['timestamps']] == [SESSION_END, SESSION_END + 60]
+    assert minutes['total_impact'] == [-2.0, 2.5]
+    assert minutes['impact_high'] == [4.0, 3.0]
+    assert minutes['impact_low'] == [-2.0, 2.5]
+    assert minutes['total_index_points'] == [-4.0, 5.0]
+    assert minutes['index_value'] == [21998.0, 22002.5]
+    assert minutes['samples'] == [3, 2]
+    assert minutes['sector_impact'] == {'IT': [-1.0, 1.25]}
+
+    # 15:55-16:00 holds all five samples.
+    five_minutes = history('5m')
+    assert five_minutes['samples'] == [5]
+    assert (five_minutes['impact_high'], five_minutes['impact_low']) == ([4.0], [-2.0])
+
+
+def test_final_rollup_merges_the_bucket_left_open(fake_redis) -> None:
+    add_sample(fake_redis, SESSION_END + 65, 3.0, {'IT': 1.0})
+    add_sample(fake_redis, SESSION_END + 80, -1.0, {'IT': 0.5})
+    assert IndexHistoryService().rollup([INDEX]) == {INDEX: 2}
+
+    # The last post-close refreshes land after the regular rollup; a new sector appears with them.
+    add_sample(fake_redis, SESSION_END + 100, 5.0, {'IT': 2.0, 'AUTO': -0.3})
+    add_sample(fake_redis, SESSION_END + 115, 0.5, {'IT': 0.2, 'AUTO': 0.1})
+    assert IndexHistoryService().rollup([INDEX]) == {INDEX: 2}
+    assert IndexHistoryService().rollup([INDEX]) == {INDEX: 0}
+
+    minutes = history('1m')
+    assert minutes['samples'] == [4]
+    assert minutes['total_impact'] == [0.5]
+    assert (minutes['impact_high'], minutes['impact_low']) == ([5.0], [-1.0])
+    assert minutes['sector_impact'] == {'IT': [0.2], 'AUTO': [0.1]}
+
+
+def test_post_close_rollup_runs_once_the_session_is_over() -> None:
+    entry = celery_app.conf.beat_schedule['rollup-index-impact-post-close']
+    schedule = entry['schedule']
+
+    assert entry['task'] == 'tasks.rollup_index_impact'
+    assert schedule.day_of_week == {1, 2, 3, 4, 5}
+    (hour,), (minute,) = schedule.hour, schedule.minute
+    runs_at = datetime(2024, 3, 28, hour, minute, tzinfo=timezone.utc).astimezone(IST)
+    assert runs_at.time() > POST_CLOSE_END
+    assert market_session(runs_at) == MarketSession.CLOSED
@@ -0,0 +1,125 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app.utils import market_cache
+from app.utils.market_calendar import IST
+
+
+class Loader:
+    def __init__(self, value=None, error: int | None = None, delay: float = 0.0):
+        self.value = value
+        self.error = error
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise HTTPException(status_code=self.error, detail='Upstream unavailable')
+        return self.value
+
+
+def test_cold_miss_loads_once_and_then_serves_fresh(fake_redis):
+    loader = Loader(value={'spot': 22326.9})
+
+    first = market_cache.cached_fetch('test:cache', loader, fresh_seconds=30)
+    second = market_cache.cached_fetch('test:cache', loader, fresh_seconds=30)
+
+    assert first.value == second.value == {'spot': 22326.9}
+    assert first.age_seconds < 1
+    assert loader.calls == 1
+    assert fake_redis.ttl('test:cache') > 0
+    assert not fake_redis.exists('test:cache:lock')
+
+
+def test_stale_entry_is_served_when_loader_fails(fake_redis):
+    market_cache.store('test:cache', {'spot': 22000.0}, fresh_seconds=30, age_seconds=45)
+    loader = Loader(error=503)
+
+    entry = market_cache.cached_fetch('test:cache', loader, fresh_seconds=30)
+
+    assert entry.value == {'spot': 22000.0}
+    assert entry.age_seconds >= 45
+    assert loader.calls == 1
+
+
+def test_client_errors_are_not_masked_by_stale_entry(fake_redis):
+    market_cache.store('test:cache', {'spot': 22000.0}, fresh_seconds=30, age_seconds=45)
+
+    with pytest.raises(HTTPException) as raised:
+        market_cache.cached_fetch('test:cache', Loader(error=404), fresh_seconds=30)
+    assert raised.value.status_code == 404
+
+
+def test_waiters_do_not_load_when_lock_holder_fails(fake_redis):
+    loader = Loader(error=503, delay=0.3)
+    errors = []
+
+    def request():
+        try:
+            market_cache.cached_fetch('test:cache', loader, fresh_seconds=30)
+        except HTTPException as exc:
+            errors.append(exc.status_code)
+
+    threads = [threading.Thread(target=request) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert loader.calls == 1
+    assert errors == [503] * 10
+
+    # Requests arriving right after the failure fail fast as well.
+    with pytest.raises(HTTPException):
+        market_cache.cached_fetch('test:cache', loader, fresh_seconds=30)
+    assert loader.calls == 1
+
+
+def test_waiter_takes_over_lock_released_without_result(fake_redis):
+    # Stands in for a holder whose load raised something other than an upstream error.
+    assert market_cache.acquire_refresh_lock('test:cache') is not None
+    threading.Timer(0.2, fake_redis.delete, args=('test:cache:lock',)).start()
+    loader = Loader(value={'spot': 22326.9})
+
+    entry = market_cache.cached_fetch('test:cache', loader, fresh_seconds=30)
+
+    assert entry.value == {'spot': 22326.9}
+    assert loader.calls == 1
+
+
+@pytest.mark.parametrize(
+    ('written_at', 'kept_until'),
+    [
+        # Friday post-close write outlives the weekend.
+        (datetime(2024, 3, 29, 15, 55, tzinfo=IST), datetime(2024, 4, 1, 9, 0, tzinfo=IST)),
+        # Saturday on-demand write lasts until Monday's pre-open.
+        (datetime(2024, 3, 30, 12, 0, tzinfo=IST), datetime(2024, 4, 1, 9, 0, tzinfo=IST)),
+    ],
+)
+def test_closed_market_writes_are_kept_until_next_session(monkeypatch, written_at, kept_until):
+    monkeypatch.setattr(market_cache, 'datetime', _frozen_datetime(written_at))
+
+    assert written_at + timedelta(seconds=market_cache.expire_seconds(60)) > kept_until
+
+
+def test_session_writes_keep_the_stale_window(monkeypatch):
+    monkeypatch.setattr(market_cache, 'datetime', _frozen_datetime(datetime(2024, 3, 28, 11, 0, tzinfo=IST)))
+
+    assert market_cache.expire_seconds(60) == 60 + market_cache.settings.MARKET_CACHE_STALE_IF_ERROR_SECONDS
+
+
+def _frozen_datetime(at: datetime) -> type[datetime]:
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return at.astimezone(tz)
+
+    return FrozenDatetime
@@ -0,0 +1,64 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.services.option_chain import OptionChain
+from app.services.options_analytics_service import calculate_max_pain, calculate_pain_curve
+from scripts.max_pain_reference import reference_max_pain
+
+FIXTURES = Path(__file__).resolve().parent / 'fixtures' / 'option_chains'
+
+
+def load_payload(name: str) -> dict:
+    return json.loads((FIXTURES / f'{name}.json').read_text())
+
+
+@pytest.mark.parametrize('name', sorted(path.stem for path in FIXTURES.glob('*.json')))
+def test_max_pain_matches_reference_on_fixture_chains(name: str) -> None:
+    payload = load_payload(name)
+    chain = OptionChain.from_payload(name.upper(), payload)
+
+    for expiry in chain.expiry_dates:
+        rows = [row for row in payload['records']['data'] if row['expiryDate'] == expiry]
+        assert calculate_max_pain(chain.for_expiry(expiry)) == reference_max_pain(rows)
+
+
+def test_max_pain_matches_reference_on_random_chains() -> None:
+    rng = np.random.default_rng(11)
+    for trial in range(500):
+        strikes = rng.choice(np.arange(100, 200, 2.5), size=rng.integers(1, 40))
+        rows = [
+            {
+                'strikePrice': float(strike),
+                'expiryDate': '28-Mar-2024',
+                'CE': {'openInterest': int(rng.integers(0, 10**6))} if rng.random() > 0.1 else None,
+                'PE': {'openInterest': int(rng.integers(0, 10**6))},
+            }
+            # Ascending like NSE lists strikes; ties then resolve to the lowest strike in both versions.
+            for strike in np.sort(strikes)
+        ]
+        chain = OptionChain.from_payload('TEST', {'records': {'expiryDates': ['28-Mar-2024'], 'data': rows}})
+        assert calculate_max_pain(chain) == reference_max_pain(rows), trial
+
+
+@pytest.mark.parametrize('name', sorted(path.stem for path in FIXTURES.glob('*.json')))
+def test_pain_curve_prices_every_strike(name: str) -> None:
+    chain = OptionChain.from_payload(name.upper(), load_payload(name))
+
+    for expiry in chain.expiry_dates:
+        expiry_chain = chain.for_expiry(expiry)
+        strikes, pain = calculate_pain_curve(expiry_chain)
+        expected = [
+            np.sum(np.maximum(0.0, candidate - expiry_chain.strike) * expiry_chain.ce_oi)
+            + np.sum(np.maximum(0.0, expiry_chain.strike - candidate) * expiry_chain.pe_oi)
+            for candidate in strikes
+        ]
+        assert strikes.tolist() == sorted(set(expiry_chain.strike.tolist()))
+        np.testing.assert_allclose(pain, expected)
+
+
+def test_max_pain_of_empty_chain_is_none() -> None:
+    chain = OptionChain.from_payload('TEST', {'records': {'expiryDates': [], 'data': []}})
+    assert calculate_max_pain(chain) is None
@@ -0,0 +1,128 @@
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from app.services.oi_delta_service import (
+    OI_FRAME_DTYPE,
+    OI_FRAME_FIELDS,
+    OI_FRAME_SLOTS,
+    STRIKE_SCALE,
+    OIDeltaService,
+    OIFrame,
+    key_strikes,
+)
+from app.services.option_chain import OptionChain
+
+EXPIRY = date(2024, 3, 28)
+NEXT_EXPIRY = date(2024, 4, 4)
+STARTED_AT = datetime(2024, 3, 28, 4, 0, 5, tzinfo=timezone.utc)
+
+
+def frame(rows: dict[tuple[date, float], float], captured_at: float = 0.0) -> OIFrame:
+    records = np.zeros(len(rows), dtype=OI_FRAME_DTYPE)
+    records['key'] = [(expiry.toordinal() << 32) | int(strike * STRIKE_SCALE) for expiry, strike in rows]
+    for name in OI_FRAME_FIELDS:
+        records[name] = list(rows.values())
+    records.sort(order='key')
+    return OIFrame(captured_at=captured_at, baseline_at=np.nan, records=records)
+
+
+def chain(minute: int, seconds: int = 0) -> OptionChain:
+    fetched_at = STARTED_AT + timedelta(minutes=minute, seconds=seconds)
+    rows = [
+        {
+            'strikePrice': strike,
+            'expiryDate': '28-Mar-2024',
+            'CE': {'openInterest': 1000 + 10 * minute, 'totalTradedVolume': 100 * minute},
+            'PE': {'openInterest': 2000 - 10 * minute, 'totalTradedVolume': 100 * minute},
+        }
+        for strike in (22000, 22050, 22100)
+    ]
+    payload = {'records': {'expiryDates': ['28-Mar-2024'], 'data': rows}}
+    return OptionChain.from_payload('NIFTY', payload, fetched_at=fetched_at.isoformat())
+
+
+def test_diff_aligns_strikes_added_and_removed() -> None:
+    baseline = frame({(EXPIRY, 22000): 100, (EXPIRY, 22050): 200, (EXPIRY, 22100): 300}, captured_at=60)
+    current = frame({(EXPIRY, 22050): 250, (EXPIRY, 22100): 330, (EXPIRY, 22150): 50}, captured_at=120)
+
+    delta = current.diff(baseline)
+
+    assert (delta.captured_at, delta.baseline_at) == (120, 60)
+    assert key_strikes(delta.records['key']).tolist() == [22050, 22100, 22150]
+    for name in OI_FRAME_FIELDS:
+        np.testing.assert_array_equal(delta.records[name], [50, 30, np.nan])
+
+
+def test_diff_keeps_expiries_apart() -> None:
+    baseline = frame({(EXPIRY, 22000): 100, (NEXT_EXPIRY, 21950): 400})
+    current = frame({(EXPIRY, 22000): 150, (NEXT_EXPIRY, 22000): 500})
+
+    delta = current.diff(baseline)
+
+    np.testing.assert_array_equal(delta.for_expiry(EXPIRY.toordinal())['ce_oi'], [50])
+    # Same strike, different expiry: a new contract, not a change.
+    np.testing.assert_array_equal(delta.for_expiry(NEXT_EXPIRY.toordinal())['ce_oi'], [np.nan])
+
+
+def test_diff_against_empty_baseline_is_all_missing() -> None:
+    current = frame({(EXPIRY, 22000): 150, (EXPIRY, 22050): 175})
+
+    delta = current.diff(frame({}))
+
+    assert np.isnan(delta.records['pe_oi']).all()
+
+
+def test_frame_round_trips_through_bytes() -> None:
+    original = frame({(EXPIRY, 22000): 150, (NEXT_EXPIRY, 22012.5): 175}, captured_at=1711598405.0)
+
+    restored = OIFrame.from_bytes(original.to_bytes())
+
+    assert restored.captured_at == original.captured_at
+    np.testing.assert_array_equal(restored.records, original.records)
+    assert key_strikes(restored.records['key']).tolist() == [22000, 22012.5]
+
+
+def test_minute_ring_serves_every_window(fake_redis) -> None:
+    service = OIDeltaService()
+    minute_deltas = [service.refresh([chain(minute)]) for minute in range(OI_FRAME_SLOTS + 4)]
+
+    # One frame per slot, the oldest overwritten once the ring wraps.
+    assert fake_redis.hlen('options:oi:frames:NIFTY') == OI_FRAME_SLOTS
+    assert minute_deltas[0] == []
+    assert all(len(deltas) == 1 for deltas in minute_deltas[1:])
+
+    for window, minutes in (('1m', 1), ('5m', 5), ('15m', 15)):
+        delta = service.get_delta('NIFTY', None, window)
+        assert delta['window_seconds'] == 60 * minutes
+        assert delta['expiry_date'] == '28-Mar-2024'
+        assert delta['total_call_oi_change'] == 3 * 10 * minutes
+        assert delta['total_put_oi_change'] == -3 * 10 * minutes
+        assert {row['call_volume_change'] for row in delta['strikes']} == {100 * minutes}
+
+
+def test_refresh_within_a_slot_keeps_the_slot_baseline(fake_redis) -> None:
+    service = OIDeltaService()
+    for minute in range(3):
+        service.refresh([chain(minute)])
+
+    assert service.refresh([chain(2, seconds=30)]) == []
+    service.refresh([chain(3)])
+    delta = service.get_delta('NIFTY', None, '1m')
+
+    # Measured from the first frame of the previous slot, not from the later refresh inside it.
+    assert delta['window_seconds'] == 60
+    assert delta['baseline_at'] == STARTED_AT + timedelta(minutes=2)
+    assert delta['total_call_oi_change'] == 30
+
+
+def test_windows_without_a_baseline_are_not_served(fake_redis) -> None:
+    service = OIDeltaService()
+    for minute in range(3):
+        service.refresh([chain(minute)])
+
+    assert service.get_delta('NIFTY', None, '1m')['window_seconds'] == 60
+    with pytest.raises(Exception) as raised:
+        service.get_delta('NIFTY', None, '15m')
+    assert raised.value.status_code == 503